@@ -5,7 +5,7 @@ from sqlalchemy import engine_from_config, pool
 
 from app.db import Base
 from app.config import settings
-from app.models import User, Session, LeaveRequest, EmailConfig, AppSetting  # noqa
+from app.models import User, Session, LeaveRequest, LeaveBalance, LeaveMonthStats, LeaveEmployeeMonthStats, Holiday, EmailConfig, EmailOutbox, AppSetting  # noqa
 
 config = context.config
 
@@ -0,0 +1,27 @@
+"""leave overlap exclusion constraint
+
+Revision ID: 0002_leave_overlap_exclusion
+Revises: 0001_init
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002_leave_overlap_exclusion"
+down_revision = "0001_init"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # btree_gist lets the uuid equality share a GiST index with the daterange overlap.
+    # Fails if existing rows already overlap for the same employee; clean those up first.
+    op.execute("create extension if not exists btree_gist")
+    # Raw DDL: op.create_exclude_constraint cannot take an expression element
+    op.execute("""
+        ALTER TABLE leave_requests ADD CONSTRAINT leave_no_overlap_excl
+        EXCLUDE USING gist (employee_user_id WITH =, daterange(start_date, end_date, '[]') WITH &&)
+    """)
+
+
+def downgrade():
+    op.execute("ALTER TABLE leave_requests DROP CONSTRAINT leave_no_overlap_excl")
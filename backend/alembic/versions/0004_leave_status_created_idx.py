@@ -0,0 +1,21 @@
+"""keyset index for the admin pending queue
+
+Revision ID: 0004_leave_status_created_idx
+Revises: 0003_email_outbox
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0004_leave_status_created_idx"
+down_revision = "0003_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Seek target for: where status = 'pending' and (created_at, id) < cursor order by created_at desc, id desc
+    op.create_index("leave_status_created_idx", "leave_requests", ["status", "created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("leave_status_created_idx", table_name="leave_requests")
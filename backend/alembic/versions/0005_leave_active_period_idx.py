@@ -0,0 +1,28 @@
+"""GiST index on the leave period of pending/approved requests
+
+Revision ID: 0005_leave_active_period_idx
+Revises: 0004_leave_status_created_idx
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_leave_active_period_idx"
+down_revision = "0004_leave_status_created_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Leave-date filters without an employee (the per-employee case uses leave_no_overlap_excl)
+    op.create_index(
+        "leave_active_period_idx",
+        "leave_requests",
+        [sa.text("daterange(start_date, end_date, '[]')")],
+        postgresql_using="gist",
+        postgresql_where=sa.text("status in ('pending','approved')"),
+    )
+
+
+def downgrade():
+    op.drop_index("leave_active_period_idx", table_name="leave_requests")
@@ -0,0 +1,56 @@
+"""leave balances per employee and year
+
+Revision ID: 0006_leave_balances
+Revises: 0005_leave_active_period_idx
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006_leave_balances"
+down_revision = "0005_leave_active_period_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leave_balances",
+        sa.Column("employee_user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("leave_type", sa.String(), nullable=False, server_default="general"),
+        sa.Column("days_used", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("approved_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("employee_user_id", "year", "leave_type"),
+    )
+    op.create_index("leave_balances_year_type_idx", "leave_balances", ["year", "leave_type"])
+
+    # Backfill from the requests approved so far, counting calendar days minus exclusions per year. That is
+    # what rebuild-balances gives with LEAVE_COUNT_WORKING_DAYS off; the holidays table does not exist yet, so
+    # with working-day counting on, run `python -m app.cli rebuild-balances` after upgrading.
+    op.execute("""
+        INSERT INTO leave_balances (employee_user_id, year, leave_type, days_used, approved_count, updated_at)
+        SELECT
+            lr.employee_user_id,
+            y.year,
+            'general',
+            sum(
+                (least(lr.end_date, make_date(y.year, 12, 31)) - greatest(lr.start_date, make_date(y.year, 1, 1)) + 1)
+                - (SELECT count(*) FROM jsonb_array_elements_text(lr.excluded_dates) AS x(d) WHERE left(x.d, 4)::int = y.year)
+            ),
+            count(*),
+            now()
+        FROM leave_requests lr
+        CROSS JOIN LATERAL generate_series(
+            extract(year FROM lr.start_date)::int, extract(year FROM lr.end_date)::int
+        ) AS y(year)
+        WHERE lr.status = 'approved'
+        GROUP BY lr.employee_user_id, y.year
+    """)
+
+
+def downgrade():
+    op.drop_index("leave_balances_year_type_idx", table_name="leave_balances")
+    op.drop_table("leave_balances")
@@ -0,0 +1,26 @@
+"""holidays
+
+Revision ID: 0007_holidays
+Revises: 0006_leave_balances
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_holidays"
+down_revision = "0006_leave_balances"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "holidays",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade():
+    op.drop_table("holidays")
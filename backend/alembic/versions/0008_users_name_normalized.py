@@ -0,0 +1,34 @@
+"""users.name_normalized for case/whitespace-insensitive login
+
+Revision ID: 0008_users_name_normalized
+Revises: 0007_holidays
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_users_name_normalized"
+down_revision = "0007_holidays"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column(
+            "name_normalized",
+            sa.String(),
+            sa.Computed(r"lower(regexp_replace(btrim(name), '\s+', ' ', 'g'))", persisted=True),
+            nullable=False,
+        ),
+    )
+    # Login probes (name_normalized, dob); the raw-name index is no longer used
+    op.create_index("users_name_norm_dob_idx", "users", ["name_normalized", "dob"])
+    op.drop_index("users_name_dob_idx", table_name="users")
+
+
+def downgrade():
+    op.create_index("users_name_dob_idx", "users", ["name", "dob"])
+    op.drop_index("users_name_norm_dob_idx", table_name="users")
+    op.drop_column("users", "name_normalized")
@@ -0,0 +1,28 @@
+"""updated_at on leave_requests and users (listing ETags)
+
+Revision ID: 0009_updated_at
+Revises: 0008_users_name_normalized
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_updated_at"
+down_revision = "0008_users_name_normalized"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ("leave_requests", "users"):
+        op.add_column(
+            table,
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        )
+    op.execute("UPDATE leave_requests SET updated_at = coalesce(decided_at, created_at)")
+    op.execute("UPDATE users SET updated_at = created_at")
+
+
+def downgrade():
+    op.drop_column("users", "updated_at")
+    op.drop_column("leave_requests", "updated_at")
@@ -0,0 +1,69 @@
+"""monthly leave summary tables for the admin dashboard
+
+Revision ID: 0010_leave_stats
+Revises: 0009_updated_at
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0010_leave_stats"
+down_revision = "0009_updated_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leave_employee_month_stats",
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("employee_user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("days", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("month", "employee_user_id", "status"),
+    )
+    op.create_table(
+        "leave_month_stats",
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("days", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("month", "status"),
+    )
+
+    # Backfill counting calendar days; with LEAVE_COUNT_WORKING_DAYS on, follow
+    # up with `python -m app.cli rebuild-stats` so multi-month leaves match
+    op.execute("""
+        INSERT INTO leave_employee_month_stats (month, employee_user_id, status, requests, days, updated_at)
+        SELECT
+            m.month::date,
+            lr.employee_user_id,
+            lr.status,
+            count(*) FILTER (WHERE m.month = date_trunc('month', lr.start_date::timestamp)),
+            sum(
+                (least(lr.end_date, (m.month + interval '1 month' - interval '1 day')::date) - greatest(lr.start_date, m.month::date) + 1)
+                - (SELECT count(*) FROM jsonb_array_elements_text(lr.excluded_dates) AS x(d)
+                   WHERE date_trunc('month', x.d::date::timestamp) = m.month)
+            ),
+            now()
+        FROM leave_requests lr
+        CROSS JOIN LATERAL generate_series(
+            date_trunc('month', lr.start_date::timestamp), date_trunc('month', lr.end_date::timestamp), interval '1 month'
+        ) AS m(month)
+        GROUP BY m.month, lr.employee_user_id, lr.status
+    """)
+    op.execute("""
+        INSERT INTO leave_month_stats (month, status, requests, days, updated_at)
+        SELECT month, status, sum(requests), sum(days), now()
+        FROM leave_employee_month_stats
+        GROUP BY month, status
+    """)
+
+
+def downgrade():
+    op.drop_table("leave_month_stats")
+    op.drop_table("leave_employee_month_stats")
@@ -0,0 +1,132 @@
+"""
+Async (asyncpg + AsyncSession) versions of the hot endpoints.
+
+Included ahead of the sync routes in app.main when DB_ASYNC=true, so the same
+paths are served from the event loop instead of the threadpool. Everything
+else stays on the sync handlers.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.deps import (
+    get_async_db, get_current_user_async, require_admin_async, require_employee_async,
+    leave_listing_filters, page_stmt,
+)
+from app.models import LeaveRequest, User
+from app.schemas import MeOut, LeaveApplyIn, LeaveOut, EmployeeOut
+from app.services.etags import cache_headers, employee_version_stmt, leave_version_stmt, make_etag, matching_etag, not_modified
+from app.services.leave_apply import LeaveConflictError, submit_leave
+from app.services.leave_queries import MAX_PAGE_SIZE, leave_list_stmt, split_page
+from app.services.leave_serializer import LeaveListResponse, leave_out
+from app.services.session_cache import AuthUser
+
+router = APIRouter()
+
+
+async def _fetch_page(db: AsyncSession, stmt, cursor: str | None, limit: int) -> tuple[list, str | None]:
+    rows = (await db.execute(page_stmt(stmt, cursor, limit))).all()
+    return split_page(rows, limit)
+
+
+async def _leave_listing(request: Request, db: AsyncSession, scope: str, preds: list, cursor: str | None, limit: int) -> Response:
+    # First page only, like the sync listing
+    if cursor:
+        rows, next_cursor = await _fetch_page(db, leave_list_stmt(*preds), cursor, limit)
+        return LeaveListResponse(rows, next_cursor)
+    etag = make_etag(scope, (await db.execute(leave_version_stmt(*preds))).one(), request)
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+    rows, next_cursor = await _fetch_page(db, leave_list_stmt(*preds), cursor, limit)
+    return LeaveListResponse(rows, next_cursor, headers=cache_headers(etag))
+
+
+@router.get("/api/auth/me", response_model=MeOut)
+async def me(user: AuthUser = Depends(get_current_user_async)):
+    return {"id": str(user.id), "role": user.role, "name": user.name}
+
+
+@router.post("/api/leaves", response_model=LeaveOut)
+async def apply_leave(payload: LeaveApplyIn, db: AsyncSession = Depends(get_async_db), employee: AuthUser = Depends(require_employee_async)):
+    try:
+        # Same code path as the sync endpoint, driven over the asyncpg connection
+        lr = await db.run_sync(submit_leave, employee, payload)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    except LeaveConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return leave_out(lr)
+
+
+@router.get("/api/leaves/my", response_model=list[LeaveOut])
+async def my_leaves(
+    request: Request,
+    filters: list = Depends(leave_listing_filters),
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    employee: AuthUser = Depends(require_employee_async),
+):
+    preds = [LeaveRequest.employee_user_id == employee.id, *filters]
+    return await _leave_listing(request, db, f"my:{employee.id}", preds, cursor, limit)
+
+
+@router.get("/api/leaves/my/pending", response_model=list[LeaveOut])
+async def my_pending(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    employee: AuthUser = Depends(require_employee_async),
+):
+    preds = [LeaveRequest.employee_user_id == employee.id, LeaveRequest.status == "pending"]
+    return await _leave_listing(request, db, f"my-pending:{employee.id}", preds, cursor, limit)
+
+
+@router.get("/api/admin/employees", response_model=list[EmployeeOut])
+async def admin_employees(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    admin: AuthUser = Depends(require_admin_async),
+):
+    etag = make_etag("employees", (await db.execute(employee_version_stmt())).one(), request)
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+    response.headers.update(cache_headers(etag))
+    rows = (await db.execute(
+        select(User.id, User.name, User.employee_code).where(User.role == "employee").order_by(User.name.asc())
+    )).all()
+    return [{"id": str(u.id), "name": u.name, "employeeCode": u.employee_code} for u in rows]
+
+
+@router.get("/api/admin/leaves/pending", response_model=list[LeaveOut])
+async def admin_pending(
+    request: Request,
+    employeeId: str | None = None,
+    filters: list = Depends(leave_listing_filters),
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    admin: AuthUser = Depends(require_admin_async),
+):
+    preds = [LeaveRequest.status == "pending", *filters]
+    if employeeId:
+        preds.append(LeaveRequest.employee_user_id == employeeId)
+    return await _leave_listing(request, db, "pending", preds, cursor, limit)
+
+
+@router.get("/api/admin/employees/{employee_id}/leaves", response_model=list[LeaveOut])
+async def admin_employee_leaves(
+    request: Request,
+    employee_id: str,
+    filters: list = Depends(leave_listing_filters),
+    cursor: str | None = None,
+    limit: int = Query(400, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    admin: AuthUser = Depends(require_admin_async),
+):
+    preds = [LeaveRequest.employee_user_id == employee_id, *filters]
+    return await _leave_listing(request, db, f"employee:{employee_id}", preds, cursor, limit)
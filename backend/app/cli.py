@@ -0,0 +1,38 @@
+"""
+Maintenance commands, run from backend/:
+
+    python -m app.cli rebuild-balances
+    python -m app.cli rebuild-stats
+"""
+import argparse
+
+from app.db import SessionLocal
+from app.services.leave_balance import rebuild_balances
+from app.services.leave_stats import rebuild_leave_stats
+
+
+def _rebuild_balances(args) -> None:
+    with SessionLocal() as db:
+        n = rebuild_balances(db)
+        db.commit()
+    print(f"leave_balances rebuilt: {n} rows")
+
+
+def _rebuild_stats(args) -> None:
+    with SessionLocal() as db:
+        months, employee_months = rebuild_leave_stats(db)
+        db.commit()
+    print(f"leave stats rebuilt: {months} month rows, {employee_months} employee-month rows")
+
+
+def main(argv=None) -> None:
+    p = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild-balances", help="recompute leave_balances from leave_requests").set_defaults(func=_rebuild_balances)
+    sub.add_parser("rebuild-stats", help="recompute the dashboard summary tables from leave_requests").set_defaults(func=_rebuild_stats)
+    args = p.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
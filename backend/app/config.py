@@ -6,6 +6,29 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
 
+    # Connection pooling. "queue" = SQLAlchemy QueuePool (no pre-ping; connections recycled instead);
+    # "null" = no app-side pool, for when the Supabase transaction pooler (port 6543) does the pooling.
+    DB_POOL_MODE: str = "queue"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # Client-side compiled statement cache (SQLAlchemy); server-side prepares are off behind the pooler
+    DB_STATEMENT_CACHE_SIZE: int = 500
+    # None = auto-detect from the DATABASE_URL port (6543)
+    DB_TRANSACTION_POOLER: bool | None = None
+
+    # Per-request statement/commit counts and db timing as X-DB-Queries / X-DB-Commits / Server-Timing
+    # response headers. Off by default: they tell any client how much DB work a request did (dev / benchmarks only)
+    QUERY_STATS_HEADERS: bool = False
+    # Fraction of requests logged and aggregated into /api/admin/metrics; statements slower than this are logged
+    METRICS_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_MS: float = 200.0
+
+    # Serve the hot endpoints (auth, leave listings, apply) from async handlers on asyncpg
+    DB_ASYNC: bool = False
+
     # One-time admin setup code (required to create the first admin)
     ADMIN_SETUP_CODE: str
 
@@ -16,11 +39,69 @@ class Settings(BaseSettings):
     SESSION_COOKIE_NAME: str = "lm_session"
     SESSION_TTL_DAYS: int = 14
 
-    # Render/Proxy
+    # Session lookup cache in front of get_current_user.
+    # SESSION_CACHE_URL unset = per-process LRU; memory:// = local stand-in store; redis://... = shared between workers
+    SESSION_CACHE_ENABLED: bool = True
+    SESSION_CACHE_MAX_ENTRIES: int = 10000
+    SESSION_CACHE_TTL_SECONDS: int = 60
+    SESSION_CACHE_URL: str | None = None
+
+    # Expired sessions are purged by a background sweeper (0 disables it)
+    SESSION_SWEEP_INTERVAL_SECONDS: int = 900
+    SESSION_SWEEP_BATCH_SIZE: int = 500
+
+    # Notification emails are queued in email_outbox and sent by background workers (0 = no workers in this process)
+    EMAIL_OUTBOX_WORKERS: int = 2
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5
+    EMAIL_OUTBOX_BATCH_SIZE: int = 20
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = 30
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 120
+
+    # Parsed/decrypted email config is reused for this long before re-checking email_config.updated_at
+    EMAIL_CONFIG_CACHE_SECONDS: float = 30
+
+    # Warm SMTP connections are dropped after this much idle time
+    EMAIL_SMTP_IDLE_SECONDS: float = 60
+
+    # Plain SMTP without STARTTLS/login, only for local sinks (e.g. aiosmtpd) in tests
+    EMAIL_SMTP_INSECURE_LOCAL: bool = False
+
+    # Calendar months in listing filters are interpreted in this timezone
+    APP_TIMEZONE: str = "UTC"
+
+    # Count only working days (skip WEEKEND_DAYS and the holidays table) in leave totals
+    LEAVE_COUNT_WORKING_DAYS: bool = False
+    # date.weekday() numbers, Monday = 0; e.g. WEEKEND_DAYS='[4,5]' for a Friday/Saturday weekend
+    WEEKEND_DAYS: list[int] = [5, 6]
+    # /api/admin/calendar responses are cached per window this long (0 disables); local writes invalidate at once
+    TEAM_CALENDAR_CACHE_SECONDS: float = 30
+    # The holiday calendar is reused for this long before re-checking the holidays table
+    CALENDAR_CACHE_SECONDS: float = 60
+
+    # Admin SSE feed (/api/admin/leaves/stream): in-process only by default; LEAVE_EVENTS_NOTIFY=true
+    # fans out through Postgres LISTEN/NOTIFY so every worker sees every event (LISTEN needs a
+    # session-mode connection: set LEAVE_EVENTS_LISTEN_URL if DATABASE_URL is a transaction pooler)
+    LEAVE_EVENTS_NOTIFY: bool = False
+    LEAVE_EVENTS_LISTEN_URL: str | None = None
+    SSE_HEARTBEAT_SECONDS: float = 15
+
+    # Render/Proxy: each proxy in front of the app appends the address it saw to X-Forwarded-For, so
+    # the client IP is the entry TRUSTED_PROXY_HOPS from the right (e.g. 2 for CDN + load balancer)
     TRUST_PROXY_HEADERS: bool = True
+    TRUSTED_PROXY_HOPS: int = 1
+
+    # Login attempts per client IP and per name (token bucket; 0 disables). RATE_LIMIT_URL=redis://... shares it between workers
+    LOGIN_RATE_LIMIT_PER_MINUTE: float = 10
+    LOGIN_RATE_LIMIT_BURST: int = 10
+    RATE_LIMIT_URL: str | None = None
 
     # Frontend build dir (served by backend)
     FRONTEND_DIST_DIR: str = "../frontend/dist"
+    # Build gzip (and brotli, if installed) variants of the frontend at startup when the build has none
+    STATIC_PRECOMPRESS: bool = True
+    # JSON API responses at least this large are compressed (0 disables)
+    JSON_COMPRESS_MIN_BYTES: int = 1024
 
 
 settings = Settings()
\ No newline at end of file
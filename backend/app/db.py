@@ -1,15 +1,86 @@
+import uuid
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.config import settings
+from app.services.pool_metrics import PoolMetrics, timed_pool_class, track_pool
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+
+def uses_transaction_pooler() -> bool:
+    # Supabase/pgbouncer transaction mode listens on 6543 unless told otherwise
+    if settings.DB_TRANSACTION_POOLER is not None:
+        return settings.DB_TRANSACTION_POOLER
+    return urlsplit(settings.DATABASE_URL).port == 6543
+
+
+def _engine_kwargs(queue_pool: type, metrics: PoolMetrics) -> dict:
+    kwargs = {"query_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if settings.DB_POOL_MODE == "null":
+        # Let the external pooler do the pooling; every checkout is a fresh (cheap) pooler connection
+        kwargs["poolclass"] = timed_pool_class(NullPool, metrics)
+    elif settings.DB_POOL_MODE == "queue":
+        kwargs.update(
+            poolclass=timed_pool_class(queue_pool, metrics),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    else:
+        raise ValueError(f"Unsupported DB_POOL_MODE: {settings.DB_POOL_MODE}")
+    return kwargs
+
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs(QueuePool, sync_pool_metrics))
+track_pool(engine, sync_pool_metrics)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
+def _async_url(url: str) -> tuple[str, dict]:
+    """postgresql://...?sslmode=require -> postgresql+asyncpg://... plus asyncpg connect_args."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    connect_args = {}
+    sslmode = query.pop("sslmode", None)
+    if sslmode and sslmode != "disable":
+        connect_args["ssl"] = sslmode
+    if uses_transaction_pooler():
+        # Server-side prepared statements do not survive transaction pooling
+        query["prepared_statement_cache_size"] = "0"
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    scheme = "postgresql+asyncpg"
+    return urlunsplit((scheme, parts.netloc, parts.path, urlencode(query), parts.fragment)), connect_args
+
+
+# Async engine is only built when selected (DB_ASYNC=true), so asyncpg stays optional otherwise
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _url, _connect_args = _async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        _url,
+        connect_args=_connect_args,
+        **_engine_kwargs(AsyncAdaptedQueuePool, async_pool_metrics),
+    )
+    track_pool(async_engine.sync_engine, async_pool_metrics)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def pool_stats() -> list[dict]:
+    out = [sync_pool_metrics.stats(engine.pool)]
+    if async_engine is not None:
+        out.append(async_pool_metrics.stats(async_engine.pool))
+    return out
+
+
 class Base(DeclarativeBase):
-    pass
\ No newline at end of file
+    pass
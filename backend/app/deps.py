@@ -1,52 +1,135 @@
-from datetime import datetime, timezone
-from fastapi import Depends, HTTPException, Request
+from datetime import date, datetime, timezone
+from fastapi import Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session as OrmSession
 
-from app.db import SessionLocal
+from app.db import AsyncSessionLocal, SessionLocal
 from app.models import Session as DbSession, User
 from app.config import settings
+from app.services.leave_queries import leave_filters, paginate
+from app.services.session_cache import AuthUser, session_cache
 
 
 def get_db():
+    # Unit of work: one commit after the handler succeeds, rollback if it raises.
+    # Handlers flush() when they need generated ids instead of committing.
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
 def _utcnow():
     return datetime.now(timezone.utc)
 
 
-def get_current_user(request: Request, db: OrmSession = Depends(get_db)) -> User:
+def _session_sid(request: Request) -> str:
     sid = request.cookies.get(settings.SESSION_COOKIE_NAME)
     if not sid:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    return sid
+
+
+def _auth_stmt(sid: str):
+    # One round trip, read-only: expired rows are left for the session sweeper
+    return (
+        select(
+            DbSession.expires_at,
+            User.id,
+            User.role,
+            User.name,
+            User.email,
+            User.employee_code,
+        )
+        .join(User, User.id == DbSession.user_id)
+        .where(DbSession.id == sid)
+    )
+
 
-    s = db.query(DbSession).filter(DbSession.id == sid).first()
-    if not s:
+def _auth_user(sid: str, row) -> AuthUser:
+    if not row:
         raise HTTPException(status_code=401, detail="Invalid session")
 
-    if s.expires_at <= _utcnow():
-        # Expired: delete it
-        db.delete(s)
-        db.commit()
+    if row.expires_at <= _utcnow():
         raise HTTPException(status_code=401, detail="Session expired")
 
-    user = db.query(User).filter(User.id == s.user_id).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
+    auth_user = AuthUser(
+        id=row.id,
+        role=row.role,
+        name=row.name,
+        email=row.email,
+        employee_code=row.employee_code,
+        expires_at=row.expires_at,
+    )
+    session_cache.put(sid, auth_user)
+    return auth_user
+
+
+def get_current_user(request: Request, db: OrmSession = Depends(get_db)) -> AuthUser:
+    sid = _session_sid(request)
+    cached = session_cache.get(sid)
+    if cached:
+        return cached
+    return _auth_user(sid, db.execute(_auth_stmt(sid)).first())
+
+
+async def get_current_user_async(request: Request, db: AsyncSession = Depends(get_async_db)) -> AuthUser:
+    sid = _session_sid(request)
+    cached = session_cache.get(sid)
+    if cached:
+        return cached
+    return _auth_user(sid, (await db.execute(_auth_stmt(sid))).first())
 
 
-def require_admin(user: User = Depends(get_current_user)) -> User:
+def require_admin(user: AuthUser = Depends(get_current_user)) -> AuthUser:
     if user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
     return user
 
 
-def require_employee(user: User = Depends(get_current_user)) -> User:
+def require_employee(user: AuthUser = Depends(get_current_user)) -> AuthUser:
     if user.role != "employee":
         raise HTTPException(status_code=403, detail="Employee only")
-    return user
\ No newline at end of file
+    return user
+
+
+async def require_admin_async(user: AuthUser = Depends(get_current_user_async)) -> AuthUser:
+    return require_admin(user)
+
+
+async def require_employee_async(user: AuthUser = Depends(get_current_user_async)) -> AuthUser:
+    return require_employee(user)
+
+
+def leave_listing_filters(
+    month: str | None = None,
+    date_from: date | None = Query(None, alias="from"),
+    date_to: date | None = Query(None, alias="to"),
+) -> list:
+    try:
+        return leave_filters(month, date_from, date_to)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month or date range")
+
+
+def page_stmt(stmt, cursor: str | None, limit: int):
+    try:
+        return paginate(stmt, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
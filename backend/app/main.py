@@ -1,26 +1,60 @@
-import os
+import asyncio
+import math
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, date, timezone
 from pathlib import Path
 
-from fastapi import FastAPI, Depends, HTTPException, Request, Response
+import orjson
+from fastapi import Body, FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, false, func, select, update
 from sqlalchemy.orm import Session as OrmSession
 
 from app.config import settings
-from app.deps import get_db, get_current_user, require_admin, require_employee
-from app.models import User, Session as DbSession, LeaveRequest, AppSetting, EmailConfig
+from app.db import pool_stats
+from app.deps import get_db, get_current_user, require_admin, require_employee, leave_listing_filters, page_stmt
+from app.models import User, Session as DbSession, LeaveRequest, AppSetting, Holiday
 from app.schemas import (
     BootstrapOut, RegisterAdminIn, RegisterEmployeeIn, LoginIn, MeOut,
-    LeaveApplyIn, LeaveOut, LeaveDecisionIn, EmployeeOut,
-    EmailConfigOut, EmailConfigIn, TestEmailOut
+    LeaveApplyIn, LeaveOut, LeaveDecisionIn, LeaveBulkDecisionIn, LeaveDecisionResultOut, EmployeeOut,
+    LeaveBalanceOut, EmployeeBalanceOut, AdminStatsOut, HolidayIn, HolidayOut, EmployeeImportOut, EmailConfigOut, EmailConfigIn, TestEmailOut
 )
-from app.services.leave_calc import calc_total_days
+from app.services.employee_import import import_employees
+from app.services.etags import cache_headers, employee_version_stmt, leave_version_stmt, make_etag, matching_etag, not_modified
+from app.services.json_compression import JsonCompressionMiddleware
+from app.services.leave_apply import LeaveConflictError, submit_leave
+from app.services.leave_balance import balance_rollup, current_year, employee_balance, record_approvals
+from app.services.leave_events import leave_event_hub, leave_event_listener, queue_leave_event
+from app.services.leave_export import ENCODERS, export_stmt, stream_export
+from app.services.leave_stats import admin_stats, record_leave_stats
+from app.services.leave_serializer import LEAVE_OUT_COLUMNS, LeaveListResponse, leave_out
+from app.services.leave_queries import MAX_PAGE_SIZE, decision_items, leave_list_stmt, split_page
+from app.services.query_stats import QueryStatsMiddleware
+from app.services.rate_limit import login_limiter
+from app.services.request_metrics import request_metrics
+from app.services.session_cache import AuthUser, invalidate_on_commit, session_cache
+from app.services.static_assets import PrecompressedStaticFiles
+from app.services.team_calendar import team_calendar_json
+from app.services.session_sweeper import session_sweeper
+from app.services.email_outbox import outbox_workers
 from app.services.email_service import (
-    get_email_config, update_email_config, notify_admin_new_leave, notify_employee_decision, try_send
+    get_email_config, update_email_config, notify_employee_decision, try_send
 )
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    session_sweeper.start()
+    outbox_workers.start()
+    leave_event_listener.start()
+    yield
+    leave_event_listener.stop()
+    outbox_workers.stop()
+    session_sweeper.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Same-domain deployment: keep CORS minimal (still allow local dev if you run frontend separately)
 app.add_middleware(
@@ -29,14 +63,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-DB-Queries", "X-DB-Commits", "Server-Timing"],
+)
+app.add_middleware(JsonCompressionMiddleware, min_size=settings.JSON_COMPRESS_MIN_BYTES)
+app.add_middleware(
+    QueryStatsMiddleware,
+    emit_headers=settings.QUERY_STATS_HEADERS,
+    sample_rate=settings.METRICS_SAMPLE_RATE,
+    slow_query_ms=settings.SLOW_QUERY_MS,
 )
 
+if settings.DB_ASYNC:
+    # Registered first so these paths resolve to the async handlers
+    from app.async_routes import router as async_router
+    app.include_router(async_router, include_in_schema=False)
+
 def _utcnow():
     return datetime.now(timezone.utc)
 
 def _session_expiry():
     return _utcnow() + timedelta(days=settings.SESSION_TTL_DAYS)
 
+def _client_ip(request: Request) -> str | None:
+    if settings.TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            # The last TRUSTED_PROXY_HOPS entries were appended by our proxies, the left-most of them
+            # is the client they saw; anything further left is client-supplied
+            entries = forwarded.split(",")
+            return entries[max(0, len(entries) - max(1, settings.TRUSTED_PROXY_HOPS))].strip()
+    return request.client.host if request.client else None
+
+def _cookie_sid(request: Request) -> uuid.UUID | None:
+    raw = request.cookies.get(settings.SESSION_COOKIE_NAME)
+    try:
+        return uuid.UUID(raw) if raw else None
+    except ValueError:
+        return None
+
+def _normalized_name(name: str):
+    # Same expression as users.name_normalized, evaluated once on the parameter
+    return func.lower(func.regexp_replace(func.btrim(name), r"\s+", " ", "g"))
+
+def _new_session(u: User, request: Request) -> DbSession:
+    return DbSession(
+        user=u,
+        expires_at=_session_expiry(),
+        ip=_client_ip(request),
+        user_agent=request.headers.get("user-agent"),
+    )
+
 def _set_session_cookie(resp: Response, session_id: str):
     resp.set_cookie(
         key=settings.SESSION_COOKIE_NAME,
@@ -48,9 +124,43 @@ def _set_session_cookie(resp: Response, session_id: str):
         max_age=settings.SESSION_TTL_DAYS * 24 * 3600,
     )
 
+MAX_BULK_DECISIONS = 1000
+MAX_CALENDAR_DAYS = 366
+
 def _clear_session_cookie(resp: Response):
     resp.delete_cookie(key=settings.SESSION_COOKIE_NAME, path="/")
 
+def _record_decisions(db: OrmSession, rows: list) -> None:
+    """
+    Deltas for leaves moved out of pending. `rows` must come from a guarded
+    UPDATE ... WHERE status = 'pending' RETURNING, so a leave decided by two
+    concurrent requests is counted once in balances and the summary tables.
+    """
+    if not rows:
+        return
+    record_approvals(db, [r for r in rows if r.status == "approved"])
+    record_leave_stats(db, [(r, "pending") for r in rows])
+    db.info["leaves_changed"] = True
+    for r in rows:
+        queue_leave_event(db, "decided", r)
+
+def _fetch_page(db: OrmSession, stmt, cursor: str | None, limit: int) -> tuple[list, str | None]:
+    # Next page token goes out as X-Next-Cursor so the body stays a plain list[LeaveOut]
+    return split_page(db.execute(page_stmt(stmt, cursor, limit)).all(), limit)
+
+def _leave_listing(request: Request, db: OrmSession, scope: str, preds: list, cursor: str | None, limit: int) -> Response:
+    # Only the first page is revalidated (what a list view polls): a matching If-None-Match costs one
+    # aggregate query and loads no rows. Keyset pages after it skip the aggregate and carry no ETag.
+    if cursor:
+        rows, next_cursor = _fetch_page(db, leave_list_stmt(*preds), cursor, limit)
+        return LeaveListResponse(rows, next_cursor)
+    etag = make_etag(scope, db.execute(leave_version_stmt(*preds)).one(), request)
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+    rows, next_cursor = _fetch_page(db, leave_list_stmt(*preds), cursor, limit)
+    return LeaveListResponse(rows, next_cursor, headers=cache_headers(etag))
+
 @app.get("/api/bootstrap", response_model=BootstrapOut)
 def bootstrap(db: OrmSession = Depends(get_db)):
     has_admin = db.query(User).filter(User.role == "admin").first() is not None
@@ -74,21 +184,10 @@ def register_admin(payload: RegisterAdminIn, response: Response, request: Reques
 
     u = User(role="admin", name=payload.name.strip(), dob=payload.dob, email=payload.email.strip())
     db.add(u)
-    db.commit()
-    db.refresh(u)
-
     db.merge(AppSetting(key="admin_setup_used", value="1"))
-    db.commit()
-
-    sess = DbSession(
-        user_id=u.id,
-        expires_at=_session_expiry(),
-        ip=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-    )
+    sess = _new_session(u, request)
     db.add(sess)
-    db.commit()
-    db.refresh(sess)
+    db.flush()  # ids come back with the INSERTs; get_db commits once at the end
 
     _set_session_cookie(response, str(sess.id))
     return {"id": str(u.id), "role": u.role, "name": u.name}
@@ -106,201 +205,257 @@ def register_employee(payload: RegisterEmployeeIn, response: Response, request:
         email=payload.email.strip() if payload.email else None,
     )
     db.add(u)
-    db.commit()
-    db.refresh(u)
-
-    sess = DbSession(
-        user_id=u.id,
-        expires_at=_session_expiry(),
-        ip=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-    )
+    sess = _new_session(u, request)
     db.add(sess)
-    db.commit()
-    db.refresh(sess)
+    db.flush()
 
     _set_session_cookie(response, str(sess.id))
     return {"id": str(u.id), "role": u.role, "name": u.name}
 
 @app.post("/api/auth/login", response_model=MeOut)
 def login(payload: LoginIn, response: Response, request: Request, db: OrmSession = Depends(get_db)):
-    # No ambiguity handling per your request (assumes unique enough in your org)
-    u = db.query(User).filter(User.name == payload.name.strip(), User.dob == payload.dob).first()
-    if not u:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    # Throttled per client IP and per name before any DB work
+    wait = login_limiter.check(f"ip:{_client_ip(request)}", "name:" + " ".join(payload.name.split()).lower())
+    if wait:
+        raise HTTPException(status_code=429, detail="Too many login attempts", headers={"Retry-After": str(math.ceil(wait))})
 
-    sess = DbSession(
-        user_id=u.id,
-        expires_at=_session_expiry(),
-        ip=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
+    # One probe on users_name_norm_dob_idx, which also brings back this device's live session if it has one.
+    # No ambiguity handling per your request (assumes unique enough in your org)
+    sid = _cookie_sid(request)
+    live_session = (
+        (DbSession.id == sid) & (DbSession.user_id == User.id) & (DbSession.expires_at > _utcnow())
+        if sid else false()
     )
-    db.add(sess)
-    db.commit()
-    db.refresh(sess)
+    row = db.execute(
+        select(User, DbSession.id.label("sid"))
+        .outerjoin(DbSession, live_session)
+        .where(User.name_normalized == _normalized_name(payload.name), User.dob == payload.dob)
+        .limit(1)
+    ).first()
+    if not row:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    _set_session_cookie(response, str(sess.id))
+    u = row.User
+    if row.sid:
+        # Reuse it for a fresh lifetime, matching the cookie's new max_age
+        session_id = row.sid
+        db.execute(update(DbSession).where(DbSession.id == session_id).values(expires_at=_session_expiry()))
+        invalidate_on_commit(db, session_id)
+    else:
+        sess = _new_session(u, request)
+        db.add(sess)
+        db.flush()
+        session_id = sess.id
+
+    _set_session_cookie(response, str(session_id))
     return {"id": str(u.id), "role": u.role, "name": u.name}
 
 @app.post("/api/auth/logout")
-def logout(response: Response, user: User = Depends(get_current_user), db: OrmSession = Depends(get_db), request: Request = None):
+def logout(response: Response, user: AuthUser = Depends(get_current_user), db: OrmSession = Depends(get_db), request: Request = None):
     sid = request.cookies.get(settings.SESSION_COOKIE_NAME) if request else None
     if sid:
-        s = db.query(DbSession).filter(DbSession.id == sid).first()
-        if s:
-            db.delete(s)
-            db.commit()
+        db.execute(delete(DbSession).where(DbSession.id == sid))
+        invalidate_on_commit(db, sid)
     _clear_session_cookie(response)
     return {"ok": True}
 
 @app.get("/api/auth/me", response_model=MeOut)
-def me(user: User = Depends(get_current_user)):
+def me(user: AuthUser = Depends(get_current_user)):
     return {"id": str(user.id), "role": user.role, "name": user.name}
 
-def _dates_overlap(a_start: date, a_end: date, b_start: date, b_end: date) -> bool:
-    return a_start <= b_end and b_start <= a_end
-
 @app.post("/api/leaves", response_model=LeaveOut)
-def apply_leave(payload: LeaveApplyIn, db: OrmSession = Depends(get_db), employee: User = Depends(require_employee)):
-
-    # ---- NEW: overlap check ----
-    existing = (
-        db.query(LeaveRequest)
-        .filter(
-            LeaveRequest.employee_user_id == employee.id,
-            LeaveRequest.status.in_(["pending", "approved", "rejected"]),
-        )
-        .all()
-    )
-
-    for lr in existing:
-        if _dates_overlap(
-            payload.startDate,
-            payload.endDate,
-            lr.start_date,
-            lr.end_date,
-        ):
-            raise HTTPException(
-                status_code=409,
-                detail=f"Leave already exists from {lr.start_date} to {lr.end_date} ({lr.status})",
-            )
-    # ---- END NEW ----
-
+def apply_leave(payload: LeaveApplyIn, db: OrmSession = Depends(get_db), employee: AuthUser = Depends(require_employee)):
     try:
-        total, excluded_str = calc_total_days(
-            payload.startDate,
-            payload.endDate,
-            payload.excludedDates
-        )
+        lr = submit_leave(db, employee, payload)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date range")
+    except LeaveConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return leave_out(lr)
 
-    ...
 @app.get("/api/leaves/my", response_model=list[LeaveOut])
-def my_leaves(month: str | None = None, db: OrmSession = Depends(get_db), employee: User = Depends(require_employee)):
-    q = db.query(LeaveRequest).filter(LeaveRequest.employee_user_id == employee.id)
-    if month:
-    # month = YYYY-MM
-        y, m = map(int, month.split("-"))
-        start = date(y, m, 1)
-
-        if m == 12:
-            end = date(y + 1, 1, 1)
-        else:
-            end = date(y, m + 1, 1)
-
-        q = q.filter(
-            LeaveRequest.created_at >= start,
-            LeaveRequest.created_at < end,
-        )
-    q = q.order_by(LeaveRequest.created_at.desc()).limit(200)
-    rows = q.all()
-
-    out = []
-    for lr in rows:
-        out.append({
-            "id": str(lr.id),
-            "startDate": lr.start_date,
-            "endDate": lr.end_date,
-            "excludedDates": [datetime.fromisoformat(d).date() for d in lr.excluded_dates],
-            "totalDays": lr.total_days,
-            "reason": lr.reason,
-            "status": lr.status,
-            "adminComment": lr.admin_comment,
-            "createdAt": lr.created_at.isoformat(),
-        })
-    return out
+def my_leaves(
+    request: Request,
+    filters: list = Depends(leave_listing_filters),
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    db: OrmSession = Depends(get_db),
+    employee: AuthUser = Depends(require_employee),
+):
+    preds = [LeaveRequest.employee_user_id == employee.id, *filters]
+    return _leave_listing(request, db, f"my:{employee.id}", preds, cursor, limit)
 
 @app.get("/api/leaves/my/pending", response_model=list[LeaveOut])
-def my_pending(db: OrmSession = Depends(get_db), employee: User = Depends(require_employee)):
-    rows = (
-        db.query(LeaveRequest)
-        .filter(LeaveRequest.employee_user_id == employee.id, LeaveRequest.status == "pending")
-        .order_by(LeaveRequest.created_at.desc())
-        .all()
-    )
-    out = []
-    for lr in rows:
-        out.append({
-            "id": str(lr.id),
-            "startDate": lr.start_date,
-            "endDate": lr.end_date,
-            "excludedDates": [datetime.fromisoformat(d).date() for d in lr.excluded_dates],
-            "totalDays": lr.total_days,
-            "reason": lr.reason,
-            "status": lr.status,
-            "adminComment": lr.admin_comment,
-            "createdAt": lr.created_at.isoformat(),
-        })
-    return out
+def my_pending(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    db: OrmSession = Depends(get_db),
+    employee: AuthUser = Depends(require_employee),
+):
+    preds = [LeaveRequest.employee_user_id == employee.id, LeaveRequest.status == "pending"]
+    return _leave_listing(request, db, f"my-pending:{employee.id}", preds, cursor, limit)
+
+@app.get("/api/leaves/my/balance", response_model=LeaveBalanceOut)
+def my_balance(
+    year: int | None = Query(None, ge=1900, le=9999),
+    db: OrmSession = Depends(get_db),
+    employee: AuthUser = Depends(require_employee),
+):
+    return employee_balance(db, employee.id, year or current_year())
 
 @app.get("/api/admin/employees", response_model=list[EmployeeOut])
-def admin_employees(db: OrmSession = Depends(get_db), admin: User = Depends(require_admin)):
-    rows = db.query(User).filter(User.role == "employee").order_by(User.name.asc()).all()
+def admin_employees(request: Request, response: Response, db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
+    etag = make_etag("employees", db.execute(employee_version_stmt()).one(), request)
+    matched = matching_etag(request, etag)
+    if matched:
+        return not_modified(matched)
+    response.headers.update(cache_headers(etag))
+    rows = db.execute(
+        select(User.id, User.name, User.employee_code).where(User.role == "employee").order_by(User.name.asc())
+    ).all()
     return [{"id": str(u.id), "name": u.name, "employeeCode": u.employee_code} for u in rows]
 
+@app.post("/api/admin/employees/import", response_model=EmployeeImportOut)
+def import_employees_csv(
+    body: bytes = Body(..., media_type="text/csv"),
+    db: OrmSession = Depends(get_db),
+    admin: AuthUser = Depends(require_admin),
+):
+    try:
+        return import_employees(db, body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/api/admin/leaves/pending", response_model=list[LeaveOut])
-def admin_pending(employeeId: str | None = None, month: str | None = None, db: OrmSession = Depends(get_db), admin: User = Depends(require_admin)):
-    q = db.query(LeaveRequest).filter(LeaveRequest.status == "pending")
+def admin_pending(
+    request: Request,
+    employeeId: str | None = None,
+    filters: list = Depends(leave_listing_filters),
+    cursor: str | None = None,
+    limit: int = Query(200, ge=1, le=MAX_PAGE_SIZE),
+    db: OrmSession = Depends(get_db),
+    admin: AuthUser = Depends(require_admin),
+):
+    preds = [LeaveRequest.status == "pending", *filters]
     if employeeId:
-        q = q.filter(LeaveRequest.employee_user_id == employeeId)
-    if month:
-        q = q.filter(LeaveRequest.created_at >= f"{month}-01")
-    rows = q.order_by(LeaveRequest.created_at.desc()).limit(200).all()
+        preds.append(LeaveRequest.employee_user_id == employeeId)
+    return _leave_listing(request, db, "pending", preds, cursor, limit)
+
+@app.post("/api/admin/leaves/decisions", response_model=list[LeaveDecisionResultOut])
+def decide_leaves(payload: list[LeaveBulkDecisionIn], db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
+    if len(payload) > MAX_BULK_DECISIONS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_DECISIONS} decisions per request")
+
+    # One UPDATE ... FROM unnest(ids, comments) RETURNING per decision; only still-pending rows change.
+    # An id listed twice is decided by its first valid entry, later ones report already_decided.
+    groups: dict[str, tuple[list[uuid.UUID], list[str | None]]] = defaultdict(lambda: ([], []))
+    parsed: list[uuid.UUID | None] = []
+    repeated: set[int] = set()
+    seen: set[uuid.UUID] = set()
+    for i, item in enumerate(payload):
+        try:
+            leave_id = uuid.UUID(item.id)
+        except ValueError:
+            leave_id = None
+        parsed.append(leave_id)
+        if leave_id and item.decision in ("approved", "rejected"):
+            if leave_id in seen:
+                repeated.add(i)
+                continue
+            seen.add(leave_id)
+            ids, comments = groups[item.decision]
+            ids.append(leave_id)
+            comments.append(item.comment.strip() if item.comment else None)
+
+    now = _utcnow()
+    applied = {}
+    for decision, (ids, comments) in groups.items():
+        items = decision_items(ids, comments)
+        rows = db.execute(
+            update(LeaveRequest)
+            .where(LeaveRequest.id == items.c.id, LeaveRequest.status == "pending")
+            .values(status=decision, admin_comment=items.c.comment, decided_by_admin_user_id=admin.id, decided_at=now)
+            .returning(
+                LeaveRequest.id,
+                LeaveRequest.employee_user_id,
+                LeaveRequest.start_date,
+                LeaveRequest.end_date,
+                LeaveRequest.excluded_dates,
+                LeaveRequest.total_days,
+                LeaveRequest.status,
+                LeaveRequest.admin_comment,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        applied.update({r.id: r for r in rows})
+
+    # Tell "already decided" apart from "not found" with one lookup
+    missing = [i for ids, _ in groups.values() for i in ids if i not in applied]
+    existing = set(db.execute(select(LeaveRequest.id).where(LeaveRequest.id.in_(missing))).scalars()) if missing else set()
+
+    _record_decisions(db, list(applied.values()))
+
+    if applied:
+        employee_ids = {r.employee_user_id for r in applied.values()}
+        employees = {u.id: u for u in db.query(User).filter(User.id.in_(employee_ids))}
+        for r in applied.values():
+            employee = employees.get(r.employee_user_id)
+            if employee:
+                notify_employee_decision(
+                    db,
+                    employee=employee,
+                    status=r.status,
+                    start=r.start_date.isoformat(),
+                    end=r.end_date.isoformat(),
+                    total_days=r.total_days,
+                    comment=r.admin_comment,
+                )
+
     out = []
-    for lr in rows:
-        out.append({
-            "id": str(lr.id),
-            "startDate": lr.start_date,
-            "endDate": lr.end_date,
-            "excludedDates": [datetime.fromisoformat(d).date() for d in lr.excluded_dates],
-            "totalDays": lr.total_days,
-            "reason": lr.reason,
-            "status": lr.status,
-            "adminComment": lr.admin_comment,
-            "createdAt": lr.created_at.isoformat(),
-        })
+    for i, (item, leave_id) in enumerate(zip(payload, parsed)):
+        if item.decision not in ("approved", "rejected"):
+            out.append({"id": item.id, "result": "invalid_decision"})
+        elif i in repeated:
+            out.append({"id": item.id, "result": "already_decided"})
+        elif leave_id in applied:
+            out.append({"id": item.id, "result": "applied", "status": applied[leave_id].status})
+        elif leave_id in existing:
+            out.append({"id": item.id, "result": "already_decided"})
+        else:
+            out.append({"id": item.id, "result": "not_found"})
     return out
 
 @app.post("/api/admin/leaves/{leave_id}/decision", response_model=LeaveOut)
-def decide_leave(leave_id: str, payload: LeaveDecisionIn, db: OrmSession = Depends(get_db), admin: User = Depends(require_admin)):
+def decide_leave(leave_id: str, payload: LeaveDecisionIn, db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
     if payload.decision not in ("approved", "rejected"):
         raise HTTPException(status_code=400, detail="Invalid decision")
 
-    lr = db.query(LeaveRequest).filter(LeaveRequest.id == leave_id).first()
-    if not lr:
+    try:
+        leave_uuid = uuid.UUID(leave_id)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Leave not found")
-    if lr.status != "pending":
-        raise HTTPException(status_code=409, detail="Already decided")
 
-    lr.status = payload.decision
-    lr.admin_comment = payload.comment.strip() if payload.comment else None
-    lr.decided_by_admin_user_id = admin.id
-    lr.decided_at = _utcnow()
+    # Guarded like decide_leaves: of two concurrent decisions only one gets the row back,
+    # so balances, stats and notifications are applied exactly once
+    lr = db.execute(
+        update(LeaveRequest)
+        .where(LeaveRequest.id == leave_uuid, LeaveRequest.status == "pending")
+        .values(
+            status=payload.decision,
+            admin_comment=payload.comment.strip() if payload.comment else None,
+            decided_by_admin_user_id=admin.id,
+            decided_at=_utcnow(),
+        )
+        .returning(*LEAVE_OUT_COLUMNS, LeaveRequest.employee_user_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if not lr:
+        if db.execute(select(LeaveRequest.id).where(LeaveRequest.id == leave_uuid)).first():
+            raise HTTPException(status_code=409, detail="Already decided")
+        raise HTTPException(status_code=404, detail="Leave not found")
 
-    db.add(lr)
-    db.commit()
-    db.refresh(lr)
+    _record_decisions(db, [lr])
 
     employee = db.query(User).filter(User.id == lr.employee_user_id).first()
     if employee:
@@ -314,41 +469,145 @@ def decide_leave(leave_id: str, payload: LeaveDecisionIn, db: OrmSession = Depen
             comment=lr.admin_comment,
         )
 
-    return {
-        "id": str(lr.id),
-        "startDate": lr.start_date,
-        "endDate": lr.end_date,
-        "excludedDates": [datetime.fromisoformat(d).date() for d in lr.excluded_dates],
-        "totalDays": lr.total_days,
-        "reason": lr.reason,
-        "status": lr.status,
-        "adminComment": lr.admin_comment,
-        "createdAt": lr.created_at.isoformat(),
-    }
+    return leave_out(lr)
 
 @app.get("/api/admin/employees/{employee_id}/leaves", response_model=list[LeaveOut])
-def admin_employee_leaves(employee_id: str, month: str | None = None, db: OrmSession = Depends(get_db), admin: User = Depends(require_admin)):
-    q = db.query(LeaveRequest).filter(LeaveRequest.employee_user_id == employee_id)
-    if month:
-        q = q.filter(LeaveRequest.created_at >= f"{month}-01")
-    rows = q.order_by(LeaveRequest.created_at.desc()).limit(400).all()
-    out = []
-    for lr in rows:
-        out.append({
-            "id": str(lr.id),
-            "startDate": lr.start_date,
-            "endDate": lr.end_date,
-            "excludedDates": [datetime.fromisoformat(d).date() for d in lr.excluded_dates],
-            "totalDays": lr.total_days,
-            "reason": lr.reason,
-            "status": lr.status,
-            "adminComment": lr.admin_comment,
-            "createdAt": lr.created_at.isoformat(),
-        })
+def admin_employee_leaves(
+    request: Request,
+    employee_id: str,
+    filters: list = Depends(leave_listing_filters),
+    cursor: str | None = None,
+    limit: int = Query(400, ge=1, le=MAX_PAGE_SIZE),
+    db: OrmSession = Depends(get_db),
+    admin: AuthUser = Depends(require_admin),
+):
+    preds = [LeaveRequest.employee_user_id == employee_id, *filters]
+    return _leave_listing(request, db, f"employee:{employee_id}", preds, cursor, limit)
+
+@app.get("/api/admin/leaves/stream")
+async def leave_event_stream(request: Request, admin: AuthUser = Depends(require_admin)):
+    # Server-sent events: `created` / `decided` leaves as they commit, `resync` when
+    # events may have been missed (the client reloads the list). Holds no DB connection.
+    async def events():
+        sub = leave_event_hub.subscribe()
+        queue = sub[1]
+        try:
+            yield b"retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event_id, ev = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"  # keeps proxies from closing an idle connection
+                    continue
+                yield f"id: {event_id}\nevent: {ev['type']}\ndata: ".encode() + orjson.dumps(ev) + b"\n\n"
+        finally:
+            leave_event_hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/admin/leaves/export")
+def export_leaves(
+    filters: list = Depends(leave_listing_filters),
+    status: str | None = None,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    admin: AuthUser = Depends(require_admin),
+):
+    if status and status not in ("pending", "approved", "rejected"):
+        raise HTTPException(status_code=400, detail="Invalid status")
+    preds = list(filters)
+    if status:
+        preds.append(LeaveRequest.status == status)
+    enc = ENCODERS[format]
+    return StreamingResponse(
+        stream_export(export_stmt(*preds), format),
+        media_type=enc.media_type,
+        headers={"Content-Disposition": f'attachment; filename="leaves.{enc.extension}"'},
+    )
+
+@app.get("/api/admin/calendar")
+def admin_calendar(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    db: OrmSession = Depends(get_db),
+    admin: AuthUser = Depends(require_admin),
+):
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="Invalid date range")
+    if (date_to - date_from).days + 1 > MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CALENDAR_DAYS} days per request")
+    return Response(content=team_calendar_json(db, date_from, date_to), media_type="application/json")
+
+@app.get("/api/admin/balances", response_model=list[EmployeeBalanceOut])
+def admin_balances(
+    year: int | None = Query(None, ge=1900, le=9999),
+    db: OrmSession = Depends(get_db),
+    admin: AuthUser = Depends(require_admin),
+):
+    return balance_rollup(db, year or current_year())
+
+@app.get("/api/admin/stats", response_model=AdminStatsOut)
+def admin_dashboard_stats(
+    year: int | None = Query(None, ge=1900, le=9999),
+    top: int = Query(10, ge=1, le=100),
+    db: OrmSession = Depends(get_db),
+    admin: AuthUser = Depends(require_admin),
+):
+    return admin_stats(db, year or current_year(), top)
+
+@app.get("/api/holidays", response_model=list[HolidayOut])
+def list_holidays(
+    year: int | None = Query(None, ge=1900, le=9999),
+    db: OrmSession = Depends(get_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    y = year or current_year()
+    rows = db.query(Holiday).filter(Holiday.day >= date(y, 1, 1), Holiday.day <= date(y, 12, 31)).order_by(Holiday.day).all()
+    return [{"day": h.day, "name": h.name} for h in rows]
+
+@app.put("/api/admin/holidays/{day}", response_model=HolidayOut)
+def put_holiday(day: date, payload: HolidayIn, db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
+    h = db.merge(Holiday(day=day, name=payload.name.strip(), updated_at=_utcnow()))
+    db.flush()
+    # Work calendar cache is rebuilt once this commits
+    db.info["holidays_changed"] = True
+    return {"day": h.day, "name": h.name}
+
+@app.delete("/api/admin/holidays/{day}")
+def delete_holiday(day: date, db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
+    deleted = db.execute(delete(Holiday).where(Holiday.day == day)).rowcount
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+    db.info["holidays_changed"] = True
+    return {"ok": True}
+
+@app.get("/api/admin/session-cache")
+def admin_session_cache_stats(admin: AuthUser = Depends(require_admin)):
+    return session_cache.stats()
+
+@app.get("/api/admin/db-pool")
+def admin_db_pool_stats(admin: AuthUser = Depends(require_admin)):
+    return pool_stats()
+
+@app.get("/api/admin/metrics")
+def admin_metrics(reset: bool = False, admin: AuthUser = Depends(require_admin)):
+    out = {
+        "sampleRate": settings.METRICS_SAMPLE_RATE,
+        "routes": request_metrics.stats(),
+        "sessionCache": session_cache.stats(),
+        "dbPool": pool_stats(),
+        "loginRateLimited": login_limiter.rejected,
+        "leaveEvents": leave_event_hub.stats(),
+    }
+    if reset:
+        request_metrics.reset()
     return out
 
 @app.get("/api/admin/email-config", response_model=EmailConfigOut)
-def admin_get_email_config(db: OrmSession = Depends(get_db), admin: User = Depends(require_admin)):
+def admin_get_email_config(db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
     cfg = get_email_config(db)
 
     # compute validity without decrypting
@@ -376,7 +635,7 @@ def admin_get_email_config(db: OrmSession = Depends(get_db), admin: User = Depen
     }
 
 @app.put("/api/admin/email-config", response_model=EmailConfigOut)
-def admin_put_email_config(payload: EmailConfigIn, db: OrmSession = Depends(get_db), admin: User = Depends(require_admin)):
+def admin_put_email_config(payload: EmailConfigIn, db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
     cfg = update_email_config(db, payload.model_dump())
 
     is_valid = bool(
@@ -403,7 +662,7 @@ def admin_put_email_config(payload: EmailConfigIn, db: OrmSession = Depends(get_
     }
 
 @app.post("/api/admin/email-config/test", response_model=TestEmailOut)
-def admin_test_email(db: OrmSession = Depends(get_db), admin: User = Depends(require_admin)):
+def admin_test_email(db: OrmSession = Depends(get_db), admin: AuthUser = Depends(require_admin)):
     cfg = get_email_config(db)
     to_email = admin.email or cfg.sender_email
     if not to_email:
@@ -415,4 +674,4 @@ def admin_test_email(db: OrmSession = Depends(get_db), admin: User = Depends(req
 # Serve built frontend (single-domain)
 dist_dir = Path(__file__).resolve().parents[2] / "frontend" / "dist"
 if dist_dir.exists():
-    app.mount("/", StaticFiles(directory=str(dist_dir), html=True), name="frontend")
\ No newline at end of file
+    app.mount("/", PrecompressedStaticFiles(str(dist_dir), precompress=settings.STATIC_PRECOMPRESS), name="frontend")
\ No newline at end of file
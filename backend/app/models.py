@@ -1,11 +1,19 @@
 import uuid
-from datetime import datetime, date
-from sqlalchemy import String, Date, DateTime, Boolean, Integer, ForeignKey, Text, CheckConstraint, Index
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime, date, timezone
+from sqlalchemy import Computed, String, Date, DateTime, Boolean, Integer, BigInteger, ForeignKey, Text, CheckConstraint, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
 
+# users.name_normalized: case- and whitespace-insensitive login key
+NAME_NORMALIZED_SQL = r"lower(regexp_replace(btrim(name), '\s+', ' ', 'g'))"
+
+
+def _utcnow() -> datetime:
+    # Aware, so timestamps read back from a just-inserted object serialize like listed ones (+00:00)
+    return datetime.now(timezone.utc)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -13,14 +21,16 @@ class User(Base):
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     role: Mapped[str] = mapped_column(String, nullable=False)  # admin | employee
     name: Mapped[str] = mapped_column(String, nullable=False)
+    name_normalized: Mapped[str] = mapped_column(String, Computed(NAME_NORMALIZED_SQL, persisted=True))
     dob: Mapped[date] = mapped_column(Date, nullable=False)
     email: Mapped[str | None] = mapped_column(String, nullable=True)
     employee_code: Mapped[str | None] = mapped_column(String, nullable=True, unique=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow, onupdate=_utcnow)
 
     __table_args__ = (
         CheckConstraint("role in ('admin','employee')", name="users_role_check"),
-        Index("users_name_dob_idx", "name", "dob"),
+        Index("users_name_norm_dob_idx", "name_normalized", "dob"),
         Index("users_role_idx", "role"),
     )
 
@@ -30,7 +40,7 @@ class Session(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     ip: Mapped[str | None] = mapped_column(String, nullable=True)
     user_agent: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -61,7 +71,9 @@ class LeaveRequest(Base):
     decided_by_admin_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     decided_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    # Also set by bulk UPDATEs (column onupdate); listing ETags are built from it
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow, onupdate=_utcnow)
 
     employee = relationship("User", foreign_keys=[employee_user_id])
     decided_by = relationship("User", foreign_keys=[decided_by_admin_user_id])
@@ -70,9 +82,74 @@ class LeaveRequest(Base):
         CheckConstraint("status in ('pending','approved','rejected')", name="leave_status_check"),
         Index("leave_status_idx", "status"),
         Index("leave_employee_created_idx", "employee_user_id", "created_at"),
+        Index("leave_status_created_idx", "status", "created_at", "id"),
+        Index(
+            "leave_active_period_idx",
+            text("daterange(start_date, end_date, '[]')"),
+            postgresql_using="gist",
+            postgresql_where=text("status in ('pending','approved')"),
+        ),
+        # One employee cannot hold two requests with overlapping [start, end] (needs btree_gist)
+        ExcludeConstraint(
+            ("employee_user_id", "="),
+            (text("daterange(start_date, end_date, '[]')"), "&&"),
+            name="leave_no_overlap_excl",
+            using="gist",
+        ),
     )
 
 
+class LeaveBalance(Base):
+    """Approved leave days per employee and calendar year, kept in step with decisions."""
+    __tablename__ = "leave_balances"
+
+    employee_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    leave_type: Mapped[str] = mapped_column(String, primary_key=True, default="general")
+
+    days_used: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    approved_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+    __table_args__ = (
+        Index("leave_balances_year_type_idx", "year", "leave_type"),
+    )
+
+
+class LeaveMonthStats(Base):
+    """Requests and leave days per month and status; the admin dashboard reads these instead of leave_requests."""
+    __tablename__ = "leave_month_stats"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of the month
+    status: Mapped[str] = mapped_column(String, primary_key=True)
+
+    requests: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+
+class LeaveEmployeeMonthStats(Base):
+    """LeaveMonthStats broken down by employee (top absentees)."""
+    __tablename__ = "leave_employee_month_stats"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    employee_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[str] = mapped_column(String, primary_key=True)
+
+    requests: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+
+class Holiday(Base):
+    """Company holidays; not counted as leave days when LEAVE_COUNT_WORKING_DAYS is on."""
+    __tablename__ = "holidays"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+
 class EmailConfig(Base):
     __tablename__ = "email_config"
 
@@ -91,7 +168,29 @@ class EmailConfig(Base):
     sender_email: Mapped[str | None] = mapped_column(String, nullable=True)
     sender_name: Mapped[str | None] = mapped_column(String, nullable=True)
 
-    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    to_email: Mapped[str] = mapped_column(String, nullable=False)
+    subject: Mapped[str] = mapped_column(String, nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+
+    status: Mapped[str] = mapped_column(String, nullable=False, default="pending")  # pending | sent | failed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("status in ('pending','sent','failed')", name="email_outbox_status_check"),
+        Index("email_outbox_due_idx", "next_attempt_at", postgresql_where=text("status = 'pending'")),
+    )
 
 
 class AppSetting(Base):
@@ -55,12 +55,87 @@ class LeaveDecisionIn(BaseModel):
     comment: str | None = Field(default=None, max_length=300)
 
 
+class LeaveBulkDecisionIn(BaseModel):
+    id: str
+    decision: str  # approved | rejected
+    comment: str | None = Field(default=None, max_length=300)
+
+
+class LeaveDecisionResultOut(BaseModel):
+    id: str
+    result: str  # applied | not_found | already_decided | invalid_decision
+    status: str | None = None
+
+
+class LeaveBalanceOut(BaseModel):
+    year: int
+    leaveType: str
+    daysUsed: int
+    approvedCount: int
+
+
+class EmployeeBalanceOut(BaseModel):
+    employeeId: str
+    name: str
+    employeeCode: str | None
+    daysUsed: int
+    approvedCount: int
+
+
+class StatusTotalsOut(BaseModel):
+    requests: int  # counted in the month the leave starts
+    days: int  # split over the months the leave covers
+
+
+class MonthStatsOut(BaseModel):
+    month: str  # YYYY-MM
+    pending: StatusTotalsOut
+    approved: StatusTotalsOut
+    rejected: StatusTotalsOut
+
+
+class AbsenteeOut(BaseModel):
+    employeeId: str
+    name: str
+    employeeCode: str | None
+    approvedDays: int
+    approvedRequests: int
+
+
+class AdminStatsOut(BaseModel):
+    year: int
+    pending: StatusTotalsOut  # all pending requests, any month
+    currentMonth: MonthStatsOut
+    months: list[MonthStatsOut]
+    topAbsentees: list[AbsenteeOut]
+
+
+class HolidayIn(BaseModel):
+    name: str = Field(min_length=1, max_length=120)
+
+
+class HolidayOut(BaseModel):
+    day: date
+    name: str
+
+
 class EmployeeOut(BaseModel):
     id: str
     name: str
     employeeCode: str | None
 
 
+class EmployeeImportErrorOut(BaseModel):
+    line: int
+    employeeCode: str | None
+    error: str
+
+
+class EmployeeImportOut(BaseModel):
+    inserted: int
+    errors: list[EmployeeImportErrorOut]
+
+
 class EmailConfigOut(BaseModel):
     enabled: bool
     provider: str
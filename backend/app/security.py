@@ -1,8 +1,10 @@
 from cryptography.fernet import Fernet
 import base64
 import hashlib
+from functools import lru_cache
 
 
+@lru_cache(maxsize=8)
 def _fernet(secret: str) -> Fernet:
     # Ensure stable 32-byte key
     key = hashlib.sha256(secret.encode()).digest()
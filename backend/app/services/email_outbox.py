@@ -0,0 +1,137 @@
+import logging
+import threading
+from datetime import timedelta
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import EmailOutbox
+from app.services.email_service import _is_valid, deliver, email_config_cache, is_permanent_error
+
+log = logging.getLogger(__name__)
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = settings.EMAIL_OUTBOX_BACKOFF_SECONDS
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 3600))
+
+
+def claim_batch(db, limit: int):
+    """
+    Lease up to `limit` due messages. The lease is just next_attempt_at pushed
+    forward, so rows held by a crashed worker become due again on their own.
+    """
+    due = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= func.now())
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(due))
+        .values(
+            attempts=EmailOutbox.attempts + 1,
+            next_attempt_at=func.now() + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+        )
+        .returning(EmailOutbox.id, EmailOutbox.to_email, EmailOutbox.subject, EmailOutbox.body, EmailOutbox.attempts)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return rows
+
+
+def _mark(db, outbox_id: int, **values) -> None:
+    db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == outbox_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def process_batch(limit: int | None = None) -> int:
+    """Claim and deliver one batch. Returns the number of messages claimed."""
+    db = SessionLocal()
+    try:
+        rows = claim_batch(db, limit or settings.EMAIL_OUTBOX_BATCH_SIZE)
+        if not rows:
+            return 0
+
+        cfg = email_config_cache.get(db)
+        for row in rows:
+            if not _is_valid(cfg):
+                _mark(db, row.id, status="failed", last_error="Email disabled or invalid config")
+                continue
+            try:
+                if not deliver(cfg, row.to_email, row.subject, row.body):
+                    _mark(db, row.id, status="failed", last_error="Unsupported email mode")
+                    continue
+            except Exception as e:
+                log.warning("email outbox %s attempt %s failed: %s", row.id, row.attempts, e)
+                if row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS or is_permanent_error(e):
+                    _mark(db, row.id, status="failed", last_error=str(e)[:500])
+                else:
+                    _mark(db, row.id, next_attempt_at=func.now() + _backoff(row.attempts), last_error=str(e)[:500])
+                continue
+            _mark(db, row.id, status="sent", sent_at=func.now(), last_error=None)
+        return len(rows)
+    finally:
+        db.close()
+
+
+class OutboxWorkerPool:
+    """Threads that drain email_outbox; woken right after a commit that queued mail."""
+
+    def __init__(self, workers: int, poll_seconds: float):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"email-outbox-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout=15)
+        self._threads = []
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = process_batch()
+            except Exception:
+                log.exception("email outbox batch failed")
+                claimed = 0
+            if claimed:
+                continue  # more may be due
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+
+outbox_workers = OutboxWorkerPool(settings.EMAIL_OUTBOX_WORKERS, settings.EMAIL_OUTBOX_POLL_SECONDS)
+
+
+# Any Session, including the sync side of an AsyncSession
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    if session.info.pop("email_outbox_dirty", False):
+        outbox_workers.wake()
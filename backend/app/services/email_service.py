@@ -1,13 +1,137 @@
 import smtplib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from email.message import EmailMessage
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session as OrmSession
-from app.models import EmailConfig, User
+from app.models import EmailConfig, EmailOutbox, User
 from app.security import decrypt_text, encrypt_text
 from app.config import settings
 import requests
+from requests.adapters import HTTPAdapter
+
+BREVO_URL = "https://api.brevo.com/v3/smtp/email"
+
+
+class _SmtpState(threading.local):
+    """One thread's SMTP connection; every field exists from the thread's first access."""
+
+    def __init__(self):
+        self.conn: smtplib.SMTP | None = None
+        self.key: tuple | None = None
+        self.generation = -1
+        self.last_used = 0.0
+
+
+class MailTransport:
+    """
+    Reuses connections across sends: one warm, authenticated SMTP connection per
+    thread (dropped after EMAIL_SMTP_IDLE_SECONDS, re-dialled on error) and a
+    keep-alive requests.Session for the Brevo API. reset() drops everything,
+    e.g. after the credentials change.
+    """
+
+    def __init__(self, idle_seconds: float):
+        self.idle_seconds = idle_seconds
+        self._local = _SmtpState()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._http: requests.Session | None = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+        # Per-thread SMTP connections notice the new generation on their next use
+        self._close_smtp()
+
+    @property
+    def http(self) -> requests.Session:
+        with self._lock:
+            if self._http is None:
+                s = requests.Session()
+                s.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max(2, settings.EMAIL_OUTBOX_WORKERS + 1)))
+                self._http = s
+            return self._http
+
+    def _close_smtp(self) -> None:
+        conn = self._local.conn
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.quit()
+            except Exception:
+                conn.close()
+
+    def _smtp(self, cfg: "EmailSettings", password: str) -> smtplib.SMTP:
+        key = (cfg.smtp_host, cfg.smtp_port, cfg.smtp_user, cfg.smtp_pass_enc)
+        st = self._local
+        fresh = (
+            st.conn is not None
+            and st.generation == self._generation
+            and st.key == key
+            and time.monotonic() - st.last_used < self.idle_seconds
+        )
+        if fresh:
+            return st.conn
+
+        self._close_smtp()
+        conn = smtplib.SMTP(cfg.smtp_host, int(cfg.smtp_port), timeout=10)
+        try:
+            # TLS (587) typical for free-tier SMTP
+            conn.ehlo()
+            if not settings.EMAIL_SMTP_INSECURE_LOCAL:
+                conn.starttls()
+                conn.ehlo()
+                conn.login(cfg.smtp_user, password)
+        except Exception:
+            conn.close()
+            raise
+        st.conn, st.key, st.generation, st.last_used = conn, key, self._generation, time.monotonic()
+        return conn
+
+    def send_smtp(self, cfg: "EmailSettings", password: str, msg: EmailMessage) -> None:
+        for attempt in (1, 2):
+            conn = self._smtp(cfg, password)
+            try:
+                conn.send_message(msg)
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                # Stale connection (server idle timeout etc.): dial again once
+                self._close_smtp()
+                if attempt == 2:
+                    raise
+            except smtplib.SMTPResponseException as e:
+                # 421: the server is closing this connection, a new one may work.
+                # Anything else (550 recipient, 552 size, ...) is an answer about this
+                # message; sendmail has already RSET the connection, so keep it.
+                if e.smtp_code != 421 or attempt == 2:
+                    raise
+                self._close_smtp()
+            finally:
+                # Other SMTPExceptions (e.g. every recipient refused) propagate as they are;
+                # either way a connection we keep was just active
+                if self._local.conn is conn:
+                    self._local.last_used = time.monotonic()
+
+
+def is_permanent_error(e: Exception) -> bool:
+    """A 5xx answer to this message: retrying later will not help."""
+    if isinstance(e, smtplib.SMTPResponseException):
+        return e.smtp_code >= 500
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in e.recipients.values())
+    return False
+
 
+mail_transport = MailTransport(settings.EMAIL_SMTP_IDLE_SECONDS)
 
-def _is_valid(cfg: EmailConfig) -> bool:
+
+def _is_valid(cfg: "EmailConfig | EmailSettings") -> bool:
     if not cfg.enabled:
         return False
 
@@ -33,11 +157,103 @@ def get_email_config(db: OrmSession) -> EmailConfig:
     if not cfg:
         cfg = EmailConfig(id=1)
         db.add(cfg)
-        db.commit()
-        db.refresh(cfg)
+        db.flush()
     return cfg
 
 
+@dataclass(frozen=True)
+class EmailSettings:
+    """Immutable copy of the EmailConfig row with its secrets already decrypted."""
+    enabled: bool
+    provider: str
+    mode: str
+    smtp_host: str | None
+    smtp_port: int | None
+    smtp_user: str | None
+    smtp_pass_enc: str | None
+    api_key_enc: str | None
+    sender_email: str | None
+    sender_name: str | None
+    updated_at: datetime
+    smtp_pass: str | None  # None = could not decrypt
+    api_key: str | None
+
+
+def _decrypt_or_none(value: str | None) -> str | None:
+    try:
+        return decrypt_text(value or "", settings.EMAIL_CRED_SECRET)
+    except Exception:
+        return None
+
+
+def _snapshot(cfg: EmailConfig) -> EmailSettings:
+    return EmailSettings(
+        enabled=cfg.enabled,
+        provider=cfg.provider,
+        mode=cfg.mode,
+        smtp_host=cfg.smtp_host,
+        smtp_port=cfg.smtp_port,
+        smtp_user=cfg.smtp_user,
+        smtp_pass_enc=cfg.smtp_pass_enc,
+        api_key_enc=cfg.api_key_enc,
+        sender_email=cfg.sender_email,
+        sender_name=cfg.sender_name,
+        updated_at=cfg.updated_at,
+        smtp_pass=_decrypt_or_none(cfg.smtp_pass_enc),
+        api_key=_decrypt_or_none(cfg.api_key_enc),
+    )
+
+
+class EmailConfigCache:
+    """
+    Versioned EmailSettings cache keyed on email_config.updated_at.
+
+    Within EMAIL_CONFIG_CACHE_SECONDS the snapshot is served with no DB work at
+    all (this is also the fast path when email is disabled). After that only
+    updated_at is re-read; the row is reloaded and decrypted only if it moved.
+    update_email_config invalidates it in this process right away.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl = ttl_seconds
+        self._snap: EmailSettings | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: OrmSession) -> EmailSettings:
+        with self._lock:
+            snap = self._snap
+            if snap is not None and time.monotonic() - self._checked_at < self.ttl:
+                return snap
+
+        if snap is not None:
+            version = db.execute(select(EmailConfig.updated_at).where(EmailConfig.id == 1)).scalar()
+            if version == snap.updated_at:
+                with self._lock:
+                    self._checked_at = time.monotonic()
+                return snap
+
+        snap = _snapshot(get_email_config(db))
+        with self._lock:
+            self._snap = snap
+            self._checked_at = time.monotonic()
+        return snap
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snap = None
+
+
+email_config_cache = EmailConfigCache(settings.EMAIL_CONFIG_CACHE_SECONDS)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _reset_after_commit(session):
+    if session.info.pop("email_config_changed", False):
+        email_config_cache.invalidate()
+        mail_transport.reset()
+
+
 def update_email_config(db: OrmSession, payload: dict) -> EmailConfig:
     cfg = get_email_config(db)
 
@@ -59,14 +275,19 @@ def update_email_config(db: OrmSession, payload: dict) -> EmailConfig:
     if api_key:
         cfg.api_key_enc = encrypt_text(api_key, settings.EMAIL_CRED_SECRET)
 
+    cfg.updated_at = datetime.now(timezone.utc)
+
     db.add(cfg)
-    db.commit()
-    db.refresh(cfg)
+    db.flush()
+    # Cache and warm connections are dropped once this commits (see _reset_after_commit)
+    db.info["email_config_changed"] = True
     return cfg
 
 
-def send_email_smtp(cfg: EmailConfig, to_email: str, subject: str, body: str) -> None:
-    smtp_pass = decrypt_text(cfg.smtp_pass_enc or "", settings.EMAIL_CRED_SECRET)
+def send_email_smtp(cfg: EmailSettings, to_email: str, subject: str, body: str) -> None:
+    smtp_pass = cfg.smtp_pass
+    if smtp_pass is None:
+        raise ValueError("Could not decrypt SMTP password")
 
     msg = EmailMessage()
     msg["From"] = f"{cfg.sender_name} <{cfg.sender_email}>"
@@ -74,22 +295,16 @@ def send_email_smtp(cfg: EmailConfig, to_email: str, subject: str, body: str) ->
     msg["Subject"] = subject
     msg.set_content(body)
 
-    # TLS (587) typical for free-tier SMTP
-    with smtplib.SMTP(cfg.smtp_host, int(cfg.smtp_port), timeout=10) as server:
-        server.ehlo()
-        server.starttls()
-        server.ehlo()
-        server.login(cfg.smtp_user, smtp_pass)
-        server.send_message(msg)
+    mail_transport.send_smtp(cfg, smtp_pass, msg)
 
-def send_email_brevo(cfg: EmailConfig, to_email: str, subject: str, body: str) -> None:
-    api_key = decrypt_text(cfg.api_key_enc or "", settings.EMAIL_CRED_SECRET)
+def send_email_brevo(cfg: EmailSettings, to_email: str, subject: str, body: str) -> None:
+    api_key = cfg.api_key
 
     if not api_key or not api_key.startswith("xkeysib-"):
         raise ValueError("Invalid Brevo API key")
 
-    r = requests.post(
-        "https://api.brevo.com/v3/smtp/email",
+    r = mail_transport.http.post(
+        BREVO_URL,
         headers={
             "api-key": api_key,
             "Content-Type": "application/json",
@@ -106,39 +321,41 @@ def send_email_brevo(cfg: EmailConfig, to_email: str, subject: str, body: str) -
 
     r.raise_for_status()
 
+def deliver(cfg: EmailSettings, to_email: str, subject: str, body: str) -> bool:
+    """Send through the configured provider. Returns False if the mode is unsupported; raises on failure."""
+    if cfg.mode == "api" and cfg.provider == "brevo":
+        send_email_brevo(cfg, to_email, subject, body)
+    elif cfg.mode == "smtp":
+        send_email_smtp(cfg, to_email, subject, body)
+    else:
+        return False
+    return True
+
+
 def try_send(db: OrmSession, to_email: str, subject: str, body: str) -> tuple[bool, str]:
-    cfg = get_email_config(db)
+    cfg = email_config_cache.get(db)
 
     if not _is_valid(cfg):
         return True, "Email disabled or invalid config (skipped)."
 
     try:
-        if cfg.mode == "api" and cfg.provider == "brevo":
-            send_email_brevo(cfg, to_email, subject, body)
-        elif cfg.mode == "smtp":
-            send_email_smtp(cfg, to_email, subject, body)
-        else:
+        if not deliver(cfg, to_email, subject, body):
             return True, "Email skipped (unsupported mode)."
-
         return True, "Sent"
     except Exception as e:
         return False, f"Email send failed: {e}"
-    cfg = get_email_config(db)
-
-    if not cfg.enabled:
-        return True, "Email disabled (skipped)."
 
-    try:
-        if cfg.mode == "api" and cfg.provider == "brevo":
-            send_email_brevo(cfg, to_email, subject, body)
-        elif cfg.mode == "smtp":
-            send_email_smtp(cfg, to_email, subject, body)
-        else:
-            return True, "Email skipped (unsupported mode)."
 
-        return True, "Sent"
-    except Exception as e:
-        return False, f"Email send failed: {e}"
+def enqueue_email(db: OrmSession, to_email: str, subject: str, body: str) -> None:
+    """
+    Queue a message in email_outbox as part of the caller's transaction.
+    Nothing is sent until the caller commits; the outbox workers deliver it.
+    """
+    cfg = email_config_cache.get(db)
+    if not _is_valid(cfg):
+        return  # email disabled: same as the old inline skip
+    db.add(EmailOutbox(to_email=to_email, subject=subject, body=body))
+    db.info["email_outbox_dirty"] = True
 
 # def try_send(db: OrmSession, to_email: str, subject: str, body: str) -> tuple[bool, str]:
 #     cfg = get_email_config(db)
@@ -187,7 +404,7 @@ Applied on:
 {applied_at}
 """
 
-    try_send(
+    enqueue_email(
         db,
         to_email=admin.email,
         subject="New Leave Request",
@@ -207,4 +424,4 @@ def notify_employee_decision(db: OrmSession, employee: User, status: str, start:
     )
     if comment:
         body += f"\nAdmin comment: {comment}\n"
-    try_send(db, employee.email, subject, body)
\ No newline at end of file
+    enqueue_email(db, employee.email, subject, body)
\ No newline at end of file
@@ -0,0 +1,140 @@
+import csv
+import io
+import uuid
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.orm import Session as OrmSession
+
+from app.schemas import RegisterEmployeeIn
+
+MAX_IMPORT_ROWS = 50_000
+
+REQUIRED_COLUMNS = ("name", "dob", "employeeCode")
+# Accepted spellings of the CSV header, mapped to RegisterEmployeeIn fields
+COLUMN_ALIASES = {
+    "name": "name",
+    "dob": "dob",
+    "employeecode": "employeeCode",
+    "employee_code": "employeeCode",
+    "email": "email",
+}
+
+STAGING_DDL = text("""
+    CREATE TEMP TABLE employee_import (
+        line integer NOT NULL,
+        id uuid NOT NULL,
+        name text NOT NULL,
+        dob date NOT NULL,
+        email text,
+        employee_code text NOT NULL
+    ) ON COMMIT DROP
+""")
+
+# users_employee_code_unique is a partial unique index, hence the WHERE in the conflict target
+MERGE_SQL = text("""
+    INSERT INTO users (id, role, name, dob, email, employee_code, created_at)
+    SELECT id, 'employee', name, dob, email, employee_code, now()
+    FROM employee_import
+    ORDER BY line
+    ON CONFLICT (employee_code) WHERE employee_code IS NOT NULL DO NOTHING
+    RETURNING employee_code
+""")
+
+
+def _error_message(e: ValidationError) -> str:
+    err = e.errors()[0]
+    field = ".".join(str(x) for x in err["loc"])
+    return f"{field}: {err['msg']}" if field else err["msg"]
+
+
+def parse_employee_csv(data: bytes) -> tuple[list[tuple], list[dict]]:
+    """
+    One pass over the CSV: every row is validated against RegisterEmployeeIn and
+    normalized the way register_employee does it. Returns (rows, errors) where
+    rows are (line, id, name, dob, email, employee_code) tuples ready for COPY.
+    Raises ValueError if the file itself is unusable.
+    """
+    try:
+        content = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("CSV must be UTF-8")
+
+    reader = csv.reader(io.StringIO(content))
+    header = next(reader, None)
+    if not header:
+        raise ValueError("CSV is empty")
+    columns = [COLUMN_ALIASES.get(h.strip().lower()) for h in header]
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+
+    rows: list[tuple] = []
+    errors: list[dict] = []
+    seen_codes: dict[str, int] = {}
+    for line, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        if len(rows) + len(errors) >= MAX_IMPORT_ROWS:
+            raise ValueError(f"At most {MAX_IMPORT_ROWS} rows per import")
+
+        record = {c: v for c, v in zip(columns, values) if c}
+        code = (record.get("employeeCode") or "").strip()
+        if record.get("email") is not None and not record["email"].strip():
+            record["email"] = None
+        try:
+            p = RegisterEmployeeIn.model_validate(record)
+        except ValidationError as e:
+            errors.append({"line": line, "employeeCode": code or None, "error": _error_message(e)})
+            continue
+
+        name = p.name.strip()
+        code = p.employeeCode.strip()
+        if not name or not code:
+            errors.append({"line": line, "employeeCode": code or None, "error": "name and employeeCode must not be blank"})
+            continue
+        if code in seen_codes:
+            errors.append({"line": line, "employeeCode": code, "error": f"Duplicate employeeCode (line {seen_codes[code]})"})
+            continue
+        seen_codes[code] = line
+        rows.append((line, uuid.uuid4(), name, p.dob, p.email.strip() if p.email else None, code))
+
+    return rows, errors
+
+
+def load_employees(db: OrmSession, rows: list[tuple]) -> set[str]:
+    """
+    COPY the rows into a temp staging table and merge them into users in one
+    statement; existing employee codes are left alone. Returns the codes that
+    were inserted. Runs in the caller's transaction (the staging table drops on commit).
+    """
+    if not rows:
+        return set()
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(row)
+    buf.seek(0)
+
+    db.execute(STAGING_DDL)
+    # Same DBAPI connection (and transaction) as the session
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            "COPY employee_import (line, id, name, dob, email, employee_code) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+    return set(db.execute(MERGE_SQL).scalars())
+
+
+def import_employees(db: OrmSession, data: bytes) -> dict:
+    rows, errors = parse_employee_csv(data)
+    inserted = load_employees(db, rows)
+    for line, _, _, _, _, code in rows:
+        if code not in inserted:
+            errors.append({"line": line, "employeeCode": code, "error": "Employee ID already exists"})
+    errors.sort(key=lambda e: e["line"])
+    return {"inserted": len(inserted), "errors": errors}
@@ -0,0 +1,66 @@
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+
+from app.models import LeaveRequest, User
+from app.services.static_assets import accepted_encodings
+
+# Browsers keep the body but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def leave_version_stmt(*preds):
+    """count + max(updated_at) over exactly the rows a leave listing would page through."""
+    return select(func.count(), func.max(LeaveRequest.updated_at)).where(*preds)
+
+
+def employee_version_stmt():
+    return select(func.count(), func.max(User.updated_at)).where(User.role == "employee")
+
+
+def make_etag(scope: str, version, request: Request) -> str:
+    """
+    Strong validator for one listing: what it lists (scope), the version of that
+    set (a deleted or re-filtered row moves the count, any insert or update
+    moves max(updated_at)) and the query string (filters, limit). Only first
+    pages get one; see _leave_listing.
+    """
+    count, last = version
+    raw = f"{scope}|{count}|{last.isoformat() if last else ''}|{request.url.query}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def matching_etag(request: Request, etag: str) -> str | None:
+    """
+    The If-None-Match entry that matches `etag`, or None. JsonCompressionMiddleware
+    gives compressed bodies their own tag ("<etag>-gzip"); those match only while
+    the request still accepts that encoding, or the 304 would confirm a body the
+    client can no longer decode.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    stem = etag[:-1] + "-"
+    accepted = None
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]  # If-None-Match uses the weak comparison
+        if tag in ("*", etag):
+            return etag
+        if tag.startswith(stem) and tag.endswith('"'):
+            if accepted is None:
+                accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+            if tag[len(stem):-1] in accepted:
+                return tag
+    return None
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(tag: str) -> Response:
+    # Which tag matched depends on Accept-Encoding, like the 200 it stands for
+    return Response(status_code=304, headers={**cache_headers(tag), "Vary": "Accept-Encoding"})
@@ -0,0 +1,88 @@
+import gzip
+
+from app.services.static_assets import accepted_encodings, brotli
+
+
+class JsonCompressionMiddleware:
+    """
+    Pure ASGI middleware compressing JSON API responses of at least `min_size`
+    bytes (brotli if installed and accepted, else gzip).
+
+    Unlike Starlette's GZipMiddleware it only touches single-body
+    application/json responses: streamed bodies (exports, server-sent events)
+    and anything already encoded pass through unchanged.
+    """
+
+    def __init__(self, app, min_size: int = 1024, gzip_level: int = 5, brotli_quality: int = 4):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.min_size <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for k, v in scope["headers"]:
+            if k == b"accept-encoding":
+                accept = v.decode("latin-1")
+                break
+        accepted = accepted_encodings(accept)
+        encoding = "br" if brotli is not None and "br" in accepted else "gzip" if "gzip" in accepted else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                if not headers.get(b"content-type", b"").startswith(b"application/json") or b"content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # held until we know whether the body comes in one piece
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.min_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if encoding == "br":
+                body = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                body = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+            headers = []
+            for k, v in start.get("headers", []):
+                name = k.lower()
+                if name == b"content-length":
+                    continue
+                if name == b"etag" and v.startswith(b'"'):
+                    # Strong validators are per representation (see etags.matching_etag)
+                    v = v[:-1] + b"-" + encoding.encode() + b'"'
+                headers.append((k, v))
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
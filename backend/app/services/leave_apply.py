@@ -0,0 +1,91 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as OrmSession
+
+from app.models import LeaveRequest, User
+from app.schemas import LeaveApplyIn
+from app.services.email_service import notify_admin_new_leave
+from app.services.leave_calc import calc_total_days
+from app.services.leave_events import queue_leave_event
+from app.services.leave_queries import overlaps
+from app.services.leave_stats import record_leave_stats
+from app.services.work_calendar import leave_calendar
+
+# Postgres SQLSTATE raised by an EXCLUDE constraint
+EXCLUSION_VIOLATION = "23P01"
+
+
+class LeaveConflictError(Exception):
+    pass
+
+
+def submit_leave(db: OrmSession, employee, payload: LeaveApplyIn) -> LeaveRequest:
+    """
+    Create a pending leave request and queue the admin notification in the
+    caller's transaction (get_db / get_async_db commit it).
+    Plain sync code so the async endpoint can reuse it through AsyncSession.run_sync.
+
+    Raises ValueError for an invalid date range and LeaveConflictError on overlap.
+    """
+    total, excluded_str = calc_total_days(
+        payload.startDate,
+        payload.endDate,
+        payload.excludedDates,
+        calendar=leave_calendar(db),
+    )
+
+    # Overlap check: indexed probe on leave_no_overlap_excl, first conflict only
+    conflict = db.execute(
+        select(LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.status)
+        .where(
+            LeaveRequest.employee_user_id == employee.id,
+            overlaps(payload.startDate, payload.endDate),
+        )
+        .limit(1)
+    ).first()
+    if conflict:
+        raise LeaveConflictError(
+            f"Leave already exists from {conflict.start_date} to {conflict.end_date} ({conflict.status})"
+        )
+
+    lr = LeaveRequest(
+        employee_user_id=employee.id,
+        start_date=payload.startDate,
+        end_date=payload.endDate,
+        excluded_dates=excluded_str,
+        total_days=total,
+        reason=payload.reason.strip(),
+        status="pending",
+    )
+    db.add(lr)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        # A concurrent submission won the race; the exclusion constraint caught it
+        db.rollback()
+        if getattr(e.orig, "pgcode", None) == EXCLUSION_VIOLATION:
+            raise LeaveConflictError("Leave overlaps an existing request")
+        raise
+
+    record_leave_stats(db, [(lr, None)])
+
+    # Read-side caches (team calendar, ...) are invalidated and the admin feed notified once this commits
+    db.info["leaves_changed"] = True
+    queue_leave_event(db, "created", lr)
+
+    # Queued in the same transaction; delivered by the outbox workers after commit
+    admin = db.query(User).filter(User.role == "admin").first()
+    if admin and admin.email:
+        notify_admin_new_leave(
+            db,
+            admin=admin,
+            employee=employee,
+            start=lr.start_date.isoformat(),
+            end=lr.end_date.isoformat(),
+            total_days=lr.total_days,
+            excluded_dates=lr.excluded_dates,
+            reason=lr.reason,
+            applied_at=lr.created_at.isoformat(),
+        )
+
+    return lr
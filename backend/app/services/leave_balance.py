@@ -0,0 +1,176 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import settings
+from app.models import LeaveBalance, User
+from app.services.leave_calc import calc_total_days
+from app.services.work_calendar import leave_calendar
+
+# The app has a single kind of leave; the column leaves room for more
+DEFAULT_LEAVE_TYPE = "general"
+
+# Whole-table recompute from approved requests. A request within one year counts
+# its stored total_days; one spanning New Year is split by calendar year, counting
+# the days of each part that are not excluded (and, with :working_days, not a
+# weekend day or holiday) -- the same rule as days_by_year.
+REBUILD_SQL = text("""
+    INSERT INTO leave_balances (employee_user_id, year, leave_type, days_used, approved_count, updated_at)
+    SELECT
+        lr.employee_user_id,
+        y.year,
+        :leave_type,
+        sum(CASE
+            WHEN extract(year FROM lr.start_date) = extract(year FROM lr.end_date) THEN lr.total_days
+            ELSE (
+                SELECT count(*)
+                FROM generate_series(
+                    greatest(lr.start_date, make_date(y.year, 1, 1)),
+                    least(lr.end_date, make_date(y.year, 12, 31)),
+                    interval '1 day'
+                ) AS g(d)
+                WHERE NOT lr.excluded_dates ? to_char(g.d, 'YYYY-MM-DD')
+                  AND (NOT :working_days OR (
+                      extract(isodow FROM g.d)::int - 1 <> ALL(:weekend_days)
+                      AND NOT EXISTS (SELECT 1 FROM holidays h WHERE h.day = g.d::date)
+                  ))
+            )
+        END),
+        count(*),
+        now()
+    FROM leave_requests lr
+    CROSS JOIN LATERAL generate_series(
+        extract(year FROM lr.start_date)::int, extract(year FROM lr.end_date)::int
+    ) AS y(year)
+    WHERE lr.status = 'approved'
+    GROUP BY lr.employee_user_id, y.year
+""")
+
+
+def current_year() -> int:
+    return datetime.now(ZoneInfo(settings.APP_TIMEZONE)).year
+
+
+def days_by_year(lr, calendar=None) -> dict[int, int]:
+    """
+    A leave's days per calendar year. Within one year that is its stored
+    total_days; across New Year each part is counted like calc_total_days.
+    """
+    if lr.start_date.year == lr.end_date.year:
+        return {lr.start_date.year: lr.total_days}
+    excluded = [date.fromisoformat(d) for d in lr.excluded_dates or []]
+    out = {}
+    for y in range(lr.start_date.year, lr.end_date.year + 1):
+        lo = max(lr.start_date, date(y, 1, 1))
+        hi = min(lr.end_date, date(y, 12, 31))
+        out[y], _ = calc_total_days(lo, hi, excluded, calendar=calendar)
+    return out
+
+
+def record_approvals(db: OrmSession, leaves) -> None:
+    """
+    Add newly approved requests to their balances in the caller's transaction.
+    `leaves` needs employee_user_id, start_date, end_date, excluded_dates and
+    total_days (LeaveRequest objects or UPDATE ... RETURNING rows). One upsert for all of them.
+    """
+    deltas: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    calendar = None
+    for lr in leaves:
+        if calendar is None and lr.start_date.year != lr.end_date.year:
+            calendar = leave_calendar(db)
+        for year, days in days_by_year(lr, calendar).items():
+            d = deltas[(lr.employee_user_id, year)]
+            d[0] += days
+            d[1] += 1
+    if not deltas:
+        return
+
+    now = datetime.now(timezone.utc)
+    stmt = insert(LeaveBalance).values([
+        {
+            "employee_user_id": emp,
+            "year": year,
+            "leave_type": DEFAULT_LEAVE_TYPE,
+            "days_used": days,
+            "approved_count": count,
+            "updated_at": now,
+        }
+        for (emp, year), (days, count) in deltas.items()
+    ])
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[LeaveBalance.employee_user_id, LeaveBalance.year, LeaveBalance.leave_type],
+            set_={
+                "days_used": LeaveBalance.days_used + stmt.excluded.days_used,
+                "approved_count": LeaveBalance.approved_count + stmt.excluded.approved_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def employee_balance(db: OrmSession, employee_id, year: int) -> dict:
+    row = db.execute(
+        select(LeaveBalance.days_used, LeaveBalance.approved_count).where(
+            LeaveBalance.employee_user_id == employee_id,
+            LeaveBalance.year == year,
+            LeaveBalance.leave_type == DEFAULT_LEAVE_TYPE,
+        )
+    ).first()
+    return {
+        "year": year,
+        "leaveType": DEFAULT_LEAVE_TYPE,
+        "daysUsed": row.days_used if row else 0,
+        "approvedCount": row.approved_count if row else 0,
+    }
+
+
+def balance_rollup(db: OrmSession, year: int) -> list[dict]:
+    """Every employee with their balance for `year` (zero when nothing was approved)."""
+    rows = db.execute(
+        select(
+            User.id,
+            User.name,
+            User.employee_code,
+            func.coalesce(LeaveBalance.days_used, 0).label("days_used"),
+            func.coalesce(LeaveBalance.approved_count, 0).label("approved_count"),
+        )
+        .outerjoin(
+            LeaveBalance,
+            (LeaveBalance.employee_user_id == User.id)
+            & (LeaveBalance.year == year)
+            & (LeaveBalance.leave_type == DEFAULT_LEAVE_TYPE),
+        )
+        .where(User.role == "employee")
+        .order_by(User.name.asc())
+    ).all()
+    return [
+        {
+            "employeeId": str(r.id),
+            "name": r.name,
+            "employeeCode": r.employee_code,
+            "daysUsed": r.days_used,
+            "approvedCount": r.approved_count,
+        }
+        for r in rows
+    ]
+
+
+def rebuild_balances(db: OrmSession) -> int:
+    """
+    Recompute leave_balances from leave_requests in one set-based pass. Holds an
+    EXCLUSIVE lock on leave_balances so concurrent approvals wait instead of being lost.
+    Returns the number of balance rows written; the caller commits.
+    """
+    db.execute(text("LOCK TABLE leave_balances IN EXCLUSIVE MODE"))
+    db.execute(text("DELETE FROM leave_balances"))
+    params = {
+        "leave_type": DEFAULT_LEAVE_TYPE,
+        "working_days": settings.LEAVE_COUNT_WORKING_DAYS,
+        "weekend_days": list(settings.WEEKEND_DAYS),
+    }
+    return db.execute(REBUILD_SQL, params).rowcount
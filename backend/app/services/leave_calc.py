@@ -1,26 +1,28 @@
-from datetime import date, timedelta
+from datetime import date
 
 
-def calc_total_days(start: date, end: date, excluded: list[date] | None) -> tuple[int, list[str]]:
+def calc_total_days(start: date, end: date, excluded: list[date] | None, calendar=None) -> tuple[int, list[str]]:
+    """
+    Leave days in [start, end] minus the explicitly excluded dates.
+
+    Without a calendar every day counts. With a WorkCalendar only working days
+    count (weekends and holidays are skipped), and an excluded date only
+    subtracts if it is a working day. Either way this is O(k log k) in the
+    number of excluded dates, independent of the range length.
+    """
     if start > end:
         raise ValueError("start_date_after_end_date")
 
-    excluded = excluded or []
-    excluded_set = set(excluded)
-
     # Keep only excluded dates that are within the inclusive range
-    in_range = []
-    d = start
-    while d <= end:
-        if d in excluded_set:
-            in_range.append(d)
-        d += timedelta(days=1)
+    in_range = sorted({d for d in excluded or () if start <= d <= end})
 
-    days = (end - start).days + 1
-    total = days - len(in_range)
+    if calendar is None:
+        total = (end - start).days + 1 - len(in_range)
+    else:
+        total = calendar.working_days(start, end) - sum(1 for d in in_range if calendar.is_working_day(d))
     if total < 0:
         total = 0
 
     # Store as YYYY-MM-DD strings
-    excluded_str = [x.isoformat() for x in sorted(in_range)]
-    return total, excluded_str
\ No newline at end of file
+    excluded_str = [x.isoformat() for x in in_range]
+    return total, excluded_str
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+import select as selectors
+import threading
+from itertools import count
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "leave_events"
+# NOTIFY payloads must stay under 8000 bytes; events are sent in chunks of this many
+NOTIFY_CHUNK = 20
+
+
+def leave_event(kind: str, lr) -> dict:
+    """Small SSE payload for a created/decided leave (LeaveRequest or RETURNING row)."""
+    return {
+        "type": kind,
+        "id": str(lr.id),
+        "employeeId": str(lr.employee_user_id),
+        "status": lr.status,
+        "startDate": lr.start_date.isoformat(),
+        "endDate": lr.end_date.isoformat(),
+        "totalDays": lr.total_days,
+    }
+
+
+def queue_leave_event(db: OrmSession, kind: str, lr) -> None:
+    """Published once the caller's transaction commits; dropped if it rolls back."""
+    db.info.setdefault("leave_events", []).append(leave_event(kind, lr))
+
+
+class LeaveEventHub:
+    """
+    Fans leave events out to the SSE connections of this worker. publish() may be
+    called from any thread; each subscriber gets a bounded asyncio.Queue on its
+    own loop. A subscriber that falls behind has its backlog replaced by one
+    "resync" event (it should reload the list) instead of blocking everyone else.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._lock = threading.Lock()
+        self._ids = count(1)
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self) -> tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+        sub = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def _offer(self, queue: asyncio.Queue, item: tuple[int, dict]) -> None:
+        if queue.full():
+            # The client reloads on resync, so nothing still queued is worth keeping
+            while not queue.empty():
+                queue.get_nowait()
+                self.dropped += 1
+            item = (item[0], {"type": "resync"})
+        queue.put_nowait(item)
+
+    def publish(self, events: list[dict]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += len(events)
+        for ev in events:
+            item = (next(self._ids), ev)
+            for loop, queue in subscribers:
+                try:
+                    loop.call_soon_threadsafe(self._offer, queue, item)
+                except RuntimeError:  # loop closed under us
+                    self.unsubscribe((loop, queue))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self.published,
+                "dropped": self.dropped,
+                "backend": "notify" if settings.LEAVE_EVENTS_NOTIFY else "local",
+            }
+
+
+leave_event_hub = LeaveEventHub()
+
+
+@event.listens_for(OrmSession, "before_commit")
+def _notify_before_commit(session):
+    # NOTIFY is transactional: listeners on every worker see it only if this commits
+    if not settings.LEAVE_EVENTS_NOTIFY:
+        return
+    events = session.info.pop("leave_events", None)
+    for i in range(0, len(events or ()), NOTIFY_CHUNK):
+        payload = json.dumps(events[i:i + NOTIFY_CHUNK], separators=(",", ":"))
+        session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _publish_after_commit(session):
+    events = session.info.pop("leave_events", None)
+    if events:
+        leave_event_hub.publish(events)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("leave_events", None)
+
+
+class LeaveEventListener:
+    """
+    One LISTEN connection per worker (LEAVE_EVENTS_NOTIFY=true), feeding the hub.
+    Needs a session-mode connection: LISTEN does not survive a transaction
+    pooler, so point LEAVE_EVENTS_LISTEN_URL at the direct/session port if
+    DATABASE_URL goes through one.
+    """
+
+    def __init__(self, url: str | None, enabled: bool):
+        self.url = url
+        self.enabled = enabled
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if not self.enabled or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="leave-events-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _dsn(self) -> str:
+        url = make_url(self.url or settings.DATABASE_URL).set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    def _run(self) -> None:
+        import psycopg2
+
+        backoff = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self._dsn())
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL}")
+                backoff = 1.0
+                # Anything sent while we were disconnected is gone; tell clients to reload
+                leave_event_hub.publish([{"type": "resync"}])
+                while not self._stop.is_set():
+                    if selectors.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        n = conn.notifies.pop(0)
+                        leave_event_hub.publish(json.loads(n.payload))
+            except Exception:
+                log.exception("leave events listener failed; reconnecting in %.0fs", backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+leave_event_listener = LeaveEventListener(settings.LEAVE_EVENTS_LISTEN_URL, settings.LEAVE_EVENTS_NOTIFY)
@@ -0,0 +1,120 @@
+import csv
+import io
+from collections.abc import Iterable, Iterator
+
+import orjson
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models import LeaveRequest, User
+
+# Rows per round trip on the server-side cursor, and per chunk written to the client
+EXPORT_BATCH_ROWS = 2000
+
+EXPORT_FIELDS = (
+    "leaveId", "employeeName", "employeeCode", "startDate", "endDate", "excludedDates",
+    "totalDays", "status", "reason", "adminComment", "decidedAt", "createdAt",
+)
+
+
+def export_stmt(*preds):
+    return (
+        select(
+            LeaveRequest.id,
+            User.name,
+            User.employee_code,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.excluded_dates,
+            LeaveRequest.total_days,
+            LeaveRequest.status,
+            LeaveRequest.reason,
+            LeaveRequest.admin_comment,
+            LeaveRequest.decided_at,
+            LeaveRequest.created_at,
+        )
+        .join(User, User.id == LeaveRequest.employee_user_id)
+        .where(*preds)
+        .order_by(LeaveRequest.start_date, LeaveRequest.id)
+    )
+
+
+def _record(r) -> tuple:
+    return (
+        str(r.id),
+        r.name,
+        r.employee_code,
+        r.start_date.isoformat(),
+        r.end_date.isoformat(),
+        r.excluded_dates,
+        r.total_days,
+        r.status,
+        r.reason,
+        r.admin_comment,
+        r.decided_at.isoformat() if r.decided_at else None,
+        r.created_at.isoformat(),
+    )
+
+
+class CsvEncoder:
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self):
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+    def _take(self) -> bytes:
+        out = self._buf.getvalue().encode()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return out
+
+    def header(self) -> bytes:
+        self._writer.writerow(EXPORT_FIELDS)
+        return self._take()
+
+    def rows(self, rows: Iterable) -> bytes:
+        for r in rows:
+            rec = list(_record(r))
+            rec[5] = ";".join(rec[5] or ())
+            self._writer.writerow(rec)
+        return self._take()
+
+
+class NdjsonEncoder:
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def header(self) -> bytes:
+        return b""
+
+    def rows(self, rows: Iterable) -> bytes:
+        return b"".join(orjson.dumps(dict(zip(EXPORT_FIELDS, _record(r)))) + b"\n" for r in rows)
+
+
+ENCODERS = {"csv": CsvEncoder, "ndjson": NdjsonEncoder}
+
+
+def encode_batches(batches: Iterable[Iterable], fmt: str) -> Iterator[bytes]:
+    """Header first, then one chunk per batch of rows; nothing accumulates between batches."""
+    enc = ENCODERS[fmt]()
+    head = enc.header()
+    if head:
+        yield head
+    for batch in batches:
+        yield enc.rows(batch)
+
+
+def stream_export(stmt, fmt: str) -> Iterator[bytes]:
+    """
+    Body generator for StreamingResponse. It opens its own session because the
+    request's get_db session is closed before the body is sent; rows come off a
+    server-side cursor EXPORT_BATCH_ROWS at a time, so memory stays flat.
+    """
+    def batches():
+        with SessionLocal() as db:
+            result = db.execute(stmt, execution_options={"yield_per": EXPORT_BATCH_ROWS})
+            yield from result.partitions()
+
+    return encode_batches(batches(), fmt)
@@ -0,0 +1,115 @@
+import base64
+import binascii
+import re
+import uuid
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Text, column, func, literal, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+from app.config import settings
+from app.models import LeaveRequest
+from app.services.leave_serializer import LEAVE_OUT_COLUMNS
+
+_MONTH_RE = re.compile(r"(\d{4})-(\d{2})")
+
+# Largest `limit` any listing accepts, sync and async routes alike
+MAX_PAGE_SIZE = 500
+
+
+def leave_period():
+    # Must match the expression in leave_no_overlap_excl so the GiST index is used
+    return func.daterange(LeaveRequest.start_date, LeaveRequest.end_date, literal_column("'[]'"))
+
+
+def overlaps(start: date, end: date):
+    """Inclusive [start, end] overlap predicate on leave_requests."""
+    return leave_period().op("&&")(func.daterange(start, end, literal_column("'[]'")))
+
+
+def month_bounds(month: str) -> tuple[datetime, datetime]:
+    """
+    'YYYY-MM' -> half-open [start, end) of that month as aware datetimes in
+    APP_TIMEZONE, so they compare correctly against timestamptz columns.
+    Raises ValueError on anything else.
+    """
+    m = _MONTH_RE.fullmatch(month or "")
+    if not m:
+        raise ValueError("invalid_month")
+    y, mo = int(m.group(1)), int(m.group(2))
+    if not 1 <= mo <= 12:
+        raise ValueError("invalid_month")
+    tz = ZoneInfo(settings.APP_TIMEZONE)
+    start = datetime(y, mo, 1, tzinfo=tz)
+    end = datetime(y + 1, 1, 1, tzinfo=tz) if mo == 12 else datetime(y, mo + 1, 1, tzinfo=tz)
+    return start, end
+
+
+def leave_filters(month: str | None = None, date_from: date | None = None, date_to: date | None = None) -> list:
+    """
+    Shared listing filters: `month` bounds created_at (range scan on the
+    *_created_idx indexes); date_from/date_to select leaves whose [start, end]
+    touches that window (GiST on the leave period). Raises ValueError.
+    """
+    preds = []
+    if month:
+        start, end = month_bounds(month)
+        preds += [LeaveRequest.created_at >= start, LeaveRequest.created_at < end]
+    if date_from or date_to:
+        lo = date_from or date.min
+        hi = date_to or date.max
+        if lo > hi:
+            raise ValueError("invalid_date_range")
+        preds.append(overlaps(lo, hi))
+    return preds
+
+
+def leave_list_stmt(*preds):
+    """SELECT of just the LeaveOut columns; shared by the sync and async listing endpoints."""
+    return select(*LEAVE_OUT_COLUMNS).where(*preds)
+
+
+def decision_items(ids: list[uuid.UUID], comments: list[str | None]):
+    """
+    unnest(ids, comments) AS items(id, comment): per-row comments for one
+    UPDATE ... FROM over many leaves, each list sent as a single array parameter.
+    """
+    return func.unnest(
+        literal(ids, ARRAY(UUID(as_uuid=True))), literal(comments, ARRAY(Text))
+    ).table_valued(column("id", UUID(as_uuid=True)), column("comment", Text)).render_derived("items")
+
+
+def encode_cursor(created_at: datetime, leave_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{leave_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Raises ValueError on anything that is not a cursor we issued."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, leave_id = raw.split("|", 1)
+        return datetime.fromisoformat(ts), uuid.UUID(leave_id)
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("invalid_cursor") from e
+
+
+def paginate(q, cursor: str | None, limit: int):
+    """
+    Keyset page over (created_at, id) newest first. Fetches one extra row so
+    split_page() can tell whether there is a next page. Stable under concurrent
+    inserts: new rows sort before any cursor already handed out.
+    """
+    if cursor:
+        created_at, leave_id = decode_cursor(cursor)
+        q = q.filter(tuple_(LeaveRequest.created_at, LeaveRequest.id) < tuple_(created_at, leave_id))
+    return q.order_by(LeaveRequest.created_at.desc(), LeaveRequest.id.desc()).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int) -> tuple[list, str | None]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,47 @@
+import orjson
+from fastapi import Response
+
+from app.models import LeaveRequest
+
+# Just what LeaveOut needs (plus created_at/id for the keyset cursor)
+LEAVE_OUT_COLUMNS = (
+    LeaveRequest.id,
+    LeaveRequest.start_date,
+    LeaveRequest.end_date,
+    LeaveRequest.excluded_dates,
+    LeaveRequest.total_days,
+    LeaveRequest.reason,
+    LeaveRequest.status,
+    LeaveRequest.admin_comment,
+    LeaveRequest.created_at,
+)
+
+
+def leave_out(lr) -> dict:
+    """LeaveRequest (ORM object or LEAVE_OUT_COLUMNS row) -> LeaveOut-shaped dict."""
+    return {
+        "id": str(lr.id),
+        "startDate": lr.start_date,
+        "endDate": lr.end_date,
+        # Stored as YYYY-MM-DD strings already; no need to parse them back into dates
+        "excludedDates": lr.excluded_dates,
+        "totalDays": lr.total_days,
+        "reason": lr.reason,
+        "status": lr.status,
+        "adminComment": lr.admin_comment,
+        "createdAt": lr.created_at.isoformat(),
+    }
+
+
+class LeaveListResponse(Response):
+    """
+    Fast path for list[LeaveOut]: rows are trusted DB output, so skip FastAPI's
+    response_model re-validation and encode once with orjson.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, rows, next_cursor: str | None = None, **kwargs):
+        super().__init__(content=orjson.dumps([leave_out(r) for r in rows]), **kwargs)
+        if next_cursor:
+            self.headers["X-Next-Cursor"] = next_cursor
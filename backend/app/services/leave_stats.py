@@ -0,0 +1,232 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import settings
+from app.models import LeaveEmployeeMonthStats, LeaveMonthStats, User
+from app.services.leave_calc import calc_total_days
+from app.services.work_calendar import leave_calendar
+
+STATUSES = ("pending", "approved", "rejected")
+
+# Whole-table recompute of the per-employee rows from leave_requests. A request
+# counts once, in the month it starts; its days go to every month it touches. A
+# request within one month counts its stored total_days, one spanning months is
+# split like leave_balance.REBUILD_SQL splits by year -- the rule of days_by_month.
+REBUILD_EMPLOYEE_SQL = text("""
+    INSERT INTO leave_employee_month_stats (month, employee_user_id, status, requests, days, updated_at)
+    SELECT
+        m.month::date,
+        lr.employee_user_id,
+        lr.status,
+        count(*) FILTER (WHERE m.month = date_trunc('month', lr.start_date::timestamp)),
+        sum(CASE
+            WHEN date_trunc('month', lr.start_date::timestamp) = date_trunc('month', lr.end_date::timestamp) THEN lr.total_days
+            ELSE (
+                SELECT count(*)
+                FROM generate_series(
+                    greatest(lr.start_date, m.month::date),
+                    least(lr.end_date, (m.month + interval '1 month' - interval '1 day')::date),
+                    interval '1 day'
+                ) AS g(d)
+                WHERE NOT lr.excluded_dates ? to_char(g.d, 'YYYY-MM-DD')
+                  AND (NOT :working_days OR (
+                      extract(isodow FROM g.d)::int - 1 <> ALL(:weekend_days)
+                      AND NOT EXISTS (SELECT 1 FROM holidays h WHERE h.day = g.d::date)
+                  ))
+            )
+        END),
+        now()
+    FROM leave_requests lr
+    CROSS JOIN LATERAL generate_series(
+        date_trunc('month', lr.start_date::timestamp), date_trunc('month', lr.end_date::timestamp), interval '1 month'
+    ) AS m(month)
+    GROUP BY m.month, lr.employee_user_id, lr.status
+""")
+
+# The per-month rows are the per-employee rows summed over employees
+REBUILD_MONTH_SQL = text("""
+    INSERT INTO leave_month_stats (month, status, requests, days, updated_at)
+    SELECT month, status, sum(requests), sum(days), now()
+    FROM leave_employee_month_stats
+    GROUP BY month, status
+""")
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def _month_end(d: date) -> date:
+    nxt = date(d.year + d.month // 12, d.month % 12 + 1, 1)
+    return nxt - timedelta(days=1)
+
+
+def days_by_month(lr, calendar=None) -> dict[date, int]:
+    """
+    A leave's days per calendar month (keyed by the first of the month). Within
+    one month that is its stored total_days; otherwise each part is counted
+    like calc_total_days.
+    """
+    first = month_start(lr.start_date)
+    if first == month_start(lr.end_date):
+        return {first: lr.total_days}
+    excluded = [date.fromisoformat(d) for d in lr.excluded_dates or []]
+    out = {}
+    m = first
+    while m <= lr.end_date:
+        hi = _month_end(m)
+        out[m], _ = calc_total_days(max(lr.start_date, m), min(lr.end_date, hi), excluded, calendar=calendar)
+        m = hi + timedelta(days=1)
+    return out
+
+
+def record_leave_stats(db: OrmSession, changes) -> None:
+    """
+    Apply status changes to the summary tables in the caller's transaction.
+    `changes` are (leave, previous_status) pairs, previous_status None for a new
+    request; a leave needs employee_user_id, status, start_date, end_date,
+    excluded_dates and total_days (LeaveRequest objects or RETURNING rows).
+    One upsert per table for all of them.
+    """
+    deltas: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])  # (month, employee, status) -> [requests, days]
+    calendar = None
+    for lr, previous in changes:
+        if calendar is None and month_start(lr.start_date) != month_start(lr.end_date):
+            calendar = leave_calendar(db)
+        first = month_start(lr.start_date)
+        for month, days in days_by_month(lr, calendar).items():
+            counted = 1 if month == first else 0
+            d = deltas[(month, lr.employee_user_id, lr.status)]
+            d[0] += counted
+            d[1] += days
+            if previous is not None:
+                d = deltas[(month, lr.employee_user_id, previous)]
+                d[0] -= counted
+                d[1] -= days
+    deltas = {k: v for k, v in deltas.items() if v != [0, 0]}
+    if not deltas:
+        return
+
+    totals: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    for (month, _, status), (requests, days) in deltas.items():
+        t = totals[(month, status)]
+        t[0] += requests
+        t[1] += days
+
+    now = datetime.now(timezone.utc)
+    _add(db, LeaveEmployeeMonthStats, [
+        {"month": m, "employee_user_id": emp, "status": s, "requests": r, "days": d, "updated_at": now}
+        for (m, emp, s), (r, d) in deltas.items()
+    ])
+    _add(db, LeaveMonthStats, [
+        {"month": m, "status": s, "requests": r, "days": d, "updated_at": now}
+        for (m, s), (r, d) in totals.items()
+    ])
+
+
+def _add(db: OrmSession, model, rows: list[dict]) -> None:
+    stmt = insert(model).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=list(model.__table__.primary_key.columns),
+            set_={
+                "requests": model.requests + stmt.excluded.requests,
+                "days": model.days + stmt.excluded.days,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def _totals(requests=0, days=0) -> dict:
+    return {"requests": int(requests or 0), "days": int(days or 0)}
+
+
+def admin_stats(db: OrmSession, year: int, top: int = 10) -> dict:
+    """
+    Dashboard figures for `year` from the summary tables: per-month totals by
+    status, the current month, everything still pending and the employees with
+    the most approved days. Cost grows with months (and employees for the top
+    list), not with leave rows.
+    """
+    today = datetime.now(ZoneInfo(settings.APP_TIMEZONE)).date()
+    this_month = month_start(today)
+    lo, hi = date(year, 1, 1), date(year, 12, 1)
+
+    by_month = {date(year, m, 1): {s: _totals() for s in STATUSES} for m in range(1, 13)}
+    by_month.setdefault(this_month, {s: _totals() for s in STATUSES})
+    rows = db.execute(
+        select(LeaveMonthStats.month, LeaveMonthStats.status, LeaveMonthStats.requests, LeaveMonthStats.days)
+        .where(or_(LeaveMonthStats.month.between(lo, hi), LeaveMonthStats.month == this_month))
+    ).all()
+    for r in rows:
+        if r.status in STATUSES:
+            by_month[r.month][r.status] = _totals(r.requests, r.days)
+
+    pending = db.execute(
+        select(func.sum(LeaveMonthStats.requests), func.sum(LeaveMonthStats.days))
+        .where(LeaveMonthStats.status == "pending")
+    ).one()
+
+    approved_days = func.sum(LeaveEmployeeMonthStats.days).label("approved_days")
+    ranked = (
+        select(
+            LeaveEmployeeMonthStats.employee_user_id,
+            approved_days,
+            func.sum(LeaveEmployeeMonthStats.requests).label("approved_requests"),
+        )
+        .where(LeaveEmployeeMonthStats.status == "approved", LeaveEmployeeMonthStats.month.between(lo, hi))
+        .group_by(LeaveEmployeeMonthStats.employee_user_id)
+        .having(approved_days > 0)
+        .order_by(approved_days.desc())
+        .limit(top)
+        .subquery()
+    )
+    absentees = db.execute(
+        select(User.id, User.name, User.employee_code, ranked.c.approved_days, ranked.c.approved_requests)
+        .join(ranked, ranked.c.employee_user_id == User.id)
+        .order_by(ranked.c.approved_days.desc(), User.name.asc())
+    ).all()
+
+    def month_out(m: date) -> dict:
+        return {"month": m.strftime("%Y-%m"), **by_month[m]}
+
+    return {
+        "year": year,
+        "pending": _totals(*pending),
+        "currentMonth": month_out(this_month),
+        "months": [month_out(date(year, m, 1)) for m in range(1, 13)],
+        "topAbsentees": [
+            {
+                "employeeId": str(r.id),
+                "name": r.name,
+                "employeeCode": r.employee_code,
+                "approvedDays": int(r.approved_days),
+                "approvedRequests": int(r.approved_requests),
+            }
+            for r in absentees
+        ],
+    }
+
+
+def rebuild_leave_stats(db: OrmSession) -> tuple[int, int]:
+    """
+    Recompute both summary tables from leave_requests (drift repair). Locks them
+    like rebuild_balances so concurrent deltas wait for the new rows. Returns
+    (month rows, employee-month rows); the caller commits.
+    """
+    db.execute(text("LOCK TABLE leave_month_stats, leave_employee_month_stats IN EXCLUSIVE MODE"))
+    db.execute(text("DELETE FROM leave_employee_month_stats"))
+    db.execute(text("DELETE FROM leave_month_stats"))
+    params = {
+        "working_days": settings.LEAVE_COUNT_WORKING_DAYS,
+        "weekend_days": list(settings.WEEKEND_DAYS),
+    }
+    employee_rows = db.execute(REBUILD_EMPLOYEE_SQL, params).rowcount
+    month_rows = db.execute(REBUILD_MONTH_SQL).rowcount
+    return month_rows, employee_rows
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+
+
+class PoolMetrics:
+    """Checkout wait time, in-use connections and overflow/timeout events for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.in_use = 0
+            self.in_use_peak = 0
+            self.overflow_events = 0
+            self.timeouts = 0
+            self.connects = 0
+
+    def observe_checkout(self, wait: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            if overflowed:
+                self.overflow_events += 1
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def _on_checkout(self, *args) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def _on_checkin(self, *args) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def _on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def stats(self, pool=None) -> dict:
+        with self._lock:
+            out = {
+                "name": self.name,
+                "checkouts": self.checkouts,
+                "waitAvgMs": (self.wait_total / self.checkouts * 1e3) if self.checkouts else 0.0,
+                "waitMaxMs": self.wait_max * 1e3,
+                "inUse": self.in_use,
+                "inUsePeak": self.in_use_peak,
+                "overflowEvents": self.overflow_events,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+            }
+        if pool is not None:
+            out["pool"] = pool.status()
+        return out
+
+
+def timed_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Subclass of a SQLAlchemy Pool class that times every checkout (queue wait + connect)."""
+
+    def connect(self):
+        overflow_before = self.overflow() if hasattr(self, "overflow") else 0
+        t0 = time.perf_counter()
+        try:
+            conn = base.connect(self)
+        except sa_exc.TimeoutError:
+            metrics.observe_timeout()
+            raise
+        overflowed = hasattr(self, "overflow") and self.overflow() > max(0, overflow_before)
+        metrics.observe_checkout(time.perf_counter() - t0, overflowed)
+        return conn
+
+    return type(f"Timed{base.__name__}", (base,), {"connect": connect})
+
+
+def track_pool(engine, metrics: PoolMetrics) -> None:
+    """In-use / connect counters via pool events (pass async_engine.sync_engine for async engines)."""
+    event.listen(engine, "checkout", metrics._on_checkout)
+    event.listen(engine, "checkin", metrics._on_checkin)
+    event.listen(engine, "connect", metrics._on_connect)
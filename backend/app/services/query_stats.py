@@ -0,0 +1,170 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services.request_metrics import request_metrics
+
+log = logging.getLogger(__name__)
+
+MAX_SQL_CHARS = 500
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    commits: int = 0
+    db_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_sql: str | None = None
+
+
+# Set per request by QueryStatsMiddleware. The object is shared (not copied) into
+# the threadpool that runs sync handlers, so counts made there are visible here.
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def track_queries():
+    """
+    Count statements and commits issued inside the block, e.g. to assert a budget:
+
+        with track_queries() as stats:
+            await client.get("/api/leaves/my")  # httpx.ASGITransport, same context
+        assert stats.queries <= 2 and stats.commits <= 1
+    """
+    parent = _current.get()
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        # Nested blocks (a test around a request the middleware also tracks) add up
+        if parent is not None:
+            parent.queries += stats.queries
+            parent.commits += stats.commits
+            parent.db_ms += stats.db_ms
+            if stats.slowest_ms > parent.slowest_ms:
+                parent.slowest_ms = stats.slowest_ms
+                parent.slowest_sql = stats.slowest_sql
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _time_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    stats = _current.get()
+    if not started or stats is None:
+        return
+    ms = (time.perf_counter() - started.pop()) * 1e3
+    stats.db_ms += ms
+    if ms > stats.slowest_ms:
+        stats.slowest_ms = ms
+        stats.slowest_sql = statement[:MAX_SQL_CHARS]
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_failed_query(ctx):
+    # after_cursor_execute does not fire for a failed statement
+    if ctx.connection is not None and ctx.connection.info.get("query_started"):
+        ctx.connection.info["query_started"].pop()
+
+
+@event.listens_for(Engine, "commit")
+def _count_commit(conn):
+    stats = _current.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope['method']} {path}"
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware: per-request QueryStats.
+
+    With emit_headers every response gets X-DB-Queries / X-DB-Commits and a Server-Timing
+    header (db time, query count, handler time). A sample_rate fraction of requests is also
+    logged as one JSON line and folded into the per-route histograms in request_metrics.
+    Requests that are neither need headers nor sampled skip tracking entirely.
+    """
+
+    def __init__(self, app, emit_headers: bool = False, sample_rate: float = 1.0, slow_query_ms: float = 200.0):
+        self.app = app
+        self.emit_headers = emit_headers
+        self.sample_rate = sample_rate
+        self.slow_query_ms = slow_query_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (sampled or self.emit_headers):
+            await self.app(scope, receive, send)
+            return
+
+        t0 = time.perf_counter()
+        status = 500
+        handler_ms = 0.0
+
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                nonlocal status, handler_ms
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    handler_ms = (time.perf_counter() - t0) * 1e3
+                    if self.emit_headers:
+                        timing = f"db;dur={stats.db_ms:.1f};desc=\"{stats.queries} queries\", app;dur={handler_ms:.1f}"
+                        headers = list(message.get("headers", []))
+                        headers.append((b"x-db-queries", str(stats.queries).encode()))
+                        headers.append((b"x-db-commits", str(stats.commits).encode()))
+                        headers.append((b"server-timing", timing.encode()))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                if sampled:
+                    self._record(scope, status, handler_ms or (time.perf_counter() - t0) * 1e3, stats)
+
+    def _record(self, scope, status: int, handler_ms: float, stats: QueryStats) -> None:
+        route = _route_name(scope)
+        request_metrics.observe(route, status, handler_ms, stats)
+        slow = stats.slowest_ms >= self.slow_query_ms
+        record = {
+            "route": route,
+            "status": status,
+            "handlerMs": round(handler_ms, 2),
+            "dbMs": round(stats.db_ms, 2),
+            "queries": stats.queries,
+            "commits": stats.commits,
+            "slowestQueryMs": round(stats.slowest_ms, 2),
+        }
+        if slow:
+            record["slowestQuery"] = stats.slowest_sql
+        log.log(logging.WARNING if slow else logging.INFO, json.dumps(record))
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from app.config import settings
+
+
+class MemoryBucketStore:
+    """Process-local token buckets (single worker / stand-in for a shared store)."""
+
+    MAX_KEYS = 100_000
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                wait = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (1 - tokens) / rate
+            if len(self._buckets) > self.MAX_KEYS:
+                self._prune(now, rate, burst)
+            return wait
+
+    def _prune(self, now: float, rate: float, burst: int) -> None:
+        # Buckets that have refilled completely carry no state worth keeping
+        full_after = burst / rate
+        for k in [k for k, (_, t) in self._buckets.items() if now - t >= full_after]:
+            del self._buckets[k]
+
+
+class RedisBucketStore:
+    """Shared buckets so the limit holds across uvicorn workers."""
+
+    # KEYS[1] bucket; ARGV rate, burst, now. Returns the wait in ms (0 = allowed).
+    SCRIPT = """
+    local b = redis.call('HMGET', KEYS[1], 't', 'u')
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens = tonumber(b[1]) or burst
+    local updated = tonumber(b[2]) or now
+    tokens = math.min(burst, tokens + (now - updated) * rate)
+    local wait = 0
+    if tokens >= 1 then tokens = tokens - 1 else wait = math.ceil((1 - tokens) / rate * 1000) end
+    redis.call('HSET', KEYS[1], 't', tokens, 'u', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return wait
+    """
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed when RATE_LIMIT_URL is redis://
+
+        self._r = redis.Redis.from_url(url)
+        self._take = self._r.register_script(self.SCRIPT)
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        return self._take(keys=[key], args=[rate, burst, time.time()]) / 1000
+
+
+class TokenBucketLimiter:
+    """`rate_per_minute` sustained, `burst` at once, per key. A rate of 0 disables it."""
+
+    KEY_PREFIX = "lm:rl:"
+
+    def __init__(self, rate_per_minute: float, burst: int, store=None):
+        self.rate = rate_per_minute / 60
+        self.burst = max(1, burst)
+        self.store = store or MemoryBucketStore()
+        self.rejected = 0
+
+    def check(self, *keys: str) -> float:
+        """0 if every key had a token, else the longest wait (seconds) among the keys that did not."""
+        if self.rate <= 0:
+            return 0.0
+        wait = max(self.store.take(self.KEY_PREFIX + k, self.rate, self.burst) for k in keys)
+        if wait:
+            self.rejected += 1
+        return wait
+
+
+def _build_store(url: str | None):
+    if not url or url.startswith("memory://"):
+        return MemoryBucketStore()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBucketStore(url)
+    raise ValueError(f"Unsupported RATE_LIMIT_URL: {url}")
+
+
+login_limiter = TokenBucketLimiter(
+    settings.LOGIN_RATE_LIMIT_PER_MINUTE,
+    settings.LOGIN_RATE_LIMIT_BURST,
+    store=_build_store(settings.RATE_LIMIT_URL),
+)
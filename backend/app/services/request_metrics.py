@@ -0,0 +1,100 @@
+import bisect
+import threading
+
+# Upper bounds (ms) of the latency buckets; the last bucket is open-ended
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th observation (None if it is the open bucket)."""
+        n = sum(self.counts)
+        if not n:
+            return 0.0
+        rank = q * n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else None
+        return None
+
+    def to_dict(self) -> dict:
+        n = sum(self.counts)
+        return {
+            "buckets": dict(zip([str(b) for b in BUCKETS_MS] + ["+Inf"], self.counts)),
+            "avgMs": self.total / n if n else 0.0,
+            "maxMs": self.max,
+            "p50Ms": self.quantile(0.5),
+            "p95Ms": self.quantile(0.95),
+            "p99Ms": self.quantile(0.99),
+        }
+
+
+class RouteStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.queries = 0
+        self.queries_max = 0
+        self.handler = Histogram()
+        self.db = Histogram()
+        self.slowest_ms = 0.0
+        self.slowest_sql: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "queriesAvg": self.queries / self.requests if self.requests else 0.0,
+            "queriesMax": self.queries_max,
+            "handler": self.handler.to_dict(),
+            "db": self.db.to_dict(),
+            "slowestQueryMs": self.slowest_ms,
+            "slowestQuery": self.slowest_sql,
+        }
+
+
+class RequestMetrics:
+    """Per-route (method + path template) histograms of handler and DB time for sampled requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[str, RouteStats] = {}
+
+    def observe(self, route: str, status: int, handler_ms: float, stats) -> None:
+        with self._lock:
+            r = self._routes.get(route)
+            if r is None:
+                r = self._routes[route] = RouteStats()
+            r.requests += 1
+            if status >= 500:
+                r.errors += 1
+            r.queries += stats.queries
+            r.queries_max = max(r.queries_max, stats.queries)
+            r.handler.observe(handler_ms)
+            r.db.observe(stats.db_ms)
+            if stats.slowest_ms > r.slowest_ms:
+                r.slowest_ms = stats.slowest_ms
+                r.slowest_sql = stats.slowest_sql
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {route: r.to_dict() for route, r in sorted(self._routes.items())}
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,244 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """The slice of a user (plus its session expiry) that auth-guarded endpoints need."""
+    id: uuid.UUID
+    role: str
+    name: str
+    email: str | None
+    employee_code: str | None
+    expires_at: datetime
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "id": str(self.id),
+            "role": self.role,
+            "name": self.name,
+            "email": self.email,
+            "employee_code": self.employee_code,
+            "expires_at": self.expires_at.isoformat(),
+        })
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "AuthUser":
+        d = json.loads(raw)
+        return cls(
+            id=uuid.UUID(d["id"]),
+            role=d["role"],
+            name=d["name"],
+            email=d["email"],
+            employee_code=d["employee_code"],
+            expires_at=datetime.fromisoformat(d["expires_at"]),
+        )
+
+
+class MemorySessionStore:
+    """Process-local stand-in for a shared store (tests / single worker)."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            item = self._data.get(key)
+            if not item:
+                return None
+            if item[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            return item[1]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisSessionStore:
+    """Shared store so every uvicorn worker sees the same entries and invalidations."""
+
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed when SESSION_CACHE_URL is redis://
+
+        self._r = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> str | None:
+        return self._r.get(key)
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self._r.set(key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self._r.delete(key)
+
+
+class SessionCache:
+    """
+    Session id -> AuthUser cache in front of the sessions/users lookup.
+
+    Without a store it is a bounded in-process LRU. With a store (shared between
+    workers) the store is the only layer, so an invalidation on one worker is seen
+    by all of them.
+    """
+
+    KEY_PREFIX = "lm:sess:"
+
+    def __init__(self, maxsize: int, ttl: int, store=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._local: OrderedDict[str, tuple[float, AuthUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _ttl_for(self, user: AuthUser) -> int:
+        # Never outlive the session itself
+        left = int((user.expires_at - datetime.now(timezone.utc)).total_seconds())
+        return max(0, min(self.ttl, left))
+
+    def get(self, sid: str) -> AuthUser | None:
+        user = self._get(sid)
+        if user is not None and user.expires_at <= datetime.now(timezone.utc):
+            self.invalidate(sid)
+            user = None
+        with self._lock:
+            if user is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return user
+
+    def _get(self, sid: str) -> AuthUser | None:
+        if self.store is not None:
+            raw = self.store.get(self.KEY_PREFIX + sid)
+            return AuthUser.from_json(raw) if raw else None
+
+        with self._lock:
+            item = self._local.get(sid)
+            if not item:
+                return None
+            if item[0] <= time.monotonic():
+                del self._local[sid]
+                return None
+            self._local.move_to_end(sid)
+            return item[1]
+
+    def put(self, sid: str, user: AuthUser) -> None:
+        ttl = self._ttl_for(user)
+        if ttl <= 0:
+            return
+        if self.store is not None:
+            self.store.set(self.KEY_PREFIX + sid, user.to_json(), ttl)
+            return
+
+        with self._lock:
+            self._local[sid] = (time.monotonic() + ttl, user)
+            self._local.move_to_end(sid)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def invalidate(self, sid: str) -> None:
+        if self.store is not None:
+            self.store.delete(self.KEY_PREFIX + sid)
+            return
+        with self._lock:
+            self._local.pop(sid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "enabled": True,
+                "backend": type(self.store).__name__ if self.store is not None else "local",
+                "size": len(self._local) if self.store is None else None,
+                "maxSize": self.maxsize,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": (self.hits / total) if total else 0.0,
+            }
+
+
+class NullSessionCache:
+    """Used when SESSION_CACHE_ENABLED is off: every lookup goes to the DB."""
+
+    def get(self, sid: str) -> AuthUser | None:
+        return None
+
+    def put(self, sid: str, user: AuthUser) -> None:
+        pass
+
+    def invalidate(self, sid: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"enabled": False}
+
+
+def _build_store(url: str | None):
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return MemorySessionStore()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisSessionStore(url)
+    raise ValueError(f"Unsupported SESSION_CACHE_URL: {url}")
+
+
+def build_session_cache():
+    if not settings.SESSION_CACHE_ENABLED:
+        return NullSessionCache()
+    return SessionCache(
+        maxsize=settings.SESSION_CACHE_MAX_ENTRIES,
+        ttl=settings.SESSION_CACHE_TTL_SECONDS,
+        store=_build_store(settings.SESSION_CACHE_URL),
+    )
+
+
+session_cache = build_session_cache()
+
+
+def invalidate_on_commit(db: OrmSession, sid) -> None:
+    """
+    Drop `sid` from the cache once db's transaction commits. Invalidating
+    earlier lets a concurrent request re-cache the row that is about to go.
+    """
+    db.info.setdefault("invalidate_sessions", set()).add(str(sid))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_after_commit(session):
+    for sid in session.info.pop("invalidate_sessions", ()):
+        session_cache.invalidate(sid)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("invalidate_sessions", None)
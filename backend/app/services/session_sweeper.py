@@ -0,0 +1,77 @@
+import logging
+import threading
+
+from sqlalchemy import delete, func, select
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Session as DbSession
+from app.services.session_cache import session_cache
+
+log = logging.getLogger(__name__)
+
+
+def sweep_expired_sessions(batch_size: int | None = None) -> int:
+    """Delete expired sessions in small batches (walks sessions_expires_at_idx). Returns rows deleted."""
+    batch_size = batch_size or settings.SESSION_SWEEP_BATCH_SIZE
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            expired = (
+                select(DbSession.id)
+                .where(DbSession.expires_at <= func.now())
+                .order_by(DbSession.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            ids = db.execute(
+                delete(DbSession)
+                .where(DbSession.id.in_(expired))
+                .returning(DbSession.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            db.commit()
+
+            for sid in ids:
+                session_cache.invalidate(str(sid))
+            total += len(ids)
+            if len(ids) < batch_size:
+                return total
+    finally:
+        db.close()
+
+
+class SessionSweeper:
+    """Background thread that periodically purges expired sessions off the request path."""
+
+    def __init__(self, interval_seconds: int):
+        self.interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                n = sweep_expired_sessions()
+                if n:
+                    log.info("session sweeper deleted %d expired sessions", n)
+            except Exception:
+                log.exception("session sweep failed")
+
+
+session_sweeper = SessionSweeper(settings.SESSION_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,160 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from starlette.responses import FileResponse, PlainTextResponse, Response
+
+try:  # optional: brotli variants are only built/served when the module is installed
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Worth compressing; images and fonts are compressed already
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/manifest+json")
+MIN_COMPRESS_BYTES = 1024
+# Bigger files are streamed from disk as-is instead of held in memory
+MAX_MEMORY_BYTES = 8 * 1024 * 1024
+
+# Vite puts content-hashed bundles under assets/
+IMMUTABLE_PREFIX = "assets/"
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+CACHE_DEFAULT = "public, max-age=3600"
+
+
+@dataclass
+class StaticAsset:
+    path: Path
+    media_type: str
+    etag: str
+    cache_control: str
+    body: bytes | None
+    variants: dict[str, bytes] = field(default_factory=dict)  # content-encoding -> body
+
+    def etag_for(self, encoding: str | None) -> str:
+        return f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+
+
+def _cache_control(rel: str) -> str:
+    if rel.startswith(IMMUTABLE_PREFIX):
+        return CACHE_IMMUTABLE
+    if rel.endswith(".html"):
+        return CACHE_REVALIDATE
+    return CACHE_DEFAULT
+
+
+def _load(path: Path, rel: str, precompress: bool) -> StaticAsset:
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type += "; charset=utf-8"
+
+    size = path.stat().st_size
+    if size > MAX_MEMORY_BYTES:
+        st = path.stat()
+        return StaticAsset(path, media_type, f"{st.st_mtime_ns:x}-{size:x}", _cache_control(rel), None)
+
+    data = path.read_bytes()
+    asset = StaticAsset(path, media_type, hashlib.sha256(data).hexdigest()[:20], _cache_control(rel), data)
+    if size < MIN_COMPRESS_BYTES or not media_type.startswith(COMPRESSIBLE_TYPES):
+        return asset
+
+    # Variants produced at build time win; otherwise build them once here
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        built = path.with_name(path.name + suffix)
+        if built.is_file():
+            asset.variants[encoding] = built.read_bytes()
+    if precompress:
+        if "br" not in asset.variants and brotli is not None:
+            asset.variants["br"] = brotli.compress(data, quality=11)
+        if "gzip" not in asset.variants:
+            asset.variants["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+    # Never send a "compressed" variant that is not smaller
+    asset.variants = {k: v for k, v in asset.variants.items() if len(v) < size}
+    return asset
+
+
+def accepted_encodings(header: str) -> set[str]:
+    out = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        out.add(name.strip().lower())
+    return out
+
+
+class PrecompressedStaticFiles:
+    """
+    Drop-in for StaticFiles(html=True) over a built frontend.
+
+    Every file is indexed once at startup (sha256 ETag, Cache-Control by path,
+    gzip/brotli variants read from *.gz/*.br next to it or built here), then
+    served from memory: the best variant the client accepts, and 304 when
+    If-None-Match matches. Hashed Vite assets are immutable; HTML revalidates.
+    """
+
+    def __init__(self, directory: str, precompress: bool = True):
+        self.directory = Path(directory).resolve()
+        self.assets: dict[str, StaticAsset] = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith((".gz", ".br")) and (Path(root) / name[:-3]).is_file():
+                    continue  # a precompressed variant, attached to its source file
+                path = Path(root) / name
+                rel = path.relative_to(self.directory).as_posix()
+                self.assets[rel] = _load(path, rel, precompress)
+
+    def lookup(self, route_path: str) -> tuple[StaticAsset | None, int]:
+        rel = route_path.strip("/")
+        if ".." in rel.split("/"):
+            return None, 404
+        asset = self.assets.get(rel) or self.assets.get(f"{rel}/index.html" if rel else "index.html")
+        if asset is not None:
+            return asset, 200
+        return self.assets.get("404.html"), 404
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+            await response(scope, receive, send)
+            return
+
+        path = scope["path"]
+        root = scope.get("root_path", "")
+        if root and path.startswith(root):
+            path = path[len(root):]
+
+        asset, status = self.lookup(path)
+        if asset is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        response = self.respond(asset, status, scope)
+        await response(scope, receive, send)
+
+    def respond(self, asset: StaticAsset, status: int, scope) -> Response:
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        accepted = accepted_encodings(headers.get("accept-encoding", ""))
+        encoding = next((e for e in ("br", "gzip") if e in asset.variants and e in accepted), None)
+
+        out = {"Cache-Control": asset.cache_control, "ETag": asset.etag_for(encoding)}
+        if asset.variants:
+            out["Vary"] = "Accept-Encoding"
+
+        if status == 200:
+            inm = headers.get("if-none-match")
+            if inm and (inm.strip() == "*" or asset.etag_for(encoding) in [t.strip() for t in inm.split(",")]):
+                return Response(status_code=304, headers=out)
+
+        if asset.body is None:
+            return FileResponse(asset.path, status_code=status, media_type=asset.media_type, headers=out)
+
+        if encoding:
+            out["Content-Encoding"] = encoding
+            return Response(asset.variants[encoding], status_code=status, media_type=asset.media_type, headers=out)
+        return Response(asset.body, status_code=status, media_type=asset.media_type, headers=out)
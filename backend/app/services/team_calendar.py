@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import orjson
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import settings
+from app.models import LeaveRequest, User
+from app.services.leave_queries import overlaps
+
+# Matches the predicate of leave_active_period_idx, so the window search is a GiST range scan
+ACTIVE_STATUSES = ("pending", "approved")
+
+
+def _intervals(start: date, end: date, excluded: list[date]) -> list[tuple[date, date]]:
+    """[start, end] split around the (sorted, distinct) excluded dates inside it."""
+    out = []
+    lo = start
+    for d in excluded:
+        if d < lo or d > end:
+            continue
+        if d > lo:
+            out.append((lo, d - timedelta(days=1)))
+        lo = d + timedelta(days=1)
+    if lo <= end:
+        out.append((lo, end))
+    return out
+
+
+def team_calendar(db: OrmSession, date_from: date, date_to: date) -> dict:
+    """
+    Who is out (approved or pending leave) on each day of [date_from, date_to].
+
+    One indexed query for the leaves touching the window; each leave is clipped
+    to the window and split around its excluded dates. Days with nobody out
+    are listed with an empty `onLeave`.
+    """
+    rows = db.execute(
+        select(
+            LeaveRequest.id,
+            LeaveRequest.employee_user_id,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.excluded_dates,
+            LeaveRequest.status,
+            User.name,
+            User.employee_code,
+        )
+        .join(User, User.id == LeaveRequest.employee_user_id)
+        .where(LeaveRequest.status.in_(ACTIVE_STATUSES), overlaps(date_from, date_to))
+    ).all()
+
+    n_days = (date_to - date_from).days + 1
+    days: list[list[dict]] = [[] for _ in range(n_days)]
+    employees = {}
+    leaves = []
+    for r in rows:
+        emp_id = str(r.employee_user_id)
+        leave_id = str(r.id)
+        employees[emp_id] = {"name": r.name, "employeeCode": r.employee_code}
+        excluded = sorted({date.fromisoformat(d) for d in r.excluded_dates or ()})
+        intervals = _intervals(max(r.start_date, date_from), min(r.end_date, date_to), excluded)
+        if not intervals:
+            continue
+        leaves.append({
+            "leaveId": leave_id,
+            "employeeId": emp_id,
+            "status": r.status,
+            "intervals": [{"start": lo, "end": hi} for lo, hi in intervals],
+        })
+        entry = {"employeeId": emp_id, "leaveId": leave_id, "status": r.status}
+        for lo, hi in intervals:
+            for i in range((lo - date_from).days, (hi - date_from).days + 1):
+                days[i].append(entry)
+
+    return {
+        "from": date_from,
+        "to": date_to,
+        "employees": employees,
+        "leaves": leaves,
+        "days": [{"date": date_from + timedelta(days=i), "onLeave": out} for i, out in enumerate(days)],
+    }
+
+
+class TeamCalendarCache:
+    """
+    Encoded /api/admin/calendar responses per (from, to) window.
+
+    Entries are tagged with a version that is bumped whenever a transaction that
+    wrote leave_requests commits in this process (submit_leave / decisions set
+    session.info["leaves_changed"]). Other workers' writes are only picked up
+    after ttl seconds, so keep it short when running several workers.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 64):
+        self.ttl = ttl_seconds
+        self.maxsize = maxsize
+        self.version = 0
+        self._entries: OrderedDict[tuple[date, date], tuple[int, float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: tuple[date, date]) -> bytes | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if not item:
+                return None
+            version, stored_at, body = item
+            if version != self.version or time.monotonic() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: tuple[date, date], body: bytes, version: int) -> None:
+        with self._lock:
+            if version != self.version:
+                return  # a write committed while this response was being built
+            self._entries[key] = (version, time.monotonic(), body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def bump(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+team_calendar_cache = TeamCalendarCache(settings.TEAM_CALENDAR_CACHE_SECONDS)
+
+
+def team_calendar_json(db: OrmSession, date_from: date, date_to: date) -> bytes:
+    if not team_calendar_cache.enabled:
+        return orjson.dumps(team_calendar(db, date_from, date_to))
+
+    key = (date_from, date_to)
+    body = team_calendar_cache.get(key)
+    if body is None:
+        version = team_calendar_cache.version
+        body = orjson.dumps(team_calendar(db, date_from, date_to))
+        team_calendar_cache.put(key, body, version)
+    return body
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _bump_after_commit(session):
+    if session.info.pop("leaves_changed", False):
+        team_calendar_cache.bump()
@@ -0,0 +1,132 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import date
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import settings
+from app.models import Holiday
+
+
+class WorkCalendar:
+    """
+    Working days = not a weekend day and not a holiday.
+
+    Per year it keeps a prefix-sum array (prefix[i] = working days among the
+    first i days of the year, built lazily and cached) plus the year's offset,
+    the working days before its Jan 1 (weekday arithmetic minus a bisect into
+    the holidays). Any range is then a fixed number of lookups, however many
+    years it spans.
+    """
+
+    def __init__(self, weekend_days, holidays):
+        self.weekend_days = frozenset(weekend_days)  # date.weekday(): Monday = 0
+        self.holidays = frozenset(holidays)
+        # Only holidays on would-be working days change a count
+        self._working_holidays = sorted(d for d in self.holidays if d.weekday() not in self.weekend_days)
+        self._week = [wd not in self.weekend_days for wd in range(7)]
+        self._years: dict[int, array] = {}
+        self._offsets: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _prefix(self, year: int) -> array:
+        prefix = self._years.get(year)
+        if prefix is not None:
+            return prefix
+
+        first = date(year, 1, 1).toordinal()
+        n = date(year, 12, 31).toordinal() - first + 1
+        prefix = array("H", [0]) * (n + 1)
+        acc = 0
+        for i in range(n):
+            d = date.fromordinal(first + i)
+            if d.weekday() not in self.weekend_days and d not in self.holidays:
+                acc += 1
+            prefix[i + 1] = acc
+        with self._lock:
+            self._years[year] = prefix
+        return prefix
+
+    def _offset(self, year: int) -> int:
+        """Working days from 0001-01-01 up to (not including) Jan 1 of `year`."""
+        offset = self._offsets.get(year)
+        if offset is not None:
+            return offset
+
+        first = date(year, 1, 1)
+        # Ordinal 1 is a Monday, so the days before `first` are whole weeks plus weekdays 0..rest-1
+        weeks, rest = divmod(first.toordinal() - 1, 7)
+        offset = weeks * sum(self._week) + sum(self._week[:rest]) - bisect_left(self._working_holidays, first)
+        with self._lock:
+            self._offsets[year] = offset
+        return offset
+
+    def _upto(self, d: date) -> int:
+        """Working days from 0001-01-01 through d."""
+        return self._offset(d.year) + self._prefix(d.year)[d.toordinal() - date(d.year, 1, 1).toordinal() + 1]
+
+    def is_working_day(self, d: date) -> bool:
+        i = d.toordinal() - date(d.year, 1, 1).toordinal()
+        prefix = self._prefix(d.year)
+        return prefix[i + 1] > prefix[i]
+
+    def working_days(self, start: date, end: date) -> int:
+        """Working days in [start, end], both inclusive (0 if start > end)."""
+        if start > end:
+            return 0
+        return self._upto(end) - self._upto(start) + self.is_working_day(start)
+
+
+class WorkCalendarCache:
+    """
+    Process-wide WorkCalendar with the holidays table loaded.
+
+    Served without DB work for CALENDAR_CACHE_SECONDS; after that only
+    count/max(updated_at) of holidays is re-read and the calendar is rebuilt
+    if it moved. Holiday edits in this process invalidate it on commit.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl = ttl_seconds
+        self._cal: WorkCalendar | None = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: OrmSession) -> WorkCalendar:
+        with self._lock:
+            cal = self._cal
+            if cal is not None and time.monotonic() - self._checked_at < self.ttl:
+                return cal
+
+        version = tuple(db.execute(select(func.count(), func.max(Holiday.updated_at))).one())
+        if cal is None or version != self._version:
+            days = db.execute(select(Holiday.day)).scalars().all()
+            cal = WorkCalendar(settings.WEEKEND_DAYS, days)
+
+        with self._lock:
+            self._cal = cal
+            self._version = version
+            self._checked_at = time.monotonic()
+        return cal
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cal = None
+
+
+work_calendars = WorkCalendarCache(settings.CALENDAR_CACHE_SECONDS)
+
+
+def leave_calendar(db: OrmSession) -> WorkCalendar | None:
+    """Calendar that leave day counts use, or None when every calendar day counts."""
+    return work_calendars.get(db) if settings.LEAVE_COUNT_WORKING_DAYS else None
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _reset_after_commit(session):
+    if session.info.pop("holidays_changed", False):
+        work_calendars.invalidate()
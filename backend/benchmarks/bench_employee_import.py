@@ -0,0 +1,53 @@
+"""
+Throughput of POST /api/admin/employees/import's two phases on a synthetic
+CSV: validation/normalization (always) and, with --db, COPY into the staging
+table plus the INSERT ... ON CONFLICT merge against DATABASE_URL. The DB run
+happens in a transaction that is rolled back, so nothing is kept.
+
+    cd backend && python -m benchmarks.bench_employee_import [--rows 10000] [--db]
+"""
+import argparse
+import time
+import uuid
+
+from benchmarks import _env  # noqa: F401  (placeholder settings; only --db touches the DB)
+
+from app.services.employee_import import load_employees, parse_employee_csv
+
+
+def synthetic_csv(n: int) -> bytes:
+    run = uuid.uuid4().hex[:8]
+    lines = ["name,dob,employeeCode,email"]
+    for i in range(n):
+        lines.append(f"Employee {i},19{70 + i % 30}-0{1 + i % 9}-1{i % 10},imp-{run}-{i},e{i}@example.com")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=10_000)
+    p.add_argument("--db", action="store_true", help="also COPY + merge into DATABASE_URL (rolled back)")
+    args = p.parse_args()
+
+    data = synthetic_csv(args.rows)
+    t0 = time.perf_counter()
+    rows, errors = parse_employee_csv(data)
+    parse_s = time.perf_counter() - t0
+    assert len(rows) == args.rows and not errors, errors[:3]
+    print(f"validate: {args.rows / parse_s:,.0f} rows/s ({parse_s * 1e3:.0f} ms)")
+
+    if args.db:
+        from app.db import SessionLocal
+
+        with SessionLocal() as db:
+            t0 = time.perf_counter()
+            inserted = load_employees(db, rows)
+            load_s = time.perf_counter() - t0
+            db.rollback()
+        assert len(inserted) == args.rows
+        print(f"COPY + merge: {args.rows / load_s:,.0f} rows/s ({load_s * 1e3:.0f} ms)")
+        print(f"end to end: {args.rows / (parse_s + load_s):,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
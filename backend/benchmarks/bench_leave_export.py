@@ -0,0 +1,99 @@
+"""
+Leave export encoders over 1M synthetic rows: throughput, time to first chunk
+and peak RSS, for the streaming encoder (batches of
+EXPORT_BATCH_ROWS, as they come off the server-side cursor) against building
+the whole export in memory first.
+
+    cd backend && python -m benchmarks.bench_leave_export [--rows 1000000] [--format csv|ndjson]
+
+Only the encoding side is measured here; the DB side is a named (server-side)
+cursor fetching the same batch size.
+"""
+import argparse
+import resource
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from types import SimpleNamespace
+
+from benchmarks import _env  # noqa: F401  (placeholder settings; nothing here touches the DB)
+
+from app.services.leave_export import EXPORT_BATCH_ROWS, ENCODERS, encode_batches
+
+
+def synthetic_rows(n: int):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    employees = [(f"Employee {i}", f"E{i:05d}") for i in range(5000)]
+    for i in range(n):
+        name, code = employees[i % len(employees)]
+        start = date(2026, 1, 1) + timedelta(days=i % 365)
+        yield SimpleNamespace(
+            id=uuid.uuid4(),
+            name=name,
+            employee_code=code,
+            start_date=start,
+            end_date=start + timedelta(days=2),
+            excluded_dates=[(start + timedelta(days=1)).isoformat()],
+            total_days=2,
+            status="approved",
+            reason="Family trip, back on Monday",
+            admin_comment=None,
+            decided_at=base + timedelta(minutes=i),
+            created_at=base + timedelta(minutes=i),
+        )
+
+
+def batched(rows, size: int):
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_streaming(n: int, fmt: str) -> dict:
+    t0 = time.perf_counter()
+    first = None
+    total = 0
+    for chunk in encode_batches(batched(synthetic_rows(n), EXPORT_BATCH_ROWS), fmt):
+        if first is None:
+            first = time.perf_counter() - t0
+        total += len(chunk)  # what StreamingResponse would hand to the socket
+    elapsed = time.perf_counter() - t0
+    return {"seconds": elapsed, "first_chunk_ms": first * 1e3, "bytes": total, "peak_mb": _peak_rss_mb()}
+
+
+def run_in_memory(n: int, fmt: str) -> dict:
+    t0 = time.perf_counter()
+    rows = list(synthetic_rows(n))
+    enc = ENCODERS[fmt]()
+    body = enc.header() + enc.rows(rows)
+    elapsed = time.perf_counter() - t0
+    return {"seconds": elapsed, "first_chunk_ms": elapsed * 1e3, "bytes": len(body), "peak_mb": _peak_rss_mb()}
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--format", choices=sorted(ENCODERS), default="csv")
+    p.add_argument("--skip-in-memory", action="store_true")
+    args = p.parse_args()
+
+    # Streaming runs first: peak RSS only ever grows within the process
+    runs = [("streaming", run_streaming)]
+    if not args.skip_in_memory:
+        runs.append(("in-memory", run_in_memory))
+    for label, fn in runs:
+        r = fn(args.rows, args.format)
+        print(
+            f"{label:>9} {args.format}: {args.rows / r['seconds']:,.0f} rows/s, "
+            f"first chunk {r['first_chunk_ms']:.1f} ms, {r['bytes'] / 2**20:.0f} MiB out, "
+            f"peak RSS {r['peak_mb']:.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Per-row CPU cost of serializing list[LeaveOut]: the old path (hand-built dicts
+with fromisoformat + FastAPI response_model validation + json) against the
+shared serializer + orjson fast path.
+
+    cd backend && python -m benchmarks.bench_leave_serialization
+"""
+import json
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from benchmarks import _env  # noqa: F401  (placeholder settings; nothing here touches the DB)
+
+from pydantic import TypeAdapter
+
+from app.schemas import LeaveOut
+from app.services.leave_serializer import LeaveListResponse
+
+
+def make_rows(n: int) -> list:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        start = date(2026, 1, 1) + timedelta(days=i % 300)
+        rows.append(SimpleNamespace(
+            id=uuid.uuid4(),
+            start_date=start,
+            end_date=start + timedelta(days=4),
+            excluded_dates=[(start + timedelta(days=1)).isoformat(), (start + timedelta(days=2)).isoformat()],
+            total_days=3,
+            reason="Family trip",
+            status="pending",
+            admin_comment=None,
+            created_at=base + timedelta(minutes=i),
+        ))
+    return rows
+
+
+_adapter = TypeAdapter(list[LeaveOut])
+
+
+def old_path(rows) -> bytes:
+    out = []
+    for lr in rows:
+        out.append({
+            "id": str(lr.id),
+            "startDate": lr.start_date,
+            "endDate": lr.end_date,
+            "excludedDates": [datetime.fromisoformat(d).date() for d in lr.excluded_dates],
+            "totalDays": lr.total_days,
+            "reason": lr.reason,
+            "status": lr.status,
+            "adminComment": lr.admin_comment,
+            "createdAt": lr.created_at.isoformat(),
+        })
+    # What FastAPI does with response_model=list[LeaveOut] before JSONResponse
+    validated = _adapter.validate_python(out)
+    content = _adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def new_path(rows) -> bytes:
+    return LeaveListResponse(rows).body
+
+
+def main():
+    for n in (200, 400):
+        rows = make_rows(n)
+        assert json.loads(old_path(rows)) == json.loads(new_path(rows))
+        number = 200
+        old = min(timeit.repeat(lambda: old_path(rows), number=number, repeat=5)) / number
+        new = min(timeit.repeat(lambda: new_path(rows), number=number, repeat=5)) / number
+        print(
+            f"{n} rows: old {old * 1e6 / n:.2f} us/row ({old * 1e3:.2f} ms), "
+            f"new {new * 1e6 / n:.2f} us/row ({new * 1e3:.2f} ms), {old / new:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+calc_total_days: the old day-by-day walk against the sorted-exclusions version,
+with and without a WorkCalendar (weekends + holidays, per-year prefix sums).
+
+First cross-checks both against naive reference implementations on random
+ranges, exclusions and holiday sets (property-style, seeded), then times
+multi-year ranges.
+
+    cd backend && python -m benchmarks.bench_work_calendar [--cases 20000] [--seed 1]
+"""
+import argparse
+import random
+import timeit
+from datetime import date, timedelta
+
+from benchmarks import _env  # noqa: F401  (placeholder settings; nothing here touches the DB)
+
+from app.services.leave_calc import calc_total_days
+from app.services.work_calendar import WorkCalendar
+
+
+def naive_calc_total_days(start: date, end: date, excluded: list[date] | None) -> tuple[int, list[str]]:
+    """calc_total_days as it was before the calendar engine (O(range length))."""
+    if start > end:
+        raise ValueError("start_date_after_end_date")
+    excluded_set = set(excluded or [])
+    in_range = []
+    d = start
+    while d <= end:
+        if d in excluded_set:
+            in_range.append(d)
+        d += timedelta(days=1)
+    total = max(0, (end - start).days + 1 - len(in_range))
+    return total, [x.isoformat() for x in sorted(in_range)]
+
+
+def naive_working_total(start: date, end: date, excluded, weekend_days, holidays) -> int:
+    excluded_set = set(excluded or [])
+    total = 0
+    d = start
+    while d <= end:
+        if d.weekday() not in weekend_days and d not in holidays and d not in excluded_set:
+            total += 1
+        d += timedelta(days=1)
+    return total
+
+
+def _random_date(rng: random.Random, lo: date, span_days: int) -> date:
+    return lo + timedelta(days=rng.randrange(span_days))
+
+
+def cross_check(cases: int, seed: int) -> None:
+    rng = random.Random(seed)
+    lo = date(2023, 1, 1)
+    for case in range(cases):
+        weekend = set(rng.sample(range(7), rng.choice((0, 1, 2, 2, 3))))
+        holidays = {_random_date(rng, lo, 6 * 366) for _ in range(rng.randrange(40))}
+        cal = WorkCalendar(weekend, holidays)
+
+        start = _random_date(rng, lo, 4 * 366)
+        end = start + timedelta(days=rng.choice((0, 1, 6, 30, 200, 400, 1200)) + rng.randrange(5))
+        span = (end - start).days + 30
+        excluded = [_random_date(rng, start - timedelta(days=15), span) for _ in range(rng.randrange(12))]
+        excluded += rng.sample(excluded, min(2, len(excluded)))  # duplicates
+
+        expected = naive_calc_total_days(start, end, excluded)
+        got = calc_total_days(start, end, excluded)
+        assert got == expected, (case, start, end, excluded, got, expected)
+
+        total, excluded_str = calc_total_days(start, end, excluded, calendar=cal)
+        assert excluded_str == expected[1], (case, excluded_str, expected[1])
+        want = naive_working_total(start, end, excluded, weekend, holidays)
+        assert total == want, (case, start, end, sorted(weekend), total, want)
+
+        # Empty weekend and no holidays: the calendar must agree with plain counting
+        if not weekend and not holidays:
+            assert total == expected[0]
+
+    # start > end is rejected the same way by both
+    for fn in (naive_calc_total_days, calc_total_days):
+        try:
+            fn(date(2026, 1, 2), date(2026, 1, 1), None)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{fn.__name__} accepted start > end")
+    print(f"cross-check: {cases} random cases OK (seed {seed})")
+
+
+def bench() -> None:
+    rng = random.Random(0)
+    cal = WorkCalendar({5, 6}, {_random_date(rng, date(2020, 1, 1), 12 * 366) for _ in range(150)})
+    for years in (1, 3, 10):
+        start = date(2021, 3, 15)
+        end = start + timedelta(days=365 * years)
+        excluded = sorted({_random_date(rng, start, (end - start).days) for _ in range(20)})
+        cal.working_days(start, end)  # warm the per-year prefix arrays
+
+        number = 2000 if years < 10 else 500
+        old = min(timeit.repeat(lambda: naive_calc_total_days(start, end, excluded), number=number, repeat=5)) / number
+        new = min(timeit.repeat(lambda: calc_total_days(start, end, excluded), number=number, repeat=5)) / number
+        wd = min(timeit.repeat(lambda: calc_total_days(start, end, excluded, calendar=cal), number=number, repeat=5)) / number
+        print(
+            f"{years:>2}y range, {len(excluded)} exclusions: naive {old * 1e6:.1f} us, "
+            f"calendar days {new * 1e6:.1f} us ({old / new:.0f}x), working days {wd * 1e6:.1f} us"
+        )
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--cases", type=int, default=20000)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+    cross_check(args.cases, args.seed)
+    bench()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+A/B load test: sync handlers (psycopg2, threadpool) vs DB_ASYNC=true (asyncpg).
+
+Starts one uvicorn per mode against the same DATABASE_URL (run migrations
+first), registers a throwaway employee, then drives GET /api/leaves/my and
+POST /api/leaves with N concurrent clients. Reports requests/sec, latency
+percentiles and server RSS so the two modes can be compared at equal memory.
+
+    cd backend && python -m benchmarks.load_async_vs_sync --seconds 20 --concurrency 64
+
+POST /api/leaves inserts real rows (one-day leaves far in the future).
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import httpx
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _start_server(port: int, async_mode: bool) -> subprocess.Popen:
+    env = dict(os.environ, DB_ASYNC="true" if async_mode else "false", EMAIL_OUTBOX_WORKERS="0")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def _wait_ready(base: str) -> None:
+    async with httpx.AsyncClient(base_url=base) as c:
+        for _ in range(100):
+            try:
+                await c.get("/api/bootstrap")
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"server at {base} did not start")
+
+
+async def _login(base: str) -> dict:
+    async with httpx.AsyncClient(base_url=base) as c:
+        code = f"bench-{uuid.uuid4().hex[:10]}"
+        r = await c.post("/api/auth/register-employee", json={"name": code, "dob": "1990-01-01", "employeeCode": code})
+        r.raise_for_status()
+        return dict(r.cookies)
+
+
+async def _drive(base: str, cookies: dict, route: str, seconds: float, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    day = iter(range(10**9))
+    deadline = time.perf_counter() + seconds
+
+    async def worker(c: httpx.AsyncClient):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            if route == "apply":
+                d = (date(2100, 1, 1) + timedelta(days=next(day))).isoformat()
+                r = await c.post("/api/leaves", json={"startDate": d, "endDate": d, "excludedDates": [], "reason": "bench"})
+            else:
+                r = await c.get("/api/leaves/my")
+            latencies.append(time.perf_counter() - t0)
+            if r.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, cookies=cookies, limits=limits, timeout=30) as c:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(c) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": q[49] * 1e3,
+        "p95_ms": q[94] * 1e3,
+        "p99_ms": q[98] * 1e3,
+    }
+
+
+async def run(args) -> dict:
+    results = {}
+    for i, async_mode in enumerate((False, True)):
+        mode = "async" if async_mode else "sync"
+        port = args.port + i
+        proc = _start_server(port, async_mode)
+        try:
+            base = f"http://127.0.0.1:{port}"
+            await _wait_ready(base)
+            cookies = await _login(base)
+            results[mode] = {}
+            for route in ("list", "apply"):
+                stats = await _drive(base, cookies, route, args.seconds, args.concurrency)
+                stats["rss_mb"] = _rss_mb(proc.pid)
+                results[mode][route] = stats
+                print(mode, route, json.dumps({k: round(v, 2) for k, v in stats.items()}))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+    return results
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--seconds", type=float, default=20)
+    p.add_argument("--concurrency", type=int, default=64)
+    p.add_argument("--port", type=int, default=8100)
+    p.add_argument("--out", help="write results JSON here")
+    args = p.parse_args()
+    results = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
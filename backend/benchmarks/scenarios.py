@@ -0,0 +1,294 @@
+"""
+One scenario per route of app.main (checked by uncovered_routes), shared by
+the in-process and HTTP runners in benchmarks.suite. A scenario builds its
+next request from the benchmark state, or returns None once its inputs (seeded
+pending leaves, spare sessions, ...) are used up.
+"""
+import itertools
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+# Writes land here so they never overlap seeded leaves or each other
+FAR_FUTURE = date(2100, 1, 1)
+HOLIDAY_BASE = date(2300, 1, 1)
+DECISIONS_PER_BULK = 20
+IMPORT_ROWS = 20
+
+
+@dataclass
+class BenchContext:
+    """Inputs picked from the seeded database once, before any process starts (picklable)."""
+    cookie_name: str
+    setup_code: str
+    admin_sid: str
+    employees: list[dict]  # id, name, dob, sid
+    pending_ids: list[str]
+    spare_sids: list[str]  # seeded live sessions, consumed by logout
+    smtp_host: str
+    smtp_port: int
+    today: date
+    run_tag: str = field(default_factory=lambda: uuid.uuid4().hex[:6])
+
+
+class BenchState:
+    """Per-process view of a BenchContext: its share of the consumable pools plus counters."""
+
+    def __init__(self, ctx: BenchContext, worker: int = 0, workers: int = 1):
+        self.ctx = ctx
+        self.worker = worker
+        self.workers = workers
+        self.pending = deque(ctx.pending_ids[worker::workers])
+        self.spare_sids = deque(ctx.spare_sids[worker::workers])
+        self.holidays: deque[date] = deque()
+        self.etags: dict[str, str] = {}
+        self._employees = itertools.cycle(ctx.employees)
+        self._seq = itertools.count()
+
+    def seq(self) -> int:
+        """Unique across processes: worker-strided."""
+        return next(self._seq) * self.workers + self.worker
+
+    def employee(self) -> dict:
+        return next(self._employees)
+
+    def cookie(self, sid: str) -> dict:
+        return {"Cookie": f"{self.ctx.cookie_name}={sid}"}
+
+    def admin(self) -> dict:
+        return self.cookie(self.ctx.admin_sid)
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    route: str  # the FastAPI path template, for coverage
+    build: Callable[[BenchState], dict | None]  # -> {"path", "headers", "json" | "content"} or None
+    expect: tuple[int, ...] = (200,)
+    stream: bool = False  # time to the first body chunk, then disconnect
+    revalidate: bool = False  # send the ETag last seen for this path
+
+
+def _as_employee(path: str):
+    def build(st: BenchState):
+        return {"path": path, "headers": st.cookie(st.employee()["sid"])}
+    return build
+
+
+def _as_admin(path):
+    def build(st: BenchState):
+        return {"path": path(st) if callable(path) else path, "headers": st.admin()}
+    return build
+
+
+def _register_admin(st: BenchState):
+    # Valid setup code, so this exercises the "setup already used" lookup rather than the cheap rejection
+    body = {"setupCode": st.ctx.setup_code, "name": "Bench Admin", "dob": "1980-01-01", "email": "admin@bench.local"}
+    return {"path": "/api/auth/register-admin", "json": body}
+
+
+def _register_employee(st: BenchState):
+    n = st.seq()
+    code = f"R{st.ctx.run_tag}-{n}"
+    body = {"name": f"Bench registered {st.ctx.run_tag} {n}", "dob": "1990-01-01", "employeeCode": code, "email": f"{code}@bench.local"}
+    return {"path": "/api/auth/register-employee", "json": body}
+
+
+def _login(st: BenchState):
+    e = st.employee()
+    # With the device's live session cookie: the reuse path
+    return {"path": "/api/auth/login", "json": {"name": e["name"], "dob": e["dob"]}, "headers": st.cookie(e["sid"])}
+
+
+def _logout(st: BenchState):
+    if not st.spare_sids:
+        return None
+    return {"path": "/api/auth/logout", "headers": st.cookie(st.spare_sids.popleft())}
+
+
+def _apply_leave(st: BenchState):
+    d = (FAR_FUTURE + timedelta(days=st.seq())).isoformat()
+    body = {"startDate": d, "endDate": d, "excludedDates": [], "reason": "bench"}
+    return {"path": "/api/leaves", "json": body, "headers": st.cookie(st.employee()["sid"])}
+
+
+def _import_employees(st: BenchState):
+    n = st.seq()
+    lines = ["name,dob,employeeCode,email"]
+    for i in range(IMPORT_ROWS):
+        code = f"I{st.ctx.run_tag}-{n}-{i}"
+        lines.append(f"Bench imported {code},1991-02-03,{code},{code}@bench.local")
+    headers = {**st.admin(), "Content-Type": "text/csv"}
+    return {"path": "/api/admin/employees/import", "content": ("\n".join(lines) + "\n").encode(), "headers": headers}
+
+
+def _decide_bulk(st: BenchState):
+    if len(st.pending) < DECISIONS_PER_BULK:
+        return None
+    body = [
+        {"id": st.pending.popleft(), "decision": "approved" if i % 4 else "rejected", "comment": "bench"}
+        for i in range(DECISIONS_PER_BULK)
+    ]
+    return {"path": "/api/admin/leaves/decisions", "json": body, "headers": st.admin()}
+
+
+def _decide_one(st: BenchState):
+    if not st.pending:
+        return None
+    leave_id = st.pending.popleft()
+    body = {"decision": "approved" if st.seq() % 4 else "rejected", "comment": "bench"}
+    return {"path": f"/api/admin/leaves/{leave_id}/decision", "json": body, "headers": st.admin()}
+
+
+def _employee_leaves(st: BenchState):
+    return {"path": f"/api/admin/employees/{st.employee()['id']}/leaves", "headers": st.admin()}
+
+
+def _window(st: BenchState, days: int) -> str:
+    lo = st.ctx.today - timedelta(days=days // 2)
+    return f"from={lo.isoformat()}&to={(lo + timedelta(days=days - 1)).isoformat()}"
+
+
+def _put_holiday(st: BenchState):
+    day = HOLIDAY_BASE + timedelta(days=st.seq())
+    st.holidays.append(day)
+    return {"path": f"/api/admin/holidays/{day.isoformat()}", "json": {"name": "Bench holiday"}, "headers": st.admin()}
+
+
+def _delete_holiday(st: BenchState):
+    if not st.holidays:
+        return None
+    return {"path": f"/api/admin/holidays/{st.holidays.popleft().isoformat()}", "headers": st.admin()}
+
+
+def email_config_body(ctx: BenchContext) -> dict:
+    return {
+        "enabled": True,
+        "provider": "custom_smtp",
+        "mode": "smtp",
+        "smtpHost": ctx.smtp_host,
+        "smtpPort": ctx.smtp_port,
+        "smtpUser": "bench",
+        "smtpPass": "bench",
+        "senderEmail": "leave@bench.local",
+        "senderName": "Leave bench",
+    }
+
+
+def _put_email_config(st: BenchState):
+    return {"path": "/api/admin/email-config", "json": email_config_body(st.ctx), "headers": st.admin()}
+
+
+SCENARIOS: list[Scenario] = [
+    Scenario("bootstrap", "GET", "/api/bootstrap", lambda st: {"path": "/api/bootstrap"}),
+    Scenario("register_admin", "POST", "/api/auth/register-admin", _register_admin, expect=(403,)),
+    Scenario("register_employee", "POST", "/api/auth/register-employee", _register_employee),
+    Scenario("login", "POST", "/api/auth/login", _login),
+    Scenario("logout", "POST", "/api/auth/logout", _logout),
+    Scenario("me", "GET", "/api/auth/me", _as_employee("/api/auth/me")),
+    Scenario("apply_leave", "POST", "/api/leaves", _apply_leave),
+    Scenario("my_leaves", "GET", "/api/leaves/my", _as_employee("/api/leaves/my")),
+    Scenario("my_leaves_304", "GET", "/api/leaves/my", _as_employee("/api/leaves/my"), expect=(200, 304), revalidate=True),
+    Scenario("my_pending", "GET", "/api/leaves/my/pending", _as_employee("/api/leaves/my/pending")),
+    Scenario("my_balance", "GET", "/api/leaves/my/balance", _as_employee("/api/leaves/my/balance")),
+    Scenario("admin_employees", "GET", "/api/admin/employees", _as_admin("/api/admin/employees")),
+    Scenario("admin_employees_304", "GET", "/api/admin/employees", _as_admin("/api/admin/employees"), expect=(200, 304), revalidate=True),
+    Scenario("import_employees", "POST", "/api/admin/employees/import", _import_employees),
+    Scenario("admin_pending", "GET", "/api/admin/leaves/pending", _as_admin("/api/admin/leaves/pending")),
+    Scenario("admin_pending_304", "GET", "/api/admin/leaves/pending", _as_admin("/api/admin/leaves/pending"), expect=(200, 304), revalidate=True),
+    Scenario("decide_leaves", "POST", "/api/admin/leaves/decisions", _decide_bulk),
+    Scenario("decide_leave", "POST", "/api/admin/leaves/{leave_id}/decision", _decide_one),
+    Scenario("employee_leaves", "GET", "/api/admin/employees/{employee_id}/leaves", _employee_leaves),
+    Scenario("leave_stream", "GET", "/api/admin/leaves/stream", _as_admin("/api/admin/leaves/stream"), stream=True),
+    Scenario("export_csv", "GET", "/api/admin/leaves/export", _as_admin(lambda st: f"/api/admin/leaves/export?{_window(st, 31)}&format=csv")),
+    Scenario("calendar", "GET", "/api/admin/calendar", _as_admin(lambda st: f"/api/admin/calendar?{_window(st, 31)}")),
+    Scenario("balances", "GET", "/api/admin/balances", _as_admin("/api/admin/balances")),
+    Scenario("stats", "GET", "/api/admin/stats", _as_admin("/api/admin/stats")),
+    Scenario("holidays", "GET", "/api/holidays", _as_employee("/api/holidays")),
+    Scenario("put_holiday", "PUT", "/api/admin/holidays/{day}", _put_holiday),
+    Scenario("delete_holiday", "DELETE", "/api/admin/holidays/{day}", _delete_holiday),
+    Scenario("session_cache", "GET", "/api/admin/session-cache", _as_admin("/api/admin/session-cache")),
+    Scenario("db_pool", "GET", "/api/admin/db-pool", _as_admin("/api/admin/db-pool")),
+    Scenario("metrics", "GET", "/api/admin/metrics", _as_admin("/api/admin/metrics")),
+    Scenario("email_config", "GET", "/api/admin/email-config", _as_admin("/api/admin/email-config")),
+    Scenario("put_email_config", "PUT", "/api/admin/email-config", _put_email_config),
+    Scenario("test_email", "POST", "/api/admin/email-config/test", _as_admin("/api/admin/email-config/test")),
+]
+
+
+def uncovered_routes(app) -> list[str]:
+    """`METHOD path` of every API route without a scenario."""
+    from fastapi.routing import APIRoute
+
+    covered = {(s.method, s.route) for s in SCENARIOS}
+    return sorted(
+        f"{m} {r.path}"
+        for r in app.routes
+        if isinstance(r, APIRoute)
+        for m in r.methods
+        if m != "HEAD" and (m, r.path) not in covered
+    )
+
+
+def load_context(sample_employees: int, pending: int, spare_sessions: int, smtp_host: str, smtp_port: int) -> BenchContext:
+    """
+    Pick benchmark inputs from the seeded database and give the admin and the
+    sampled employees fresh sessions (committed, so every process can use them).
+    Also points email_config at the SMTP sink.
+    """
+    from sqlalchemy import func, select
+
+    from app.config import settings
+    from app.db import SessionLocal
+    from app.models import LeaveRequest, Session as DbSession, User
+    from app.services.email_service import update_email_config
+
+    now = datetime.now(timezone.utc)
+    expires = now + timedelta(days=1)
+    with SessionLocal() as db:
+        admin = db.execute(select(User.id).where(User.role == "admin").limit(1)).scalar()
+        if admin is None:
+            raise SystemExit("no admin user; run python -m benchmarks.seed first")
+        employees = db.execute(
+            select(User.id, User.name, User.dob)
+            .where(User.role == "employee")
+            .order_by(func.random())
+            .limit(sample_employees)
+        ).all()
+        if not employees:
+            raise SystemExit("no employees; run python -m benchmarks.seed first")
+
+        sessions = [DbSession(user_id=admin, created_at=now, expires_at=expires, user_agent="bench")]
+        sessions += [DbSession(user_id=e.id, created_at=now, expires_at=expires, user_agent="bench") for e in employees]
+        db.add_all(sessions)
+        db.flush()
+
+        pending_ids = db.execute(
+            select(LeaveRequest.id).where(LeaveRequest.status == "pending").limit(pending)
+        ).scalars().all()
+        spare = db.execute(
+            select(DbSession.id)
+            .where(DbSession.expires_at > now, DbSession.user_agent != "bench")
+            .limit(spare_sessions)
+        ).scalars().all()
+
+        ctx = BenchContext(
+            cookie_name=settings.SESSION_COOKIE_NAME,
+            setup_code=settings.ADMIN_SETUP_CODE,
+            admin_sid=str(sessions[0].id),
+            employees=[
+                {"id": str(e.id), "name": e.name, "dob": e.dob.isoformat(), "sid": str(s.id)}
+                for e, s in zip(employees, sessions[1:])
+            ],
+            pending_ids=[str(i) for i in pending_ids],
+            spare_sids=[str(i) for i in spare],
+            smtp_host=smtp_host,
+            smtp_port=smtp_port,
+            today=now.date(),
+        )
+        update_email_config(db, email_config_body(ctx))
+        db.commit()
+    return ctx
@@ -0,0 +1,209 @@
+"""
+Synthetic data for the benchmark suite: employees, leave requests and sessions
+bulk-loaded with COPY into DATABASE_URL (run migrations first), then the
+derived tables (leave_balances, monthly stats) rebuilt set-based and ANALYZEd.
+
+    cd backend && python -m benchmarks.seed --employees 10000 --leaves 1000000 --sessions 100000 [--truncate]
+
+The same --seed gives the same rows. Without --truncate rows are appended
+under a fresh run tag; --truncate empties every app table first (never point
+this at real data). Leaves never overlap per employee, so the exclusion
+constraint holds; past leaves are mostly decided, recent ones mostly pending.
+"""
+import argparse
+import io
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.db import SessionLocal
+from app.services.leave_balance import rebuild_balances
+from app.services.leave_stats import rebuild_leave_stats
+
+# Rows per COPY round trip; keeps the client-side buffer small at any scale
+COPY_CHUNK_ROWS = 50_000
+
+TABLES = (
+    "leave_employee_month_stats", "leave_month_stats", "leave_balances", "email_outbox",
+    "leave_requests", "sessions", "holidays", "users", "app_settings",
+)
+
+ADMIN_NAME = "Bench Admin"
+ADMIN_DOB = date(1980, 1, 1)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _ts(d: datetime) -> str:
+    return d.isoformat()
+
+
+def _copy(db, table: str, columns: tuple[str, ...], rows) -> int:
+    """COPY an iterable of tuples (already-formatted text fields, None = NULL) in chunks."""
+    cursor = db.connection().connection.cursor()
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    n = 0
+    buf = io.StringIO()
+    try:
+        for row in rows:
+            buf.write("\t".join(r"\N" if v is None else str(v) for v in row))
+            buf.write("\n")
+            n += 1
+            if n % COPY_CHUNK_ROWS == 0:
+                buf.seek(0)
+                cursor.copy_expert(sql, buf)
+                buf = io.StringIO()
+        if buf.tell():
+            buf.seek(0)
+            cursor.copy_expert(sql, buf)
+    finally:
+        cursor.close()
+    return n
+
+
+def _admin(db, now: datetime) -> uuid.UUID:
+    admin_id = db.execute(text("SELECT id FROM users WHERE role = 'admin' LIMIT 1")).scalar()
+    if admin_id:
+        return admin_id
+    admin_id = uuid.uuid4()
+    db.execute(
+        text("""
+            INSERT INTO users (id, role, name, dob, email, created_at, updated_at)
+            VALUES (:id, 'admin', :name, :dob, 'admin@bench.local', :now, :now)
+        """),
+        {"id": admin_id, "name": ADMIN_NAME, "dob": ADMIN_DOB, "now": now},
+    )
+    db.execute(text("""
+        INSERT INTO app_settings (key, value) VALUES ('admin_setup_used', '1')
+        ON CONFLICT (key) DO UPDATE SET value = '1'
+    """))
+    return admin_id
+
+
+def _employees(rng: random.Random, n: int, tag: str, now: datetime):
+    for i in range(n):
+        dob = date(1960, 1, 1) + timedelta(days=rng.randrange(40 * 365))
+        yield (
+            _uuid(rng), "employee", f"Bench {tag} {i:06d}", dob.isoformat(),
+            f"bench-{tag}-{i}@bench.local", f"B{tag}-{i:06d}", _ts(now), _ts(now),
+        )
+
+
+def _leaves(rng: random.Random, employee_ids: list, per_employee: list[int], admin_id, today: date, pending_days: int):
+    """Back to back, non-overlapping leaves per employee, ending around `today`."""
+    reasons = ("Vacation", "Family", "Medical appointment", "Moving house", "Personal")
+    for emp, count in zip(employee_ids, per_employee):
+        # Average stride is ~13 days; start far enough back that the last leaves land near today
+        start = today - timedelta(days=count * 13 + rng.randrange(30))
+        for _ in range(count):
+            start += timedelta(days=rng.randint(1, 20))
+            length = rng.randint(1, 5)
+            end = start + timedelta(days=length - 1)
+            excluded = []
+            if length >= 3 and rng.random() < 0.2:
+                excluded = [(start + timedelta(days=1)).isoformat()]
+            created = datetime.combine(start - timedelta(days=rng.randint(1, 30)), datetime.min.time(), timezone.utc)
+
+            if start > today - timedelta(days=pending_days) and rng.random() < 0.7:
+                status, decided_by, decided_at = "pending", None, None
+            else:
+                status = "approved" if rng.random() < 0.85 else "rejected"
+                decided_by, decided_at = admin_id, created + timedelta(hours=rng.randint(1, 72))
+            yield (
+                _uuid(rng), emp, start.isoformat(), end.isoformat(), json.dumps(excluded),
+                length - len(excluded), rng.choice(reasons), status, None,
+                decided_by, _ts(decided_at) if decided_at else None,
+                _ts(created), _ts(decided_at or created),
+            )
+            start = end
+
+
+def _sessions(rng: random.Random, user_ids: list, n: int, now: datetime):
+    agents = ("Mozilla/5.0 (Windows NT 10.0)", "Mozilla/5.0 (Macintosh)", "Mozilla/5.0 (iPhone)")
+    for _ in range(n):
+        created = now - timedelta(minutes=rng.randrange(14 * 24 * 60))
+        # ~10% already expired, as the sweeper would find them
+        expires = created + timedelta(days=14) if rng.random() > 0.1 else now - timedelta(minutes=rng.randint(1, 600))
+        yield (
+            _uuid(rng), rng.choice(user_ids), _ts(created), _ts(expires),
+            f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}", rng.choice(agents),
+        )
+
+
+def seed(employees: int, leaves: int, sessions: int, rng_seed: int = 42, truncate: bool = False, pending_days: int = 60) -> dict:
+    rng = random.Random(rng_seed)
+    tag = f"{rng_seed:x}" if truncate else uuid.uuid4().hex[:6]
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    timings = {}
+
+    with SessionLocal() as db:
+        if truncate:
+            db.execute(text(f"TRUNCATE {', '.join(TABLES)} CASCADE"))
+        admin_id = _admin(db, now)
+
+        t0 = time.perf_counter()
+        rows = list(_employees(rng, employees, tag, now))
+        _copy(db, "users", ("id", "role", "name", "dob", "email", "employee_code", "created_at", "updated_at"), rows)
+        employee_ids = [r[0] for r in rows]
+        timings["users_s"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        base, extra = divmod(leaves, max(employees, 1))
+        per_employee = [base + (1 if i < extra else 0) for i in range(employees)]
+        n_leaves = _copy(
+            db,
+            "leave_requests",
+            ("id", "employee_user_id", "start_date", "end_date", "excluded_dates", "total_days", "reason",
+             "status", "admin_comment", "decided_by_admin_user_id", "decided_at", "created_at", "updated_at"),
+            _leaves(rng, employee_ids, per_employee, admin_id, today, pending_days),
+        )
+        timings["leave_requests_s"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        n_sessions = _copy(
+            db, "sessions", ("id", "user_id", "created_at", "expires_at", "ip", "user_agent"),
+            _sessions(rng, employee_ids or [admin_id], sessions, now),
+        )
+        timings["sessions_s"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        rebuild_balances(db)
+        rebuild_leave_stats(db)
+        timings["derived_s"] = time.perf_counter() - t0
+        db.commit()
+
+    # Fresh planner statistics before anything is measured
+    with SessionLocal() as db:
+        t0 = time.perf_counter()
+        db.execute(text("ANALYZE"))
+        db.commit()
+        timings["analyze_s"] = time.perf_counter() - t0
+
+    return {"tag": tag, "employees": employees, "leave_requests": n_leaves, "sessions": n_sessions, **timings}
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--employees", type=int, default=10_000)
+    p.add_argument("--leaves", type=int, default=1_000_000)
+    p.add_argument("--sessions", type=int, default=100_000)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--pending-days", type=int, default=60, help="leaves starting within this many days are mostly pending")
+    p.add_argument("--truncate", action="store_true", help="empty every app table first")
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    out = seed(args.employees, args.leaves, args.sessions, args.seed, args.truncate, args.pending_days)
+    out["total_s"] = time.perf_counter() - t0
+    print(json.dumps({k: round(v, 2) if isinstance(v, float) else v for k, v in out.items()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Local SMTP sink for benchmarks: accepts every message and only counts it, so
+the outbox workers (and decide_leave's notification path) run end to end
+without sending real mail. The app must run with EMAIL_SMTP_INSECURE_LOCAL=true
+(no STARTTLS/login) and email_config pointing at it; the suite does both.
+
+    cd backend && python -m benchmarks.smtp_sink [--port 1025]
+
+Needs aiosmtpd (pip install aiosmtpd).
+"""
+import argparse
+import threading
+import time
+
+
+class _CountingHandler:
+    def __init__(self):
+        self.messages = 0
+        self.recipients = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.messages += 1
+            self.recipients += len(envelope.rcpt_tos)
+            self.bytes += len(envelope.content or b"")
+        return "250 Message accepted for delivery"
+
+
+class SmtpSink:
+    """aiosmtpd on its own thread; use as a context manager or start()/stop()."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 1025):
+        from aiosmtpd.controller import Controller
+
+        self.host = host
+        self.port = port
+        self.handler = _CountingHandler()
+        self._controller = Controller(self.handler, hostname=host, port=port)
+
+    def start(self) -> "SmtpSink":
+        self._controller.start()
+        return self
+
+    def stop(self) -> None:
+        self._controller.stop()
+
+    def __enter__(self) -> "SmtpSink":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        h = self.handler
+        return {"messages": h.messages, "recipients": h.recipients, "bytes": h.bytes}
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=1025)
+    p.add_argument("--every", type=float, default=5, help="print counts every N seconds")
+    args = p.parse_args()
+    with SmtpSink(args.host, args.port) as sink:
+        print(f"SMTP sink on {args.host}:{args.port}")
+        try:
+            while True:
+                time.sleep(args.every)
+                print(sink.stats(), flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+"""
+Benchmark suite: every route of app.main (benchmarks.scenarios), one scenario
+at a time, against a database filled by benchmarks.seed. Reports p50/p95/p99
+latency, requests/sec and DB statements per request (X-DB-Queries) per
+scenario, and writes them as JSON so runs can be diffed.
+
+    cd backend
+    python -m benchmarks.seed --employees 10000 --leaves 1000000 --sessions 100000 --truncate
+    python -m benchmarks.suite inprocess --seconds 5 --concurrency 8
+    python -m benchmarks.suite http --processes 4 --concurrency 64 --workers 2
+    python -m benchmarks.suite compare before.json after.json
+
+inprocess drives the ASGI app directly (httpx.ASGITransport, lifespan
+running), so it measures the app without a server or network in the way.
+http starts uvicorn (or targets --url) and drives it from several client
+processes. Notification mail goes to a local SMTP sink (benchmarks.smtp_sink);
+the report includes what it received. Writes (applies, decisions, imports,
+holidays) change the database: reseed between runs that should compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from pathlib import Path
+from queue import Empty
+
+import httpx
+
+from benchmarks.scenarios import SCENARIOS, BenchState, Scenario, load_context, uncovered_routes
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# The suite logs in and registers far faster than a person; it also talks plain SMTP to the sink
+BENCH_ENV = {
+    "LOGIN_RATE_LIMIT_PER_MINUTE": "0",
+    "EMAIL_SMTP_INSECURE_LOCAL": "true",
+    "QUERY_STATS_HEADERS": "true",
+}
+
+BY_NAME = {s.name: s for s in SCENARIOS}
+
+
+def _no_cookies() -> CookieJar:
+    # Every request carries its own session cookie; never keep the ones login/register set
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+async def _asgi_first_chunk(app, method: str, path: str, headers: dict):
+    """
+    Call the ASGI app until the first body chunk, then disconnect. For
+    server-sent events, which ASGITransport would wait on forever. Returns
+    (status, headers, first chunk, the app task still winding down).
+    """
+    raw_path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": raw_path, "raw_path": raw_path.encode(), "query_string": query.encode(), "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    first = asyncio.Event()
+    out = {"status": 0, "headers": {}, "body": b""}
+    sent_request = False
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await first.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            out["status"] = message["status"]
+            out["headers"] = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body" and not first.is_set():
+            out["body"] = message.get("body", b"")
+            first.set()
+
+    task = asyncio.create_task(app(scope, receive, send))
+    waiter = asyncio.create_task(first.wait())
+    await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    first.set()  # no-op after a chunk; otherwise the app ended without a body
+    await waiter
+    return out["status"], out["headers"], out["body"], task
+
+
+async def _one(client: httpx.AsyncClient, st: BenchState, sc: Scenario, app=None):
+    """One request: (latency s, status, X-DB-Queries or None, body bytes), or None when out of inputs."""
+    req = sc.build(st)
+    if req is None:
+        return None
+    headers = dict(req.get("headers") or {})
+    key = req["path"] + "|" + headers.get("Cookie", "")
+    if sc.revalidate and key in st.etags:
+        headers["If-None-Match"] = st.etags[key]
+
+    t0 = time.perf_counter()
+    try:
+        if sc.stream and app is not None:
+            status, resp_headers, body, task = await _asgi_first_chunk(app, sc.method, req["path"], headers)
+            elapsed = time.perf_counter() - t0
+            await asyncio.wait_for(task, timeout=10)
+        elif sc.stream:
+            async with client.stream(sc.method, req["path"], headers=headers) as r:
+                body = b""
+                async for body in r.aiter_raw():
+                    break
+                elapsed = time.perf_counter() - t0
+                status, resp_headers = r.status_code, r.headers
+        else:
+            r = await client.request(sc.method, req["path"], headers=headers, json=req.get("json"), content=req.get("content"))
+            elapsed = time.perf_counter() - t0
+            status, resp_headers, body = r.status_code, r.headers, r.content
+    except (httpx.HTTPError, asyncio.TimeoutError, OSError):
+        return time.perf_counter() - t0, 0, None, 0
+
+    etag = resp_headers.get("etag")
+    if etag:
+        st.etags[key] = etag
+    queries = resp_headers.get("x-db-queries")
+    return elapsed, status, int(queries) if queries else None, len(body)
+
+
+async def drive(client, st: BenchState, sc: Scenario, seconds: float, concurrency: int, warmup: int = 0, app=None) -> dict:
+    """Run one scenario with `concurrency` tasks for `seconds` (or until its inputs run out)."""
+    for _ in range(warmup):
+        if await _one(client, st, sc, app) is None:
+            break
+
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    queries: list[int] = []
+    nbytes = 0
+    exhausted = False
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal nbytes, exhausted
+        while not exhausted and time.perf_counter() < deadline:
+            res = await _one(client, st, sc, app)
+            if res is None:
+                exhausted = True
+                return
+            elapsed, status, q, size = res
+            latencies.append(elapsed * 1e3)
+            statuses[status] += 1
+            if q is not None:
+                queries.append(q)
+            nbytes += size
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {
+        "latencies_ms": latencies,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "queries": queries,
+        "bytes": nbytes,
+        "elapsed_s": time.perf_counter() - started,
+        "exhausted": exhausted,
+    }
+
+
+def merge(raws: list[dict]) -> dict:
+    statuses: Counter = Counter()
+    for r in raws:
+        statuses.update(r["statuses"])
+    return {
+        "latencies_ms": [x for r in raws for x in r["latencies_ms"]],
+        "statuses": dict(statuses),
+        "queries": [x for r in raws for x in r["queries"]],
+        "bytes": sum(r["bytes"] for r in raws),
+        "elapsed_s": max(r["elapsed_s"] for r in raws),
+        "exhausted": any(r["exhausted"] for r in raws),
+    }
+
+
+def summarize(sc: Scenario, raw: dict) -> dict:
+    lat = raw["latencies_ms"]
+    n = len(lat)
+    q = statistics.quantiles(lat, n=100) if n > 1 else [lat[0] if lat else 0.0] * 99
+    errors = sum(v for k, v in raw["statuses"].items() if int(k) not in sc.expect)
+    queries = raw["queries"]
+    return {
+        "method": sc.method,
+        "route": sc.route,
+        "requests": n,
+        "errors": errors,
+        "statuses": raw["statuses"],
+        "rps": n / raw["elapsed_s"] if raw["elapsed_s"] else 0.0,
+        "p50_ms": q[49],
+        "p95_ms": q[94],
+        "p99_ms": q[98],
+        "mean_ms": statistics.fmean(lat) if lat else 0.0,
+        "max_ms": max(lat, default=0.0),
+        "queries_per_request": statistics.fmean(queries) if queries else None,
+        "queries_max": max(queries, default=None),
+        "bytes_per_request": raw["bytes"] / n if n else 0,
+        "exhausted": raw["exhausted"],
+    }
+
+
+def _print_row(name: str, s: dict) -> None:
+    qpr = "-" if s["queries_per_request"] is None else f"{s['queries_per_request']:.1f}"
+    print(
+        f"{name:<22} {s['requests']:>7} req {s['rps']:>8.1f}/s  p50 {s['p50_ms']:>7.2f}  p95 {s['p95_ms']:>7.2f}"
+        f"  p99 {s['p99_ms']:>7.2f} ms  q/req {qpr:>5}  err {s['errors']}" + ("  (inputs ran out)" if s["exhausted"] else ""),
+        flush=True,
+    )
+
+
+# --- in-process -------------------------------------------------------------
+
+async def run_inprocess(ctx, scenarios: list[Scenario], args) -> dict:
+    from app.main import app
+
+    results = {}
+    st = BenchState(ctx)
+    # Unhandled errors count as 500s instead of aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False, client=("127.0.0.1", 50000))
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", cookies=_no_cookies(), timeout=60) as client:
+            for sc in scenarios:
+                raw = await drive(client, st, sc, args.seconds, args.concurrency, args.warmup, app=app)
+                results[sc.name] = summarize(sc, raw)
+                _print_row(sc.name, results[sc.name])
+        # Outbox workers stop with the lifespan; let them deliver what the run queued
+        await asyncio.to_thread(_drain_outbox, args.drain_seconds)
+    return results
+
+
+# --- multi-process HTTP -----------------------------------------------------
+
+def _http_process(url, ctx, names, worker, workers, args, barrier, results) -> None:
+    async def main():
+        st = BenchState(ctx, worker, workers)
+        per_proc = max(1, args.concurrency // workers)
+        limits = httpx.Limits(max_connections=per_proc, max_keepalive_connections=per_proc)
+        out = {}
+        async with httpx.AsyncClient(base_url=url, limits=limits, cookies=_no_cookies(), timeout=60) as client:
+            for name in names:
+                barrier.wait()  # every process starts each scenario together
+                out[name] = await drive(client, st, BY_NAME[name], args.seconds, per_proc, args.warmup)
+        return out
+
+    results.put((worker, asyncio.run(main())))
+
+
+def _start_server(port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--no-access-log"],
+    )
+
+
+def _wait_ready(url: str) -> None:
+    for _ in range(200):
+        try:
+            httpx.get(url + "/api/bootstrap", timeout=2)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+def run_http(ctx, scenarios: list[Scenario], args) -> dict:
+    import multiprocessing as mp
+
+    server = None
+    url = args.url
+    if not url:
+        url = f"http://127.0.0.1:{args.port}"
+        server = _start_server(args.port, args.workers)
+    try:
+        _wait_ready(url)
+        spawn = mp.get_context("spawn")
+        barrier = spawn.Barrier(args.processes)
+        queue = spawn.Queue()
+        names = [s.name for s in scenarios]
+        procs = [
+            spawn.Process(target=_http_process, args=(url, ctx, names, i, args.processes, args, barrier, queue))
+            for i in range(args.processes)
+        ]
+        for p in procs:
+            p.start()
+        per_worker = {}
+        try:
+            while len(per_worker) < len(procs):
+                try:
+                    worker, out = queue.get(timeout=1)
+                    per_worker[worker] = out
+                except Empty:
+                    if any(p.exitcode not in (None, 0) for p in procs):
+                        raise RuntimeError("a client process failed; see its traceback above")
+        finally:
+            for p in procs:
+                if p.is_alive() and len(per_worker) < len(procs):
+                    p.terminate()
+                p.join()
+
+        results = {}
+        for sc in scenarios:
+            results[sc.name] = summarize(sc, merge([per_worker[w][sc.name] for w in sorted(per_worker)]))
+            _print_row(sc.name, results[sc.name])
+        _drain_outbox(args.drain_seconds)
+        return results
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=15)
+
+
+# --- report -----------------------------------------------------------------
+
+def _outbox_counts() -> dict:
+    from sqlalchemy import func, select
+
+    from app.db import SessionLocal
+    from app.models import EmailOutbox
+
+    with SessionLocal() as db:
+        return dict(db.execute(select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)).all())
+
+
+def _drain_outbox(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and _outbox_counts().get("pending"):
+        time.sleep(0.5)
+
+
+def _scale() -> dict:
+    from sqlalchemy import text
+
+    from app.db import SessionLocal
+
+    with SessionLocal() as db:
+        return dict(db.execute(text("""
+            SELECT 'employees', count(*) FROM users WHERE role = 'employee'
+            UNION ALL SELECT 'leave_requests', count(*) FROM leave_requests
+            UNION ALL SELECT 'sessions', count(*) FROM sessions
+        """)).all())
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _meta(mode: str, args, scale: dict) -> dict:
+    from app.config import settings
+
+    return {
+        "mode": mode,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git": _git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seconds": args.seconds,
+        "concurrency": args.concurrency,
+        "processes": getattr(args, "processes", 1),
+        "server_workers": getattr(args, "workers", None) if mode == "http" and not args.url else None,
+        "scale": scale,
+        "settings": {
+            k: getattr(settings, k)
+            for k in ("DB_POOL_MODE", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_ASYNC", "SESSION_CACHE_ENABLED",
+                      "LEAVE_COUNT_WORKING_DAYS", "EMAIL_OUTBOX_WORKERS", "LEAVE_EVENTS_NOTIFY")
+        },
+    }
+
+
+def run(args) -> None:
+    # Before app.* is imported (Settings are read once); a uvicorn started by run_http inherits them
+    os.environ.update({k: v for k, v in BENCH_ENV.items() if k not in os.environ})
+    from app.main import app
+
+    if args.only:
+        wanted = args.only.split(",")
+        unknown = [n for n in wanted if n not in BY_NAME]
+        if unknown:
+            raise SystemExit(f"unknown scenarios: {', '.join(unknown)}")
+        scenarios = [BY_NAME[n] for n in wanted]
+    else:
+        missing = uncovered_routes(app)
+        if missing:
+            raise SystemExit("routes without a scenario in benchmarks/scenarios.py: " + "; ".join(missing))
+        scenarios = SCENARIOS
+
+    from benchmarks.smtp_sink import SmtpSink
+
+    sink = None if args.no_sink else SmtpSink(args.smtp_host, args.smtp_port).start()
+    try:
+        ctx = load_context(args.sample_employees, args.pending, args.spare_sessions, args.smtp_host, args.smtp_port)
+        scale = _scale()
+        if args.mode == "inprocess":
+            results = asyncio.run(run_inprocess(ctx, scenarios, args))
+        else:
+            results = run_http(ctx, scenarios, args)
+        report = {
+            "meta": _meta(args.mode, args, scale),
+            "scenarios": results,
+            "email": {"sink": sink.stats() if sink else None, "outbox": _outbox_counts()},
+        }
+    finally:
+        if sink:
+            sink.stop()
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{args.mode}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, default=str))
+    print(f"email: {report['email']}")
+    print(f"results: {out}")
+
+
+def compare(args) -> None:
+    a = json.loads(Path(args.before).read_text())["scenarios"]
+    b = json.loads(Path(args.after).read_text())["scenarios"]
+
+    def delta(x, y):
+        if x is None or y is None:
+            return "      -"
+        return f"{(y - x) / x * 100:+6.1f}%" if x else "      -"
+
+    print(f"{'scenario':<22} {'p50 ms':>16} {'p95 ms':>16} {'p99 ms':>16} {'req/s':>18} {'q/req':>10}")
+    for name in [n for n in a if n in b]:
+        x, y = a[name], b[name]
+        cols = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            cols.append(f"{y[key]:>9.2f} {delta(x[key], y[key])}")
+        qa, qb = x["queries_per_request"], y["queries_per_request"]
+        cols.append(f"{'-' if qa is None else f'{qa:.1f}':>4}->{'-' if qb is None else f'{qb:.1f}':<4}")
+        print(f"{name:<22} " + " ".join(cols))
+    for name in sorted(set(a) ^ set(b)):
+        print(f"{name:<22} only in {'before' if name in a else 'after'}")
+
+
+def main():
+    p = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    sub = p.add_subparsers(dest="mode", required=True)
+
+    for mode in ("inprocess", "http"):
+        m = sub.add_parser(mode)
+        m.add_argument("--seconds", type=float, default=5, help="per scenario")
+        m.add_argument("--concurrency", type=int, default=8 if mode == "inprocess" else 64)
+        m.add_argument("--warmup", type=int, default=5, help="discarded requests per scenario (per process)")
+        m.add_argument("--only", help="comma-separated scenario names (skips the route coverage check)")
+        m.add_argument("--sample-employees", type=int, default=200)
+        m.add_argument("--pending", type=int, default=20_000, help="seeded pending leaves handed to the decision scenarios")
+        m.add_argument("--spare-sessions", type=int, default=20_000, help="seeded sessions handed to logout")
+        m.add_argument("--smtp-host", default="127.0.0.1")
+        m.add_argument("--smtp-port", type=int, default=1025)
+        m.add_argument("--no-sink", action="store_true", help="an SMTP sink is already listening")
+        m.add_argument("--drain-seconds", type=float, default=15, help="wait this long for the outbox to empty")
+        m.add_argument("--out", help=f"results JSON (default {RESULTS_DIR.name}/<mode>-<time>.json)")
+        if mode == "http":
+            m.add_argument("--processes", type=int, default=4, help="client processes")
+            m.add_argument("--url", help="target a running server instead of starting uvicorn")
+            m.add_argument("--port", type=int, default=8200)
+            m.add_argument("--workers", type=int, default=2, help="uvicorn workers when starting the server")
+        m.set_defaults(func=run)
+
+    c = sub.add_parser("compare")
+    c.add_argument("before")
+    c.add_argument("after")
+    c.set_defaults(func=compare)
+
+    args = p.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import pytest
+from starlette.requests import Request
+
+from app.config import settings
+from app.main import _client_ip
+
+
+def _request(forwarded: str | None, peer: str = "10.0.0.9") -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded is not None else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.mark.parametrize("hops, forwarded, expected", [
+    (1, "203.0.113.7", "203.0.113.7"),
+    # Client-supplied entries on the left are ignored
+    (1, "1.2.3.4, 203.0.113.7", "203.0.113.7"),
+    # CDN appends the client, the load balancer appends the CDN edge
+    (2, "203.0.113.7, 198.51.100.20", "203.0.113.7"),
+    (2, "1.2.3.4, 203.0.113.7, 198.51.100.20", "203.0.113.7"),
+    (3, "1.2.3.4,203.0.113.7,198.51.100.20,10.1.0.5", "203.0.113.7"),
+    # Fewer entries than hops: the outermost proxy's view
+    (2, "203.0.113.7", "203.0.113.7"),
+    (1, None, "10.0.0.9"),
+])
+def test_client_ip_counts_trusted_hops_from_the_right(monkeypatch, hops, forwarded, expected):
+    monkeypatch.setattr(settings, "TRUST_PROXY_HEADERS", True)
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", hops)
+    assert _client_ip(_request(forwarded)) == expected
+
+
+def test_client_ip_ignores_header_when_proxies_are_not_trusted(monkeypatch):
+    monkeypatch.setattr(settings, "TRUST_PROXY_HEADERS", False)
+    assert _client_ip(_request("203.0.113.7")) == "10.0.0.9"
@@ -0,0 +1,40 @@
+import pytest
+from starlette.requests import Request
+
+from app.services.etags import matching_etag, not_modified
+
+ETAG = '"abc"'
+
+
+def _request(if_none_match: str | None, accept_encoding: str | None = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    if accept_encoding is not None:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": headers})
+
+
+@pytest.mark.parametrize("if_none_match, accept_encoding, expected", [
+    (None, "gzip", None),
+    ('"abc"', None, '"abc"'),
+    ('W/"abc"', None, '"abc"'),
+    ("*", None, '"abc"'),
+    ('"other", "abc"', None, '"abc"'),
+    ('"abc-gzip"', "gzip, deflate", '"abc-gzip"'),
+    ('"abc-br"', "gzip, br", '"abc-br"'),
+    # Encoded tag, but the request no longer accepts that encoding
+    ('"abc-gzip"', None, None),
+    ('"abc-gzip"', "br", None),
+    ('"abc-gzip"', "gzip;q=0, identity", None),
+    ('"abcd-gzip"', "gzip", None),
+])
+def test_matching_etag(if_none_match, accept_encoding, expected):
+    assert matching_etag(_request(if_none_match, accept_encoding), ETAG) == expected
+
+
+def test_not_modified_varies_on_accept_encoding():
+    r = not_modified('"abc-gzip"')
+    assert r.status_code == 304
+    assert r.headers["etag"] == '"abc-gzip"'
+    assert r.headers["vary"] == "Accept-Encoding"
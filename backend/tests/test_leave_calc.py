@@ -0,0 +1,85 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.leave_calc import calc_total_days
+from app.services.work_calendar import WorkCalendar
+
+CASES = 2000
+
+
+def naive_working_days(start: date, end: date, weekend_days, holidays) -> int:
+    n, d = 0, start
+    while d <= end:
+        if d.weekday() not in weekend_days and d not in holidays:
+            n += 1
+        d += timedelta(days=1)
+    return n
+
+
+def naive_total_days(start: date, end: date, excluded, weekend_days=None, holidays=None) -> int:
+    n, d = 0, start
+    while d <= end:
+        counts = weekend_days is None or (d.weekday() not in weekend_days and d not in holidays)
+        if counts and d not in excluded:
+            n += 1
+        d += timedelta(days=1)
+    return n
+
+
+def _random_calendar(rng: random.Random):
+    weekend = set(rng.sample(range(7), rng.randint(0, 3)))
+    holidays = {date(1995, 1, 1) + timedelta(days=rng.randrange(40 * 366)) for _ in range(rng.randint(0, 300))}
+    return weekend, holidays
+
+
+def _random_range(rng: random.Random) -> tuple[date, date]:
+    start = date(1996, 1, 1) + timedelta(days=rng.randrange(30 * 366))
+    # Mostly short leaves, some spanning many years
+    length = rng.randrange(40) if rng.random() < 0.7 else rng.randrange(10 * 366)
+    return start, start + timedelta(days=length)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_working_days_matches_naive(seed):
+    rng = random.Random(seed)
+    weekend, holidays = _random_calendar(rng)
+    cal = WorkCalendar(weekend, holidays)
+    for _ in range(CASES // 5):
+        start, end = _random_range(rng)
+        assert cal.working_days(start, end) == naive_working_days(start, end, weekend, holidays), (start, end)
+
+
+def test_working_days_edges():
+    cal = WorkCalendar({5, 6}, {date(2024, 12, 25), date(2025, 1, 1)})
+    assert cal.working_days(date(2024, 1, 2), date(2024, 1, 1)) == 0
+    assert cal.working_days(date(2024, 12, 25), date(2024, 12, 25)) == 0
+    assert cal.working_days(date(2024, 12, 30), date(2024, 12, 30)) == 1
+    # Year boundary, holiday on both sides
+    assert cal.working_days(date(2024, 12, 23), date(2025, 1, 3)) == 8
+    assert cal.working_days(date(1, 1, 1), date(1, 1, 7)) == 5
+    assert cal.working_days(date(9999, 12, 25), date(9999, 12, 31)) == 5
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_calc_total_days_matches_naive(seed):
+    rng = random.Random(100 + seed)
+    weekend, holidays = _random_calendar(rng)
+    cal = WorkCalendar(weekend, holidays)
+    for _ in range(CASES // 5):
+        start, end = _random_range(rng)
+        span = (end - start).days + 40
+        excluded = [start - timedelta(days=20) + timedelta(days=rng.randrange(span)) for _ in range(rng.randint(0, 8))]
+
+        total, stored = calc_total_days(start, end, excluded)
+        assert total == naive_total_days(start, end, set(excluded))
+        assert stored == sorted({d.isoformat() for d in excluded if start <= d <= end})
+
+        total, _ = calc_total_days(start, end, excluded, calendar=cal)
+        assert total == naive_total_days(start, end, set(excluded), weekend, holidays)
+
+
+def test_calc_total_days_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        calc_total_days(date(2024, 1, 2), date(2024, 1, 1), None)
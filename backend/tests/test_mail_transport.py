@@ -0,0 +1,101 @@
+import smtplib
+import threading
+from email.message import EmailMessage
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import email_service
+from app.services.email_service import MailTransport, is_permanent_error
+
+CFG = SimpleNamespace(smtp_host="smtp.test", smtp_port=587, smtp_user="user", smtp_pass_enc="enc")
+
+
+class FakeSMTP:
+    """Accepts every recipient except those starting with "bad"."""
+
+    dialed: list["FakeSMTP"] = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent: list[str] = []
+        self.closed = False
+        FakeSMTP.dialed.append(self)
+
+    def ehlo(self):
+        pass
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def send_message(self, msg):
+        if self.closed:
+            raise smtplib.SMTPServerDisconnected("closed")
+        if msg["To"].startswith("bad"):
+            raise smtplib.SMTPRecipientsRefused({msg["To"]: (550, b"no such user")})
+        self.sent.append(msg["To"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    FakeSMTP.dialed = []
+    monkeypatch.setattr(email_service.smtplib, "SMTP", FakeSMTP)
+
+
+def _msg(to: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "app@test"
+    msg["To"] = to
+    msg.set_content("hi")
+    return msg
+
+
+def test_refused_first_send_keeps_a_usable_connection():
+    transport = MailTransport(idle_seconds=60)
+    with pytest.raises(smtplib.SMTPRecipientsRefused) as e:
+        transport.send_smtp(CFG, "pw", _msg("bad@test"))
+    assert is_permanent_error(e.value)
+
+    transport.send_smtp(CFG, "pw", _msg("good@test"))
+    assert len(FakeSMTP.dialed) == 1
+    assert FakeSMTP.dialed[0].sent == ["good@test"]
+
+
+def test_idle_connection_is_closed_and_redialled():
+    transport = MailTransport(idle_seconds=0)
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        transport.send_smtp(CFG, "pw", _msg("bad@test"))
+    transport.send_smtp(CFG, "pw", _msg("good@test"))
+
+    first, second = FakeSMTP.dialed
+    assert first.closed and not second.closed
+    assert second.sent == ["good@test"]
+
+
+def test_each_thread_starts_with_its_own_connection():
+    transport = MailTransport(idle_seconds=60)
+    transport.send_smtp(CFG, "pw", _msg("main@test"))
+
+    errors = []
+
+    def worker():
+        try:
+            with pytest.raises(smtplib.SMTPRecipientsRefused):
+                transport.send_smtp(CFG, "pw", _msg("bad@test"))
+            transport.send_smtp(CFG, "pw", _msg("worker@test"))
+        except BaseException as e:  # surfaced below
+            errors.append(e)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert not errors
+    assert [c.sent for c in FakeSMTP.dialed] == [["main@test"], ["worker@test"]]
@@ -0,0 +1,24 @@
+from sqlalchemy import DateTime
+
+from app.db import Base
+import app.models  # noqa: F401  (registers the tables)
+
+
+def _timestamp_columns():
+    for table in Base.metadata.sorted_tables:
+        for col in table.columns:
+            if isinstance(col.type, DateTime):
+                yield col
+
+
+def test_timestamp_defaults_are_timezone_aware():
+    # A just-inserted object keeps its Python-side default; it must serialize like a row read back
+    checked = 0
+    for col in _timestamp_columns():
+        assert col.type.timezone, col
+        for default in (col.default, col.onupdate):
+            if default is not None and default.is_callable:
+                value = default.arg(None)
+                assert value.tzinfo is not None and value.utcoffset().total_seconds() == 0, col
+                checked += 1
+    assert checked
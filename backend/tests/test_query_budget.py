@@ -0,0 +1,99 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.db import SessionLocal
+from app.main import app
+from app.models import Session as DbSession, User
+from app.services.leave_queries import encode_cursor
+from app.services.query_stats import track_queries
+from app.services.session_cache import AuthUser, invalidate_on_commit, session_cache
+
+
+def _get(path: str, sid: str) -> httpx.Response:
+    # ASGITransport runs the app in this context, so track_queries sees its statements
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://test") as client:
+            return await client.get(path, headers={"Cookie": f"{settings.SESSION_COOKIE_NAME}={sid}"})
+    return asyncio.run(go())
+
+
+def _auth_user(**kw) -> AuthUser:
+    return AuthUser(
+        id=uuid.uuid4(), role="employee", name="Budget Test", email=None, employee_code=None,
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1), **kw,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    session_cache.clear()
+    yield
+    session_cache.clear()
+
+
+@pytest.mark.skipif(not settings.SESSION_CACHE_ENABLED, reason="session cache disabled")
+def test_me_with_cached_session_runs_no_queries():
+    sid = str(uuid.uuid4())
+    session_cache.put(sid, _auth_user())
+
+    with track_queries() as stats:
+        r = _get("/api/auth/me", sid)
+
+    assert r.status_code == 200
+    assert r.json()["name"] == "Budget Test"
+    assert stats.queries == 0 and stats.commits == 0
+
+
+def test_me_within_budget(db):
+    user = User(role="employee", name=f"Budget {uuid.uuid4().hex[:8]}", dob=date(1990, 1, 1))
+    sess = DbSession(user=user, expires_at=datetime.now(timezone.utc) + timedelta(days=1))
+    db.add_all([user, sess])
+    db.commit()
+    try:
+        with track_queries() as stats:
+            r = _get("/api/auth/me", str(sess.id))
+        assert r.status_code == 200
+        assert stats.queries <= 1 and stats.commits <= 1
+
+        # Now cached
+        with track_queries() as stats:
+            assert _get("/api/auth/me", str(sess.id)).status_code == 200
+        assert stats.queries == 0
+    finally:
+        db.delete(user)
+        db.commit()
+
+
+@pytest.mark.skipif(not settings.SESSION_CACHE_ENABLED, reason="session cache disabled")
+@pytest.mark.parametrize("commit", [True, False])
+def test_invalidate_on_commit_waits_for_commit(commit):
+    sid = str(uuid.uuid4())
+    session_cache.put(sid, _auth_user())
+    with SessionLocal() as db:
+        invalidate_on_commit(db, sid)
+        assert session_cache.get(sid) is not None
+        db.commit() if commit else db.rollback()
+
+    assert (session_cache.get(sid) is None) == commit
+
+
+def test_leave_listing_validates_only_the_first_page(db):
+    sid = str(uuid.uuid4())
+    session_cache.put(sid, _auth_user())
+
+    with track_queries() as stats:
+        first = _get("/api/leaves/my", sid)
+    assert first.status_code == 200 and "etag" in first.headers
+    assert stats.queries <= 2  # version aggregate + page
+
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+    with track_queries() as stats:
+        page = _get(f"/api/leaves/my?cursor={cursor}", sid)
+    assert page.status_code == 200 and "etag" not in page.headers
+    assert stats.queries == 1
@@ -0,0 +1,22 @@
+import threading
+
+from app.services import session_sweeper as sweeper_module
+from app.services.session_sweeper import SessionSweeper
+
+
+def test_sweeper_runs_again_after_stop(monkeypatch):
+    swept = threading.Semaphore(0)
+
+    def fake_sweep():
+        swept.release()
+        return 0
+
+    monkeypatch.setattr(sweeper_module, "sweep_expired_sessions", fake_sweep)
+    sweeper = SessionSweeper(interval_seconds=0.01)
+
+    for _ in range(2):  # e.g. the app lifespan restarting in tests
+        sweeper.start()
+        assert swept.acquire(timeout=2)
+        assert sweeper._thread.is_alive()
+        sweeper.stop()
+        assert sweeper._thread is None